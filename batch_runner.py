@@ -0,0 +1,151 @@
+"""
+Processa arquivos JSONL de cenarios ({"model": ..., "params": {...}} por linha)
+com memoria limitada e grava um resultado JSON por linha.
+
+    python batch_runner.py cenarios.jsonl -o resultados.jsonl --workers 4
+
+Cada linha de saida traz "line" (numero da linha de entrada), "id" quando o
+registro tem um, e "result" ou "error". Ao final, estatisticas de vazao e
+latencia vao para stderr.
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from math import floor, log2
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from calculator import evaluate_request, to_jsonable
+
+# Histograma de latencia com 4 faixas por potencia de 2 a partir de 1 microssegundo
+_BUCKETS_PER_OCTAVE = 4
+_MIN_LATENCY = 1e-6
+
+
+class LatencyHistogram:
+    """Histograma logaritmico de memoria constante para quantis aproximados."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        bucket = floor(log2(max(seconds, _MIN_LATENCY) / _MIN_LATENCY) * _BUCKETS_PER_OCTAVE)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.maximum = max(self.maximum, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Limite superior da faixa que contem o quantil q."""
+        if not self.total:
+            return 0.0
+        target = q * self.total
+        running = 0
+        for bucket in sorted(self.counts):
+            running += self.counts[bucket]
+            if running >= target:
+                return min(_MIN_LATENCY * 2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE), self.maximum)
+        return self.maximum
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Gera (numero_da_linha, texto) ignorando linhas em branco."""
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield number, line
+
+
+def process_line(item: Tuple[int, str]) -> Tuple[Dict[str, Any], float]:
+    """Avalia uma linha; erros de JSON ou do modelo viram {"error": ...}."""
+    number, line = item
+    started = time.perf_counter()
+    output: Dict[str, Any] = {"line": number}
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        output["error"] = f"JSON invalido: {exc.msg}"
+    else:
+        if isinstance(record, dict) and "id" in record:
+            output["id"] = to_jsonable(record["id"])
+        output.update(evaluate_request(record))
+    return output, time.perf_counter() - started
+
+
+def run(
+    source: TextIO, sink: TextIO, workers: int = 1, window: int = 1024
+) -> Dict[str, Any]:
+    """
+    Pipeline de geradores: le no maximo `window` linhas por vez, avalia (em
+    processo ou em um pool de `workers`) e escreve na ordem de entrada.
+    """
+    histogram = LatencyHistogram()
+    processed = errors = 0
+    started = time.perf_counter()
+    records = read_records(source)
+
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        while True:
+            chunk: List[Tuple[int, str]] = list(islice(records, window))
+            if not chunk:
+                break
+            if pool is not None:
+                outcomes = pool.imap(process_line, chunk, chunksize=max(1, window // (workers * 4)))
+            else:
+                outcomes = map(process_line, chunk)
+            for output, latency in outcomes:
+                # allow_nan=False: cada linha e JSON estrito (nao finitos ja viraram null)
+                sink.write(json.dumps(output, allow_nan=False) + "\n")
+                histogram.add(latency)
+                processed += 1
+                if "error" in output:
+                    errors += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "records": processed,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "records_per_s": processed / elapsed if elapsed > 0 else 0.0,
+        "latency_p50_s": histogram.quantile(0.50),
+        "latency_p95_s": histogram.quantile(0.95),
+        "latency_p99_s": histogram.quantile(0.99),
+        "latency_max_s": histogram.maximum,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Processa cenarios JSONL com calculator.calculate.")
+    parser.add_argument("input", help="Arquivo JSONL de entrada ('-' para stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Arquivo JSONL de saida ('-' para stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Processos em paralelo (1 = sem pool)")
+    parser.add_argument("--window", type=int, default=1024, help="Linhas em memoria por vez")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.window < 1:
+        parser.error("--workers e --window devem ser >= 1")
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run(source, sink, workers=args.workers, window=args.window)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,98 @@
-from typing import Any, Callable, Dict
-
-from models import (
-    mg1,
-    mm1,
-    mm1k,
-    mm1n,
-    mms,
-    mmsk,
-    mmsn,
-    priority_with_preemption,
-    priority_without_preemption,
-)
+import copy
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping
+
+import models
+from instrumentation import CallMetrics
+from models.pn_utils import PnDistribution
+
+
+class LazyModelMap(Mapping):
+    """
+    Mapa nome -> funcao de `models` que so importa o submodulo na primeira
+    consulta de cada chave: listar os modelos nao carrega nenhum deles, e um
+    `calculate("M/M/1", ...)` importa apenas `models.mm1` (sem NumPy).
+    """
+
+    def __init__(self, names: Dict[str, str]) -> None:
+        self._names = dict(names)
+        self._loaded: Dict[str, Callable[..., Dict[str, Any]]] = {}
+
+    def __getitem__(self, key: str) -> Callable[..., Dict[str, Any]]:
+        func = self._loaded.get(key)
+        if func is None:
+            func = self._loaded[key] = models.load(self._names[key])
+        return func
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
 
 # Funcoes canonicas implementadas em cada modulo
-MODEL_MAP: Dict[str, Callable[..., Dict[str, Any]]] = {
-    "M/M/1": mm1,
-    "M/M/S": mms,
-    "M/M/1/K": mm1k,
-    "M/M/S/K": mmsk,
-    "M/M/1/N": mm1n,
-    "M/M/S/N": mmsn,
-    "PRIORIDADE_PREEMPTIVA_3X3": priority_with_preemption,
-    "PRIORIDADE_NAO_PREEMPTIVA_3X3": priority_without_preemption,
-    "M/G/1": mg1,
+MODEL_MAP: Mapping[str, Callable[..., Dict[str, Any]]] = LazyModelMap(
+    {
+        "M/M/1": "mm1",
+        "M/M/S": "mms",
+        "M/M/1/K": "mm1k",
+        "M/M/S/K": "mmsk",
+        "M/M/1/N": "mm1n",
+        "M/M/S/N": "mmsn",
+        "PRIORIDADE_PREEMPTIVA_3X3": "priority_with_preemption",
+        "PRIORIDADE_NAO_PREEMPTIVA_3X3": "priority_without_preemption",
+        "M/G/1": "mg1",
+        "M/M/S+M": "mms_abandonment",
+        "G/G/1": "gg1",
+        "G/G/S": "ggs",
+    }
+)
+
+# Versoes vetorizadas (NumPy) para avaliar muitos conjuntos de parametros de uma vez
+BATCH_MODEL_MAP: Mapping[str, Callable[..., Dict[str, Any]]] = LazyModelMap(
+    {
+        "M/M/1": "mm1_batch",
+        "M/M/S": "mms_batch",
+        "M/M/1/K": "mm1k_batch",
+        "M/M/S/K": "mmsk_batch",
+        "M/G/1": "mg1_batch",
+        "M/M/S+M": "mms_abandonment_batch",
+        "G/G/1": "gg1_batch",
+        "G/G/S": "ggs_batch",
+    }
+)
+
+# Solvers de dimensionamento (menor numero de servidores que atende a meta)
+STAFFING_MAP: Mapping[str, Callable[..., Dict[str, Any]]] = LazyModelMap(
+    {
+        "M/M/S": "mms_min_servers",
+        "M/M/S/K": "mmsk_min_servers",
+    }
+)
+
+# Solvers do regime transitorio (P(n, t) a partir de um estado inicial)
+TRANSIENT_MAP: Mapping[str, Callable[..., Dict[str, Any]]] = LazyModelMap(
+    {
+        "M/M/1/K": "mm1k_transient",
+        "M/M/S/K": "mmsk_transient",
+        "M/M/1/N": "mm1n_transient",
+        "M/M/S/N": "mmsn_transient",
+    }
+)
+
+# Configuracao do simulador de eventos discretos para cada modelo analitico
+SIMULATION_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "M/M/1": {"s": 1},
+    "M/M/S": {},
+    "M/M/1/K": {"s": 1},
+    "M/M/S/K": {},
+    "M/M/1/N": {"s": 1},
+    "M/M/S/N": {},
+    "PRIORIDADE_PREEMPTIVA_3X3": {"preemptive": True},
+    "PRIORIDADE_NAO_PREEMPTIVA_3X3": {"preemptive": False},
 }
 
 # Sinonimos e abreviacoes que aparecem nos materiais/inputs
@@ -34,6 +104,12 @@ MODEL_ALIASES: Dict[str, str] = {
     "MM1N": "M/M/1/N",
     "MMSN": "M/M/S/N",
     "MG1": "M/G/1",
+    "MMS+M": "M/M/S+M",
+    "MMSM": "M/M/S+M",
+    "ERLANGA": "M/M/S+M",
+    "ERLANG-A": "M/M/S+M",
+    "GG1": "G/G/1",
+    "GGS": "G/G/S",
     "PRIORIDADECOMINTERRUPCAO": "PRIORIDADE_PREEMPTIVA_3X3",
     "PRIORIDADESEMINTERROMPER": "PRIORIDADE_NAO_PREEMPTIVA_3X3",
     "PRIORIDADESEMINTERRUPCAO": "PRIORIDADE_NAO_PREEMPTIVA_3X3",
@@ -59,10 +135,308 @@ def normalize_model_name(model_name: str) -> str:
     return MODEL_ALIASES.get(key, key)
 
 
+class ResultCache:
+    """
+    Cache LRU limitado para os resultados de `calculate`, com contadores de
+    acertos, faltas e descartes para ajudar a dimensionar `maxsize`.
+    """
+
+    def __init__(self, maxsize: int = 256, digits: int = 12) -> None:
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize deve ser inteiro >= 1")
+        self.maxsize = maxsize
+        self.digits = digits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        # O servico HTTP atende pedidos em threads que compartilham o cache
+        self._lock = threading.Lock()
+
+    def _canonical(self, value: Any) -> Hashable:
+        # Floats arredondados em `digits` algarismos significativos; o nome exato do
+        # tipo entra na chave para que s=3, s=3.0 e s=np.int64(3) (os dois ultimos
+        # rejeitados pelo modelo) nao compartilhem entrada: um acerto nao pula a validacao.
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return (type(value).__name__, value)
+        if isinstance(value, int):
+            return (type(value).__name__, value)
+        if isinstance(value, float):
+            return (type(value).__name__, float(f"{value:.{self.digits}g}"))
+        if isinstance(value, (list, tuple)):
+            return tuple(self._canonical(item) for item in value)
+        if hasattr(value, "tolist"):
+            # Escalares e arrays NumPy (ex.: service_samples); repr truncaria arrays grandes
+            return (type(value).__name__, self._canonical(value.tolist()))
+        return repr(value)
+
+    def make_key(self, model_key: str, params: Dict[str, Any]) -> Hashable:
+        return (model_key, tuple(sorted((name, self._canonical(v)) for name, v in params.items())))
+
+    def get(self, key: Hashable) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        entry = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+# Cache opcional; desligado ate `enable_result_cache` ser chamado
+_result_cache: ResultCache | None = None
+
+
+def enable_result_cache(maxsize: int = 256, digits: int = 12) -> ResultCache:
+    """Liga (ou recria) o cache LRU de resultados usado por `calculate`."""
+    global _result_cache
+    _result_cache = ResultCache(maxsize=maxsize, digits=digits)
+    return _result_cache
+
+
+def disable_result_cache() -> None:
+    global _result_cache
+    _result_cache = None
+
+
+def cache_stats() -> Dict[str, int] | None:
+    """Contadores do cache (hits, misses, evictions, size, maxsize) ou None se desligado."""
+    return _result_cache.stats() if _result_cache is not None else None
+
+
+def _cached_call(key: str, model: Callable[..., Dict[str, Any]], params: Dict[str, Any]):
+    cache = _result_cache
+    if cache is None:
+        return model(**params)
+
+    cache_key = cache.make_key(key, params)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = model(**params)
+    cache.put(cache_key, result)
+    return result
+
+
+# Instrumentacao opcional; desligada (custo de um teste de None) ate ser ligada
+_call_metrics: CallMetrics | None = None
+
+
+def enable_instrumentation(slowest: int = 5, profile_every: int = 0) -> CallMetrics:
+    """
+    Liga (ou recria) as metricas de `calculate`: chamadas, histograma de
+    latencia, erros por mensagem e os `slowest` parametros mais lentos por
+    modelo. Com `profile_every=n`, uma a cada n chamadas roda sob cProfile.
+    """
+    global _call_metrics
+    _call_metrics = CallMetrics(slowest=slowest, profile_every=profile_every)
+    return _call_metrics
+
+
+def disable_instrumentation() -> None:
+    global _call_metrics
+    _call_metrics = None
+
+
+def instrumentation_stats() -> Dict[str, Dict[str, Any]] | None:
+    """Metricas por modelo (ver `CallMetrics.stats`) ou None se desligado."""
+    return _call_metrics.stats() if _call_metrics is not None else None
+
+
+def export_metrics(fmt: str = "prometheus") -> str:
+    """Exporta as metricas em texto Prometheus ("prometheus") ou JSON ("json")."""
+    if _call_metrics is None:
+        raise ValueError("Instrumentacao desligada; chame enable_instrumentation().")
+    if fmt == "prometheus":
+        return _call_metrics.to_prometheus()
+    if fmt == "json":
+        import json
+
+        return json.dumps(_call_metrics.stats(), indent=2, sort_keys=True)
+    raise ValueError("fmt deve ser 'prometheus' ou 'json'.")
+
+
 def calculate(model_name: str, **params):
     key = normalize_model_name(model_name)
     model = MODEL_MAP.get(key)
     if not model:
         raise ValueError("Modelo nao implementado")
 
+    metrics = _call_metrics
+    if metrics is None:
+        return _cached_call(key, model, params)
+    return metrics.observe(key, _cached_call, key, model, params, params=params)
+
+
+def calculate_batch(model_name: str, **params):
+    """
+    Avalia o modelo para arrays de parametros (ex.: lmbda, mu, s como arrays
+    NumPy com broadcasting) e devolve colunas rho, p0, L, Lq, W, Wq, alem das
+    mascaras `invalid`, `unstable` e `error` por linha.
+    """
+    key = normalize_model_name(model_name)
+    model = BATCH_MODEL_MAP.get(key)
+    if not model:
+        raise ValueError("Modelo nao implementado para calculo em lote")
+
     return model(**params)
+
+
+def min_servers(model_name: str, lmbda: float, mu: float, target: str, limit: float, **params):
+    """
+    Menor numero de servidores s tal que a metrica `target` fique <= `limit`.
+    M/M/S aceita Wq, W e P(Wq>t) (com t); M/M/S/K aceita pK (com K).
+    """
+    key = normalize_model_name(model_name)
+    solver = STAFFING_MAP.get(key)
+    if not solver:
+        raise ValueError("Modelo nao suportado pelo dimensionamento de servidores")
+
+    return solver(lmbda=lmbda, mu=mu, target=target, limit=limit, **params)
+
+
+def max_lambda(model_name: str, target: str, limit: float, **params):
+    """
+    Maior lambda tal que `target` <= `limit` com mu fixo, ex.:
+    max_lambda("M/M/S", target="Wq", limit=20, mu=1 / 300, s=40).
+    Metas por modelo em models.inverse.INVERSE_TARGETS.
+    """
+    return models.max_arrival_rate(normalize_model_name(model_name), target, limit, **params)
+
+
+def min_mu(model_name: str, target: str, limit: float, **params):
+    """Menor mu tal que `target` <= `limit` com lambda (ou arrival_rates) fixo."""
+    return models.min_service_rate(normalize_model_name(model_name), target, limit, **params)
+
+
+def cost_curve(model_name: str, server_cost: float, waiting_cost, **params):
+    """
+    Custo total (server_cost * s + waiting_cost * L) para cada s e o s otimo, ex.:
+    cost_curve("M/M/S", server_cost=20, waiting_cost=35, lmbda=9, mu=1).
+    """
+    return models.cost_curve(normalize_model_name(model_name), server_cost, waiting_cost, **params)
+
+
+def prepare(model_name: str, **params):
+    """
+    Modelo com parametros fixos para consultas repetidas de Pn e de cauda, ex.:
+    prepare("M/M/S", lmbda=9, mu=1, s=12).pn_array(range(100)).
+    """
+    return models.prepare(normalize_model_name(model_name), **params)
+
+
+def calculate_transient(model_name: str, times, initial_state=0, **params):
+    """
+    Avalia P(n, t), L(t), Lq(t) e P0(t) em toda a grade `times` com uma unica
+    chamada (ex.: calculate_transient("M/M/S/K", times=grid, lmbda=5, mu=2, s=3, K=50)).
+    """
+    key = normalize_model_name(model_name)
+    solver = TRANSIENT_MAP.get(key)
+    if not solver:
+        raise ValueError("Modelo nao suportado pelo regime transitorio")
+
+    return solver(times=times, initial_state=initial_state, **params)
+
+
+def simulate(model_name: str, **params):
+    """
+    Roda o simulador de eventos discretos com os mesmos parametros do modelo
+    analitico (ex.: simulate("M/M/S/K", lmbda=5, mu=2, s=3, K=10, replications=20))
+    para validar as formulas ou cobrir casos sem forma fechada.
+    """
+    key = normalize_model_name(model_name)
+    options = SIMULATION_OPTIONS.get(key)
+    if options is None:
+        raise ValueError("Modelo nao suportado pela simulacao")
+
+    if "preemptive" in options:
+        # Mesmo padrao dos modelos de prioridade analiticos
+        from models.priority_extended import DEFAULT_SERVERS
+
+        params.setdefault("s", DEFAULT_SERVERS)
+    return models.simulate_queue(**{**params, **options})
+
+
+def calculate_network(external_rates, routing, nodes, **params):
+    """
+    Rede aberta de Jackson com nos M/M/1, M/M/S, M/M/1/K ou M/M/S/K; os nomes
+    dos modelos em `nodes` aceitam os mesmos sinonimos de `calculate`. `tol` e
+    `max_iter` vao para o ponto fixo do bloqueio.
+    """
+    if isinstance(nodes, dict):
+        nodes = {**nodes, "model": normalize_model_name(str(nodes.get("model", "")))}
+    else:
+        nodes = [{**spec, "model": normalize_model_name(str(spec.get("model", "")))} for spec in nodes]
+    return models.jackson_network(external_rates, routing, nodes, **params)
+
+
+def calculate_closed_network(stations, N, think_time=0.0, method="exact", **params):
+    """
+    Rede fechada por MVA (exato ou Schweitzer), generalizando o M/M/s/N:
+    calculate_closed_network([{"mu": 2, "s": 3}], N=20, think_time=1 / 0.3)
+    equivale a calculate("M/M/S/N", lmbda=0.3, mu=2, s=3, N=20).
+    """
+    return models.mva(stations, N, think_time=think_time, method=method, **params)
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Converte um resultado de `calculate` em tipos JSON puros (dict/list/float),
+    expandindo PnDistribution para o formato antigo de dicionario. NaN e
+    +-inf viram None (null): JSON estrito nao tem valores nao finitos.
+    """
+    if isinstance(value, PnDistribution):
+        return to_jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if hasattr(value, "tolist"):
+        return to_jsonable(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def evaluate_request(request: Any) -> Dict[str, Any]:
+    """
+    Avalia um pedido {"model": ..., "params": {...}} e devolve {"result": ...}
+    (ja em tipos JSON) ou {"error": mensagem}, sem levantar excecao.
+    """
+    if not isinstance(request, dict):
+        return {"error": "Cada pedido deve ser um objeto com 'model' e 'params'."}
+    params = request.get("params") or {}
+    if not isinstance(params, dict):
+        return {"error": "'params' deve ser um objeto."}
+    try:
+        result = calculate(str(request.get("model", "")), **params)
+        return {"result": to_jsonable(result)}
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError) as exc:
+        return {"error": str(exc)}
+    except Exception as exc:  # erro inesperado em um registro nao interrompe o lote
+        return {"error": f"{type(exc).__name__}: {exc}"}
@@ -0,0 +1,194 @@
+"""
+Instrumentacao opcional de `calculator.calculate`: contagem de chamadas,
+histograma de latencia, erros por mensagem e parametros mais lentos por
+modelo, com perfil cProfile amostrado e exportacao em texto Prometheus ou JSON.
+"""
+
+import heapq
+import io
+import reprlib
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Tuple
+
+# Limites superiores (segundos) das faixas do histograma, no estilo Prometheus
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0,
+)
+# Mensagens de erro distintas guardadas por modelo; o excedente vai para OTHER_ERRORS
+MAX_ERROR_MESSAGES = 50
+OTHER_ERRORS = "<outras mensagens>"
+
+
+class _ModelMetrics:
+    __slots__ = ("calls", "total_seconds", "max_seconds", "buckets", "errors", "slowest")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # ultima faixa = +Inf
+        self.errors: Dict[str, int] = {}
+        self.slowest: List[Tuple[float, int, str]] = []  # min-heap (segundos, seq, params)
+
+
+class CallMetrics:
+    """
+    Coletor de metricas por modelo. `observe` executa a chamada e registra o
+    tempo; com `profile_every=n` uma a cada n chamadas roda sob cProfile.
+    """
+
+    def __init__(self, slowest: int = 5, profile_every: int = 0) -> None:
+        if not isinstance(slowest, int) or slowest < 0:
+            raise ValueError("slowest deve ser inteiro >= 0")
+        if not isinstance(profile_every, int) or profile_every < 0:
+            raise ValueError("profile_every deve ser inteiro >= 0")
+        self.slowest = slowest
+        self.profile_every = profile_every
+        self.profiler = _new_profiler() if profile_every else None
+        self._models: Dict[str, _ModelMetrics] = {}
+        self._seq = 0
+        # O servico HTTP chama `calculate` de varias threads ao mesmo tempo
+        self._lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+
+    def observe(self, model_key: str, func: Callable[..., Any], *args: Any, params: Dict[str, Any]) -> Any:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        profiled = self.profiler is not None and seq % self.profile_every == 0
+        # Perfil ja em andamento (outra thread ou outra ferramenta): so mede o tempo
+        if profiled and not self._profile_lock.acquire(blocking=False):
+            profiled = False
+        if profiled:
+            try:
+                self.profiler.enable()
+            except ValueError:
+                self._profile_lock.release()
+                profiled = False
+
+        error: str | None = None
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            raise
+        finally:
+            if profiled:
+                self.profiler.disable()
+                self._profile_lock.release()
+            self._record(model_key, time.perf_counter() - started, error, params, seq)
+
+    def _record(self, model_key: str, seconds: float, error: str | None, params: Dict[str, Any], seq: int) -> None:
+        with self._lock:
+            metrics = self._models.get(model_key)
+            if metrics is None:
+                metrics = self._models[model_key] = _ModelMetrics()
+            metrics.calls += 1
+            metrics.total_seconds += seconds
+            metrics.max_seconds = max(metrics.max_seconds, seconds)
+            metrics.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if error is not None:
+                if error not in metrics.errors and len(metrics.errors) >= MAX_ERROR_MESSAGES:
+                    error = OTHER_ERRORS
+                metrics.errors[error] = metrics.errors.get(error, 0) + 1
+            if self.slowest and (len(metrics.slowest) < self.slowest or seconds > metrics.slowest[0][0]):
+                entry = (seconds, seq, _describe(params))
+                if len(metrics.slowest) < self.slowest:
+                    heapq.heappush(metrics.slowest, entry)
+                else:
+                    heapq.heapreplace(metrics.slowest, entry)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for model_key, metrics in self._models.items():
+                cumulative = 0
+                histogram: Dict[str, int] = {}
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), metrics.buckets):
+                    cumulative += count
+                    histogram[_format_bound(bound)] = cumulative
+                snapshot[model_key] = {
+                    "calls": metrics.calls,
+                    "errors": sum(metrics.errors.values()),
+                    "errors_by_message": dict(metrics.errors),
+                    "total_seconds": metrics.total_seconds,
+                    "mean_seconds": metrics.total_seconds / metrics.calls if metrics.calls else 0.0,
+                    "max_seconds": metrics.max_seconds,
+                    "latency_histogram": histogram,
+                    "slowest": [
+                        {"seconds": seconds, "params": params}
+                        for seconds, _seq, params in sorted(metrics.slowest, reverse=True)
+                    ],
+                }
+            return snapshot
+
+    def profile_report(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """Resumo pstats das chamadas perfiladas ('' sem perfil ativo ou sem amostras)."""
+        if self.profiler is None:
+            return ""
+        import pstats
+
+        buffer = io.StringIO()
+        with self._profile_lock:
+            try:
+                pstats.Stats(self.profiler, stream=buffer).sort_stats(sort).print_stats(limit)
+            except TypeError:  # nenhuma chamada perfilada ainda
+                return ""
+        return buffer.getvalue()
+
+    def to_prometheus(self, prefix: str = "queue_calculate") -> str:
+        """Metricas no formato de exposicao de texto do Prometheus."""
+        stats = self.stats()
+        lines = [
+            f"# HELP {prefix}_calls_total Chamadas de calculate por modelo.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines += [f'{prefix}_calls_total{{model="{_escape(key)}"}} {item["calls"]}' for key, item in stats.items()]
+        lines += [
+            f"# HELP {prefix}_errors_total Chamadas que levantaram excecao, por modelo.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        lines += [f'{prefix}_errors_total{{model="{_escape(key)}"}} {item["errors"]}' for key, item in stats.items()]
+        lines += [
+            f"# HELP {prefix}_latency_seconds Latencia de calculate por modelo.",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for key, item in stats.items():
+            label = _escape(key)
+            for bound, count in item["latency_histogram"].items():
+                lines.append(f'{prefix}_latency_seconds_bucket{{model="{label}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{model="{label}"}} {item["total_seconds"]!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{model="{label}"}} {item["calls"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._seq = 0
+        if self.profiler is not None:
+            with self._profile_lock:
+                self.profiler = _new_profiler()
+
+
+def _new_profiler() -> Any:
+    # cProfile/pstats so sao importados quando o perfil amostrado e ligado
+    import cProfile
+
+    return cProfile.Profile()
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _describe(params: Dict[str, Any], limit: int = 200) -> str:
+    # Texto curto dos parametros; reprlib resume listas longas (ex.: amostras)
+    text = ", ".join(f"{name}={reprlib.repr(value)}" for name, value in sorted(params.items()))
+    return text if len(text) <= limit else text[: limit - 3] + "..."
@@ -1,10 +1,5 @@
 import streamlit as st
 
-from paginas.calculadora import show_calculator
-from paginas.guia_mg1_prioridades import show_mg1_priority_guide
-from paginas.guia_interpretacao import show_interpretation_guide
-from paginas.teoria import show_theory
-
 
 st.set_page_config(page_title="Teoria das Filas", page_icon="📈", layout="wide")
 
@@ -21,13 +16,27 @@ def main() -> None:
         ],
     )
 
+    # Cada pagina e importada so quando selecionada (a calculadora puxa os modelos)
     if page == "Calculadora":
+        from calculator import cache_stats, enable_result_cache
+        from paginas.calculadora import show_calculator
+
+        # O Streamlit reexecuta main() a cada interacao; o cache so e criado uma vez
+        if cache_stats() is None:
+            enable_result_cache(maxsize=128)
+
         show_calculator()
     elif page == "Conteúdo Teórico":
+        from paginas.teoria import show_theory
+
         show_theory()
     elif page == "Guia rápido (lambda, mu, S, K, N)":
+        from paginas.guia_interpretacao import show_interpretation_guide
+
         show_interpretation_guide()
     elif page == "Guia M/G/1 e Prioridades":
+        from paginas.guia_mg1_prioridades import show_mg1_priority_guide
+
         show_mg1_priority_guide()
 
 
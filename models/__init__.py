@@ -1,20 +1,75 @@
-from .mg1 import mg1
-from .mm1 import mm1
-from .mm1k import mm1k
-from .mm1n import mm1n
-from .mms import mms
-from .mmsk import mmsk
-from .mmsn import mmsn
-from .priority_extended import priority_with_preemption, priority_without_preemption
-
-__all__ = [
-    "mm1",
-    "mms",
-    "mm1k",
-    "mmsk",
-    "mm1n",
-    "mmsn",
-    "priority_with_preemption",
-    "priority_without_preemption",
-    "mg1",
-]
+"""
+Modelos de fila. Os submodulos sao importados sob demanda (PEP 562): `from
+models import mm1` carrega so `models.mm1`, e o NumPy so entra quando um modelo
+que depende dele (lote, M/G/1, prioridades, redes...) e usado.
+"""
+
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Dict
+
+# Nome publico -> submodulo que o define
+_EXPORTS: Dict[str, str] = {
+    "mm1": "mm1",
+    "mms": "mms",
+    "mm1k": "mm1k",
+    "mmsk": "mmsk",
+    "mm1n": "mm1n",
+    "mmsn": "mmsn",
+    "mms_abandonment": "mms_abandonment",
+    "gg1": "ggs",
+    "ggs": "ggs",
+    "priority_with_preemption": "priority_extended",
+    "priority_without_preemption": "priority_extended",
+    "mg1": "mg1",
+    "mm1_batch": "batch",
+    "mms_batch": "batch",
+    "mm1k_batch": "batch",
+    "mmsk_batch": "batch",
+    "mg1_batch": "batch",
+    "mms_abandonment_batch": "batch",
+    "gg1_batch": "batch",
+    "ggs_batch": "batch",
+    "mms_min_servers": "staffing",
+    "mmsk_min_servers": "staffing",
+    "max_arrival_rate": "inverse",
+    "min_service_rate": "inverse",
+    "cost_curve": "cost",
+    "prepare": "prepared",
+    "PreparedModel": "prepared",
+    "simulate_queue": "simulation",
+    "mm1k_transient": "transient",
+    "mmsk_transient": "transient",
+    "mm1n_transient": "transient",
+    "mmsn_transient": "transient",
+    "asymptotic_error_report": "erlang",
+    "estimate_parameters": "estimation",
+    "ParameterEstimator": "estimation",
+    "jackson_network": "network",
+    "mva": "mva",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def load(name: str) -> Any:
+    """
+    Resolve um nome de `_EXPORTS`. Use no lugar de `getattr(models, name)`:
+    importar `models.mm1` por outro caminho (ex.: `from .mm1 import mm1` em
+    network.py) faz o pacote apontar `models.mm1` para o submodulo, nao para a funcao.
+    """
+    value = globals().get(name)
+    if value is None or isinstance(value, ModuleType):
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value  # proximas consultas nao passam por aqui
+    return value
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load(name)
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
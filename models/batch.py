@@ -0,0 +1,531 @@
+from math import erfc
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+from .erlang import (
+    ASYMPTOTIC_MIN_SERVERS,
+    ERLANG_METHODS,
+    LOG_RESCALE_LIMIT,
+    NEGLIGIBLE_LOG_WEIGHT,
+    RESCALE_LIMIT,
+    TEMME_C0,
+    TEMME_C1,
+    TEMME_SERIES_ETA,
+    horner,
+)
+from .ggs import GGS_APPROXIMATIONS
+
+ArrayLike = Any
+
+CORE_KEYS = ("rho", "p0", "L", "Lq", "W", "Wq")
+
+
+def _broadcast(*values: ArrayLike) -> Tuple[np.ndarray, ...]:
+    arrays = [np.atleast_1d(np.asarray(value, dtype=float)) for value in values]
+    return tuple(np.array(arr, dtype=float) for arr in np.broadcast_arrays(*arrays))
+
+
+def _is_integer(values: np.ndarray) -> np.ndarray:
+    return np.isfinite(values) & (np.floor(values) == values)
+
+
+def _pack(
+    columns: Dict[str, np.ndarray], invalid: np.ndarray, unstable: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Monta o resultado colunar: linhas invalidas ou instaveis ficam com NaN e sao
+    sinalizadas nas mascaras em vez de levantar excecao.
+    """
+    error = invalid | unstable
+    result: Dict[str, np.ndarray] = {}
+    for key, column in columns.items():
+        column = np.array(column, dtype=float)
+        column[error] = np.nan
+        result[key] = column
+    result["invalid"] = invalid
+    result["unstable"] = unstable
+    result["error"] = error
+    return result
+
+
+def erlang_terms_batch(a: np.ndarray, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Versao vetorizada de `erlang_terms`: para cada linha devolve
+    (sum_{k<s} a^k/k!, a^s/s!, log_escala) com s possivelmente diferente por linha.
+    """
+    term = np.ones_like(a)
+    partial = np.zeros_like(a)
+    log_scale = np.zeros_like(a)
+    max_s = int(s.max()) if s.size else 0
+    for k in range(1, max_s + 1):
+        active = s >= k
+        partial = np.where(active, partial + term, partial)
+        term = np.where(active, term * a / k, term)
+        over = active & ((term > RESCALE_LIMIT) | (partial > RESCALE_LIMIT))
+        if over.any():
+            term[over] /= RESCALE_LIMIT
+            partial[over] /= RESCALE_LIMIT
+            log_scale[over] += LOG_RESCALE_LIMIT
+    return partial, term, log_scale
+
+
+_erfc = np.frompyfunc(erfc, 1, 1)
+
+
+def mms_constants_asymptotic_batch(a: np.ndarray, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Versao vetorizada de `erlang.mms_constants_asymptotic` (O(1) por linha, a < s)."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rho = a / s
+        x = rho - 1.0
+        half_eta2 = x - np.log1p(x)
+        eta = -np.sqrt(2.0 * half_eta2)
+        series = np.abs(eta) < TEMME_SERIES_ETA
+        c0 = np.where(series, horner(TEMME_C0, eta), 1.0 / x - 1.0 / eta)
+        c1 = np.where(
+            series,
+            horner(TEMME_C1, eta),
+            1.0 / eta**3 - 1.0 / x**3 - 1.0 / x**2 - 1.0 / (12.0 * x),
+        )
+        g = np.exp(-s * half_eta2) / np.sqrt(2.0 * np.pi * s)
+        below_s = 0.5 * _erfc(eta * np.sqrt(0.5 * s)).astype(float) + g * (c0 + c1 / s)
+        stirling = 1.0 / (12.0 * s) - 1.0 / (360.0 * s**3) + 1.0 / (1260.0 * s**5)
+        queue_term = g * np.exp(-stirling) / (1.0 - rho)
+        denom = below_s + queue_term
+        idle = a <= 0
+        return np.where(idle, 0.0, -a - np.log(denom)), np.where(idle, 0.0, queue_term / denom)
+
+
+def mms_constants_batch(a: np.ndarray, s: np.ndarray, method: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (log P0, C) do M/M/s linha a linha (a < s). Com method="auto" as linhas com
+    s >= ASYMPTOTIC_MIN_SERVERS usam a expansao O(1) e a recursao so vai ate o
+    maior s das demais.
+    """
+    if method not in ERLANG_METHODS:
+        raise ValueError(f"method deve ser um de {', '.join(ERLANG_METHODS)}")
+    asymptotic = np.full(a.shape, method == "asymptotic") | ((method == "auto") & (s >= ASYMPTOTIC_MIN_SERVERS))
+
+    s_exact = np.where(asymptotic, 0, s).astype(np.int64)
+    partial, last, log_scale = erlang_terms_batch(np.where(asymptotic, 0.0, a), s_exact)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        queue_term = last / (1.0 - a / s)
+        denom = partial + queue_term
+        log_p0 = -(log_scale + np.log(denom))
+        C = queue_term / denom
+    if asymptotic.any():
+        log_p0[asymptotic], C[asymptotic] = mms_constants_asymptotic_batch(a[asymptotic], s[asymptotic])
+    return log_p0, C
+
+
+def erlang_b_batch(a: ArrayLike, s: int) -> np.ndarray:
+    """
+    Erlang B para varias cargas `a` com o mesmo s, pela recursao estavel
+    B(k) = a*B(k-1) / (k + a*B(k-1)) aplicada a todas as cargas de uma vez.
+    """
+    a = np.atleast_1d(np.asarray(a, dtype=float))
+    b = np.ones_like(a)
+    for k in range(1, s + 1):
+        ab = a * b
+        b = ab / (k + ab)
+    return np.where(a > 0, b, 0.0 if s > 0 else 1.0)
+
+
+def _log_geometric_sum(ratio: np.ndarray, m: np.ndarray) -> np.ndarray:
+    near_one = np.abs(ratio - 1.0) < 1e-12
+    inv = np.where(ratio > 1, 1.0 / ratio, 0.0)
+    below = np.log((1.0 - ratio ** (m + 1)) / (1.0 - ratio))
+    above = m * np.log(ratio) + np.log((1.0 - inv ** (m + 1)) / (1.0 - inv))
+    result = np.where(ratio < 1, below, above)
+    return np.where(near_one, np.log(m + 1), np.where(m == 0, 0.0, result))
+
+
+def _truncated_geometric_mean(ratio: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """E[j] para P(j) proporcional a ratio^j, j = 0..m."""
+    near_one = np.abs(ratio - 1.0) < 1e-12
+    below = ratio / (1.0 - ratio) - (m + 1) * ratio ** (m + 1) / (1.0 - ratio ** (m + 1))
+    inv = np.where(ratio > 1, 1.0 / ratio, 0.0)
+    above = m - (inv / (1.0 - inv) - (m + 1) * inv ** (m + 1) / (1.0 - inv ** (m + 1)))
+    result = np.where(ratio < 1, below, above)
+    return np.where(near_one, m / 2.0, np.where(m == 0, 0.0, result))
+
+
+def _add_wait_quantiles(
+    columns: Dict[str, np.ndarray], quantiles: ArrayLike, solver: str, ok: np.ndarray, **params: np.ndarray
+) -> None:
+    """
+    Acrescenta as colunas Wq_quantiles e W_quantiles (linha x probabilidade). Linhas
+    invalidas ou instaveis entram como um sistema vazio e viram NaN em `_pack`.
+    """
+    from . import waiting_time  # importa batch; carregado so quando ha quantis
+
+    safe = {"lmbda": 0.0, "mu": 1.0, "s": 1.0, "K": 1.0}
+    params = {key: np.where(ok, value, safe[key]) if key in safe else value for key, value in params.items()}
+    columns.update(getattr(waiting_time, solver)(quantiles=quantiles, **params))
+
+
+def mm1_batch(
+    lmbda: ArrayLike, mu: ArrayLike, quantiles: ArrayLike | None = None, **kwargs
+) -> Dict[str, np.ndarray]:
+    """
+    Modelo M/M/1 vetorizado sobre arrays de lambda e mu. Com `quantiles`, inclui
+    os quantis de Wq e W de cada linha (uma coluna por probabilidade).
+    """
+    lmbda, mu = _broadcast(lmbda, mu)
+    invalid = ~(lmbda >= 0) | ~(mu > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rho = lmbda / mu
+        unstable = ~invalid & (rho >= 1)
+        L = rho / (1 - rho)
+        Lq = rho**2 / (1 - rho)
+        W = 1.0 / (mu - lmbda)
+        Wq = rho / (mu - lmbda)
+
+    columns = {"rho": rho, "p0": 1 - rho, "L": L, "Lq": Lq, "W": W, "Wq": Wq}
+    if quantiles is not None:
+        ok = ~(invalid | unstable)
+        _add_wait_quantiles(columns, quantiles, "mms_wait_quantiles", ok, lmbda=lmbda, mu=mu, s=np.ones_like(mu))
+    return _pack(columns, invalid, unstable)
+
+
+def mms_batch(
+    lmbda: ArrayLike,
+    mu: ArrayLike,
+    s: ArrayLike,
+    quantiles: ArrayLike | None = None,
+    method: str = "auto",
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """
+    Modelo M/M/s vetorizado. Cada linha pode ter s diferente; o custo e
+    O(max(s)) operacoes vetoriais, com as linhas de s >= ASYMPTOTIC_MIN_SERVERS
+    em O(1) pela expansao assintotica (method="auto"; "exact" ou "asymptotic"
+    forcam um dos caminhos). Com `quantiles`, inclui os quantis de Wq e W
+    (p99 de uma varredura inteira de s em uma chamada).
+    """
+    lmbda, mu, s = _broadcast(lmbda, mu, s)
+    invalid = ~(lmbda >= 0) | ~(mu > 0) | ~_is_integer(s) | ~(s >= 1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a = lmbda / mu
+        rho = a / s
+        unstable = ~invalid & (rho >= 1)
+        ok = ~(invalid | unstable)
+
+        log_p0, C = mms_constants_batch(np.where(ok, a, 0.0), np.where(ok, s, 1.0), method)
+        p0 = np.exp(log_p0)
+
+        Lq = C * rho / (1 - rho)
+        L = Lq + a
+        has_arrivals = lmbda > 0
+        W = np.where(has_arrivals, L / lmbda, 0.0)
+        Wq = np.where(has_arrivals, Lq / lmbda, 0.0)
+
+    columns = {"rho": rho, "p0": p0, "L": L, "Lq": Lq, "W": W, "Wq": Wq, "P(wait)": C}
+    if quantiles is not None:
+        _add_wait_quantiles(columns, quantiles, "mms_wait_quantiles", ok, lmbda=lmbda, mu=mu, s=s, method=method)
+    return _pack(columns, invalid, unstable)
+
+
+def _finite_capacity_batch(
+    lmbda: np.ndarray, mu: np.ndarray, s: np.ndarray, K: np.ndarray, ok: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Nucleo comum do M/M/s/K (e M/M/1/K) em forma fechada:
+    P_s..P_K formam uma geometrica truncada de razao rho = a/s.
+    """
+    a = np.where(ok, lmbda / mu, 0.0)
+    s_work = np.where(ok, s, 0).astype(np.int64)
+    m = np.where(ok, K - s, 0)
+    ratio = np.where(s_work > 0, a / np.maximum(s_work, 1), 0.0)
+
+    partial, last, log_scale = erlang_terms_batch(a, s_work)
+    log_last = np.log(last)
+    log_geo = _log_geometric_sum(ratio, m)
+    log_p0 = -(log_scale + np.logaddexp(np.log(partial), log_last + log_geo))
+    log_ps = log_p0 + log_scale + log_last
+
+    pK = np.exp(np.where(m == 0, log_ps, log_ps + m * np.log(ratio)))
+    queue_block = np.exp(log_ps + log_geo)
+    Lq = queue_block * _truncated_geometric_mean(ratio, m)
+    # Balanco de fluxo: servidores ocupados = a * (1 - P_K)
+    L = Lq + a * (1.0 - pK)
+    lambda_eff = lmbda * (1.0 - pK)
+    positive = lambda_eff > 0
+    W = np.where(positive, L / lambda_eff, 0.0)
+    Wq = np.where(positive, Lq / lambda_eff, 0.0)
+
+    return {
+        "p0": np.exp(log_p0),
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+        "lambda_eff": lambda_eff,
+        "pK": pK,
+    }
+
+
+def mm1k_batch(lmbda: ArrayLike, mu: ArrayLike, K: ArrayLike, **kwargs) -> Dict[str, np.ndarray]:
+    """Modelo M/M/1/K vetorizado (K inclui o cliente em servico)."""
+    lmbda, mu, K = _broadcast(lmbda, mu, K)
+    invalid = ~(lmbda >= 0) | ~(mu > 0) | ~_is_integer(K) | ~(K >= 0)
+    unstable = np.zeros_like(invalid)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        s = np.minimum(K, 1.0)
+        columns = _finite_capacity_batch(lmbda, mu, s, K, ~invalid)
+        columns = {"rho": lmbda / mu, **columns}
+    return _pack(columns, invalid, unstable)
+
+
+def mmsk_batch(
+    lmbda: ArrayLike, mu: ArrayLike, s: ArrayLike, K: ArrayLike, quantiles: ArrayLike | None = None, **kwargs
+) -> Dict[str, np.ndarray]:
+    """
+    Modelo M/M/s/K vetorizado; nunca e instavel, apenas invalido se K < s. Os
+    quantis (`quantiles`) de Wq e W de quem entra sao resolvidos linha a linha.
+    """
+    lmbda, mu, s, K = _broadcast(lmbda, mu, s, K)
+    invalid = (
+        ~(lmbda >= 0)
+        | ~(mu > 0)
+        | ~_is_integer(s)
+        | ~(s >= 1)
+        | ~_is_integer(K)
+        | ~(K >= s)
+    )
+    unstable = np.zeros_like(invalid)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        columns = _finite_capacity_batch(lmbda, mu, s, K, ~invalid)
+        columns = {"rho": lmbda / (s * mu), **columns}
+    if quantiles is not None:
+        _add_wait_quantiles(columns, quantiles, "mmsk_wait_quantiles", ~invalid, lmbda=lmbda, mu=mu, s=s, K=K)
+    return _pack(columns, invalid, unstable)
+
+
+# Elementos (linhas x estados) avaliados por vez na cadeia do Erlang-A em lote e
+# comprimento inicial da fila (dobrado ate a cauda ficar desprezivel)
+_ERLANG_A_BLOCK = 1_000_000
+_ERLANG_A_FIRST_QUEUE = 32
+
+
+def _erlang_a_rows(
+    lmbda: np.ndarray, mu: np.ndarray, s: np.ndarray, theta: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    (P0, ocupacao, Lq, P(wait)) de um grupo de linhas do M/M/s+M (lambda > 0)
+    em uma matriz linhas x estados: a^n/n! ate s de cada linha e a fila ate
+    um comprimento comum J, dobrado ate a cauda de todas ficar desprezivel.
+    """
+    servers = int(s.max())
+    n = np.arange(servers + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, servers + 1)))))
+    log_a = np.log(lmbda / mu)[:, None]
+    head = np.where(n <= s[:, None], n * log_a - log_factorial, -np.inf)
+    log_ws = s * log_a[:, 0] - log_factorial[s.astype(np.int64)]
+    peak = np.maximum(0.0, (lmbda - s * mu) / theta)
+
+    J = _ERLANG_A_FIRST_QUEUE
+    while True:
+        j = np.arange(1, J + 1)
+        queue = log_ws[:, None] + np.cumsum(
+            np.log(lmbda[:, None] / (s[:, None] * mu[:, None] + j * theta[:, None])), axis=1
+        )
+        top = np.maximum(head.max(axis=1), queue.max(axis=1))
+        if np.all((J > peak) & (queue[:, -1] < top - NEGLIGIBLE_LOG_WEIGHT)):
+            break
+        J *= 2
+
+    head = np.exp(head - top[:, None])
+    queue = np.exp(queue - top[:, None])
+    queue_mass = queue.sum(axis=1)
+    norm = head.sum(axis=1) + queue_mass
+    busy = (head @ n + s * queue_mass) / norm
+    wait = (np.exp(log_ws - top) + queue_mass) / norm
+    return head[:, 0] / norm, busy, (queue @ j) / norm, wait
+
+
+def mms_abandonment_batch(
+    lmbda: ArrayLike, mu: ArrayLike, s: ArrayLike, theta: ArrayLike, **kwargs
+) -> Dict[str, np.ndarray]:
+    """
+    Modelo M/M/s+M (Erlang-A) para arrays de parametros; nunca e instavel.
+    As linhas sao ordenadas por s e avaliadas em grupos de ate _ERLANG_A_BLOCK
+    estados, com a mesma truncagem da cadeia escalar.
+    """
+    lmbda, mu, s, theta = _broadcast(lmbda, mu, s, theta)
+    invalid = ~(lmbda >= 0) | ~(mu > 0) | ~_is_integer(s) | ~(s >= 1) | ~(theta > 0)
+    unstable = np.zeros_like(invalid)
+
+    p0, busy, Lq, wait = np.ones(lmbda.shape), np.zeros(lmbda.shape), np.zeros(lmbda.shape), np.zeros(lmbda.shape)
+    rows = np.flatnonzero(~invalid & (lmbda > 0))
+    rows = rows[np.argsort(s.ravel()[rows], kind="stable")]
+    flat = [arr.ravel() for arr in (lmbda, mu, s, theta)]
+    widths = flat[2][rows].astype(np.int64) + 1 + _ERLANG_A_FIRST_QUEUE
+    start = 0
+    while start < rows.size:
+        # s crescente: o grupo e dimensionado pelo maior s que contem
+        stop = min(rows.size, start + max(1, _ERLANG_A_BLOCK // int(widths[start])))
+        stop = start + max(1, min(stop - start, _ERLANG_A_BLOCK // int(widths[stop - 1])))
+        group = rows[start:stop]
+        values = _erlang_a_rows(*(arr[group] for arr in flat))
+        for column, value in zip((p0, busy, Lq, wait), values):
+            column.ravel()[group] = value
+        start = stop
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = Lq + busy
+        abandon = np.where(lmbda > 0, theta * Lq / lmbda, 0.0)
+        columns = {
+            "rho": lmbda / (s * mu),
+            "p0": p0,
+            "L": L,
+            "Lq": Lq,
+            "W": np.where(lmbda > 0, L / lmbda, 0.0),
+            "Wq": np.where(lmbda > 0, Lq / lmbda, 0.0),
+            "P(wait)": wait,
+            "P(abandon)": abandon,
+            "lambda_eff": lmbda * (1.0 - abandon),
+        }
+    return _pack(columns, invalid, unstable)
+
+
+def whitt_factor_batch(rho: np.ndarray, s: np.ndarray, ca2: np.ndarray, cs2: np.ndarray) -> np.ndarray:
+    """Correcao de Whitt (ggs.whitt_factor) elemento a elemento."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        gamma = np.minimum(0.24, (1 - rho) * (s - 1) * (np.sqrt(4 + 5 * s) - 2) / (16 * s * rho))
+        phi1 = 1 + gamma
+        phi3 = (1 - 4 * gamma) * np.exp(-2 * (1 - rho) / (3 * rho))
+        phi4 = np.minimum(1.0, ((phi1 + phi3) / 2) ** 2)
+        mean = (ca2 + cs2) / 2
+        psi = np.where(mean >= 1, 1.0, phi4 ** (2 * (1 - np.minimum(mean, 1.0))))
+        phi = np.where(
+            ca2 >= cs2,
+            (4 * (ca2 - cs2) * phi1 + cs2 * psi) / (4 * ca2 - 3 * cs2),
+            ((cs2 - ca2) * phi3 + (cs2 + 3 * ca2) * psi) / (2 * (ca2 + cs2)),
+        )
+    return np.where(ca2 + cs2 == 0, 1.0, phi)
+
+
+def ggs_batch(
+    lmbda: ArrayLike,
+    mu: ArrayLike,
+    s: ArrayLike,
+    ca2: ArrayLike = 1.0,
+    cs2: ArrayLike = 1.0,
+    approximation: str = "allen-cunneen",
+    method: str = "auto",
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """
+    Aproximacoes do G/G/s (ver ggs.ggs) vetorizadas. Os parametros sao
+    combinados por broadcasting, entao uma grade (ca2, cs2, s) pode vir de
+    np.meshgrid ou de eixos com formatos compativeis; o Erlang C sai de uma
+    unica chamada a mms_constants_batch sobre os pares (a, s) distintos.
+    """
+    if approximation not in GGS_APPROXIMATIONS:
+        raise ValueError(f"approximation deve ser uma de {', '.join(GGS_APPROXIMATIONS)}")
+    lmbda, mu, s, ca2, cs2 = _broadcast(lmbda, mu, s, ca2, cs2)
+    invalid = ~(lmbda >= 0) | ~(mu > 0) | ~_is_integer(s) | ~(s >= 1) | ~(ca2 >= 0) | ~(cs2 >= 0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rho = lmbda / (s * mu)
+        unstable = ~invalid & (rho >= 1)
+        ok = ~(invalid | unstable)
+        variability = (ca2 + cs2) / 2
+        if approximation == "kingman":
+            Wq = variability * rho ** (np.sqrt(2 * (s + 1)) - 1) / (s * (1 - rho)) / mu
+        else:
+            # C depende so de (a, s): numa grade de variabilidades cada par e resolvido uma vez
+            # (chave complexa a + i*s: np.unique 1-D e bem mais rapido que axis=0)
+            pairs = np.where(ok, lmbda / mu, 0.0) + 1j * np.where(ok, s, 1.0)
+            pairs, inverse = np.unique(pairs.ravel(), return_inverse=True)
+            _, C = mms_constants_batch(pairs.real, pairs.imag, method)
+            Wq = variability * C[inverse.ravel()].reshape(lmbda.shape) / (s * mu - lmbda)
+            if approximation == "whitt":
+                Wq = Wq * whitt_factor_batch(rho, s, ca2, cs2)
+        has_arrivals = lmbda > 0
+        Wq = np.where(has_arrivals, Wq, 0.0)
+        W = np.where(has_arrivals, Wq + 1 / mu, 0.0)
+
+    columns = {"rho": rho, "L": lmbda * W, "Lq": lmbda * Wq, "W": W, "Wq": Wq}
+    return _pack(columns, invalid, unstable)
+
+
+def gg1_batch(
+    lmbda: ArrayLike,
+    mu: ArrayLike,
+    ca2: ArrayLike = 1.0,
+    cs2: ArrayLike = 1.0,
+    approximation: str = "kingman",
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """G/G/1 vetorizado (Kingman por padrao); ver ggs_batch."""
+    kwargs.pop("s", None)
+    return ggs_batch(lmbda, mu, 1, ca2=ca2, cs2=cs2, approximation=approximation, **kwargs)
+
+
+_SERVICE_VARIANCE_FACTORS = {
+    # Var(S) = fator * E[S]^expoente
+    "poisson": (1.0, 1),
+    "exponential": (1.0, 2),
+    "deterministic": (0.0, 2),
+}
+
+
+def mg1_batch(
+    lmbda: ArrayLike,
+    mu: ArrayLike,
+    service_distribution: str | Iterable[str] = "poisson",
+    **kwargs,
+) -> Dict[str, np.ndarray]:
+    """
+    Modelo M/G/1 vetorizado. `service_distribution` pode ser uma string unica
+    ou um array de strings (uma por linha).
+    """
+    lmbda, mu = _broadcast(lmbda, mu)
+    # Entradas que nao sao texto (numeros, NaN de DataFrame) viram um nome desconhecido: linha invalida
+    dists = np.broadcast_to(
+        np.asarray(
+            [
+                (d or "poisson").strip().lower() if d is None or isinstance(d, str) else "?"
+                for d in np.atleast_1d(np.asarray(service_distribution, dtype=object))
+            ]
+        ),
+        lmbda.shape,
+    )
+    known = np.isin(dists, list(_SERVICE_VARIANCE_FACTORS))
+    invalid = ~(lmbda >= 0) | ~(mu > 0) | ~known
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mean_service = 1.0 / mu
+        variance = np.zeros_like(mean_service)
+        for name, (factor, power) in _SERVICE_VARIANCE_FACTORS.items():
+            variance = np.where(dists == name, factor * mean_service**power, variance)
+
+        ES2 = variance + mean_service**2
+        rho = lmbda * mean_service
+        unstable = ~invalid & (rho >= 1)
+
+        Wq = lmbda * ES2 / (2.0 * (1.0 - rho))
+        W = Wq + mean_service
+        Lq = lmbda * Wq
+        L = Lq + rho
+        cs2 = variance / mean_service**2
+
+    columns = {
+        "rho": rho,
+        "p0": 1.0 - rho,
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+        "E[S]": mean_service,
+        "E[S^2]": ES2,
+        "Var(S)": variance,
+        "cs2": cs2,
+    }
+    return _pack(columns, invalid, unstable)
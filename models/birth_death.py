@@ -0,0 +1,73 @@
+from array import array
+from typing import Callable, List, NamedTuple
+
+from .erlang import RESCALE_LIMIT
+
+
+class BirthDeathSolution(NamedTuple):
+    """
+    Distribuicao estacionaria de um processo nascimento-morte com estados 0..K.
+
+    - probs: P(0)..P(K) normalizados
+    - L: sum n*Pn
+    - busy_servers: sum min(n, s)*Pn
+    """
+
+    probs: array
+    L: float
+    busy_servers: float
+
+    @property
+    def p0(self) -> float:
+        return self.probs[0]
+
+    @property
+    def pK(self) -> float:
+        return self.probs[-1]
+
+
+def solve_birth_death(
+    max_state: int,
+    ratio: Callable[[int], float],
+    servers: int,
+) -> BirthDeathSolution:
+    """
+    Resolve a cadeia com P_n = P_{n-1} * ratio(n), ratio(n) = lambda_{n-1}/mu_n.
+
+    Os pesos sao construidos em uma unica passada recursiva O(K); quando passam de
+    RESCALE_LIMIT o peso corrente e dividido pelo limite e o indice e anotado,
+    de modo que nao ha overflow nem potencias/fatoriais recalculados por estado.
+    A passada seguinte alinha as escalas e acumula a soma, L e os servidores
+    ocupados sobre o mesmo array, que depois e normalizado no lugar.
+    """
+    weights = array("d", [1.0])
+    rescale_points: List[int] = []
+    weight = 1.0
+    for state in range(1, max_state + 1):
+        weight *= ratio(state)
+        if weight > RESCALE_LIMIT:
+            weight /= RESCALE_LIMIT
+            rescale_points.append(state)
+        weights.append(weight)
+
+    # Fator de cada trecho relativo ao trecho de maior escala
+    max_scale = len(rescale_points)
+    boundaries = rescale_points + [max_state + 1]
+    total = 0.0
+    L = 0.0
+    busy = 0.0
+    start = 0
+    for scale, stop in enumerate(boundaries):
+        factor = RESCALE_LIMIT ** (scale - max_scale)
+        for state in range(start, stop):
+            weight = weights[state] * factor
+            weights[state] = weight
+            total += weight
+            L += state * weight
+            busy += min(state, servers) * weight
+        start = stop
+
+    for state in range(max_state + 1):
+        weights[state] /= total
+
+    return BirthDeathSolution(weights, L / total, busy / total)
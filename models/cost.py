@@ -0,0 +1,280 @@
+from math import isfinite, log
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .erlang import erlang_c_from_b
+from .priority_common import coerce_arrival_rates
+from .priority_extended import priority_with_preemption, priority_without_preemption
+from .staffing import MAX_SEARCH_SERVERS
+
+COST_METRICS = ("L", "Lq")
+
+_PRIORITY_MODELS = {
+    "PRIORIDADE_PREEMPTIVA_3X3": priority_with_preemption,
+    "PRIORIDADE_NAO_PREEMPTIVA_3X3": priority_without_preemption,
+}
+
+# Linha da curva: (L, Lq[, pK]); arrays por classe nos modelos de prioridade
+Row = Tuple[Any, Any]
+INF = float("inf")
+# Massa acima de s a partir da qual o M/M/s/N deixa de mudar com mais servidores
+_NEGLIGIBLE_TAIL = 1e-16
+
+
+def _validate_rates(lmbda: float, mu: float) -> None:
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+
+
+def _mms_rows(lmbda: float, mu: float, s_min: int, s_max: int, done: Callable[[Any], bool]) -> List[Row]:
+    """L e Lq do M/M/s para s = s_min..s_max com uma unica recursao de Erlang B."""
+    _validate_rates(lmbda, mu)
+    a = lmbda / mu
+    b = 1.0
+    rows: List[Row] = []
+    for s in range(1, s_max + 1):
+        b = a * b / (s + a * b)
+        if s < s_min:
+            continue
+        if a >= s:
+            rows.append((INF, INF))  # instavel
+            continue
+        Lq = erlang_c_from_b(a, s, b) * a / (s - a) if a > 0 else 0.0
+        rows.append((Lq + a, Lq))
+        if done(Lq):
+            break
+    return rows
+
+
+def _geometric_sums(ratio: float, m: int) -> Tuple[float, float]:
+    """(sum_{j<=m} r^j, sum_{j<=m} j r^j) para r < 1 com m |log r| >= 1 (sem cancelamento)."""
+    power = ratio**m
+    G = (1.0 - power * ratio) / (1.0 - ratio)
+    H = ratio * (1.0 - power * (1.0 + m * (1.0 - ratio))) / (1.0 - ratio) ** 2
+    return G, H
+
+
+def _mmsk_rows(lmbda: float, mu: float, K: int, s_min: int, s_max: int) -> List[Row]:
+    """
+    L, Lq e pK do M/M/s/K para cada s: com D = 1/B(s) - 1 (estados n < s) e a
+    cauda geometrica rho^(n-s) em forma fechada, cada s custa O(1) apos a
+    recursao de Erlang B.
+    """
+    _validate_rates(lmbda, mu)
+    if not isinstance(K, int) or K < 1:
+        raise ValueError("K deve ser inteiro >= 1")
+    a = lmbda / mu
+    b = 1.0
+    rows: List[Row] = []
+    for s in range(1, min(s_max, K) + 1):
+        b = a * b / (s + a * b)
+        if s < s_min:
+            continue
+        if b == 0:
+            rows.append((a, 0.0, 0.0))
+            continue
+        rho = a / s
+        m = K - s
+        D = 1.0 / b - 1.0
+        if m * abs(log(rho)) < 1.0:
+            # rho perto de 1: soma direta, termos limitados por e
+            j = np.arange(m + 1)
+            powers = rho ** (j - m)  # escalado por rho^m
+            Z = D * rho ** (-m) + powers.sum()
+            pK, Lq = 1.0 / Z, float(j @ powers) / Z
+        elif rho < 1:
+            G, H = _geometric_sums(rho, m)
+            pK, Lq = rho**m / (D + G), H / (D + G)
+        else:
+            # Divide tudo por rho^m: sum_j j rho^(j-m) = m G_r - H_r com r = 1/rho
+            G, H = _geometric_sums(1.0 / rho, m)
+            Z = D * rho ** (-m) + G
+            pK, Lq = 1.0 / Z, (m * G - H) / Z
+        rows.append((Lq + a * (1.0 - pK), Lq, pK))
+    return rows
+
+
+def _mmsn_rows(lmbda: float, mu: float, N: int, s_min: int, s_max: int) -> List[Row]:
+    """
+    L e Lq do M/M/s/N: os termos log(N!/(N-n)!) + n log a sao calculados uma
+    vez; cada s so troca o denominador dos estados n > s. Quando a massa acima
+    de s fica abaixo de _NEGLIGIBLE_TAIL, L e Lq ja nao mudam (erro <= N * 1e-16)
+    e a curva e repetida.
+    """
+    _validate_rates(lmbda, mu)
+    if not isinstance(N, int) or N < 1:
+        raise ValueError("N deve ser inteiro >= 1")
+    a = lmbda / mu
+    if a == 0:
+        return [(0.0, 0.0)] * (min(s_max, N) - s_min + 1)
+    n = np.arange(N + 1, dtype=float)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, N + 1)))))
+    base = log_factorial[N] - log_factorial[N - n.astype(int)] + n * log(a)
+
+    rows: List[Row] = []
+    for s in range(s_min, min(s_max, N) + 1):
+        log_w = base - np.where(n <= s, log_factorial[n.astype(int)], log_factorial[s] + (n - s) * log(s))
+        p = np.exp(log_w - log_w.max())
+        p /= p.sum()
+        L = float(n @ p)
+        Lq = float(np.maximum(n - s, 0.0) @ p)
+        rows.append((L, Lq))
+        if p[s + 1 :].sum() <= _NEGLIGIBLE_TAIL:
+            rows.extend([(L, Lq)] * (min(s_max, N) - s))
+            break
+    return rows
+
+
+def _priority_rows(
+    model: str,
+    rates: np.ndarray,
+    mu: float,
+    s_min: int,
+    s_max: int,
+    done: Callable[[Any], bool],
+) -> List[Row]:
+    """
+    L e Lq por classe para cada s. A recursao de Erlang B roda uma vez sobre as
+    cargas acumuladas de todas as classes (Erlang C das subfilas 1..k); s = 1
+    usa as formulas dedicadas do modelo.
+    """
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    prefix = np.cumsum(rates)
+    previous = np.concatenate(([0.0], prefix[:-1]))
+    loads = prefix / mu
+    total = prefix[-1]
+    preemptive = model == "PRIORIDADE_PREEMPTIVA_3X3"
+    unstable = (np.full(rates.size, INF), np.full(rates.size, INF))
+
+    b = np.ones(rates.size)
+    rows: List[Row] = []
+    for s in range(1, s_max + 1):
+        b = loads * b / (s + loads * b)
+        if s < s_min:
+            continue
+        if total >= s * mu:
+            rows.append(unstable)
+            continue
+        if s == 1:
+            per_class = _PRIORITY_MODELS[model](rates.tolist(), mu, 1)["per_class"]
+            W = np.array([cls["W"] for cls in per_class])
+        elif preemptive:
+            # sum_{j<=k} lambda_j W_j = Lambda_k Wbar_k (M/M/s agregado das classes 1..k)
+            waiting = np.where(loads > 0, s * b / (s - loads * (1.0 - b)), 0.0)
+            Wbar = np.where(prefix > 0, waiting / (s * mu - prefix) + 1.0 / mu, 0.0)
+            cumulative_L = prefix * Wbar
+            L_class = np.diff(cumulative_L, prepend=0.0)
+            W = np.divide(L_class, rates, out=np.full(rates.size, 1.0 / mu), where=rates > 0)
+        else:
+            capacity = s * mu
+            base = INF if b[-1] == 0 else (capacity - total) * (1.0 / b[-1] - 1.0) + capacity
+            W = 1.0 / (base * (1.0 - previous / capacity) * (1.0 - prefix / capacity)) + 1.0 / mu
+        L_class = rates * W
+        Lq_class = np.maximum(rates * (W - 1.0 / mu), 0.0)
+        rows.append((L_class, Lq_class))
+        if done(Lq_class):
+            break
+    return rows
+
+
+def cost_curve(
+    model: str,
+    server_cost: float,
+    waiting_cost: float | Sequence[float],
+    mu: float,
+    lmbda: float | None = None,
+    s_min: int = 1,
+    s_max: int | None = None,
+    K: int | None = None,
+    N: int | None = None,
+    arrival_rates: Sequence[float] | None = None,
+    metric: str = "L",
+) -> Dict[str, Any]:
+    """
+    Custo total por unidade de tempo em funcao do numero de servidores:
+    custo = server_cost * s + waiting_cost * L (ou Lq, com metric="Lq").
+
+    - model: M/M/S (ou M/M/1), M/M/S/K, M/M/S/N ou um modelo de prioridade;
+      nos de prioridade waiting_cost pode ser uma lista (custo por classe)
+    - s_max: maior s avaliado; padrao K (M/M/S/K), N (M/M/S/N) ou, nos modelos
+      sem perda, o primeiro s em que waiting_cost * Lq <= server_cost (nenhum
+      s maior pode ficar mais barato)
+
+    A curva inteira sai de uma unica recursao de Erlang B em s (O(s_max));
+    valores de s instaveis tem custo infinito. Devolve arrays s, L, Lq,
+    server_cost, waiting_cost e total_cost, alem de optimal_s e optimal_cost.
+    """
+    if metric not in COST_METRICS:
+        raise ValueError(f"metric deve ser uma de {', '.join(COST_METRICS)}.")
+    if server_cost < 0:
+        raise ValueError("server_cost deve ser >= 0")
+    if not isinstance(s_min, int) or s_min < 1:
+        raise ValueError("s_min deve ser inteiro >= 1")
+    if s_max is not None and (not isinstance(s_max, int) or s_max < s_min):
+        raise ValueError("s_max deve ser inteiro >= s_min")
+
+    priority = model in _PRIORITY_MODELS
+    if priority:
+        rates = np.asarray(coerce_arrival_rates(arrival_rates))
+        costs = np.broadcast_to(np.asarray(waiting_cost, dtype=float), rates.shape)
+    else:
+        if model not in ("M/M/1", "M/M/S", "M/M/S/K", "M/M/S/N"):
+            raise ValueError(
+                "Modelo deve ser um de M/M/1, M/M/S, M/M/S/K, M/M/S/N ou de prioridade."
+            )
+        costs = np.asarray(float(waiting_cost))
+    if np.any(costs < 0):
+        raise ValueError("waiting_cost deve ser >= 0")
+
+    def done(Lq: Any) -> bool:
+        # Sem s_max: para quando o ganho maximo de mais servidores (zerar Lq) nao paga um servidor
+        return s_max is None and float(np.sum(costs * Lq)) <= server_cost
+
+    limit = s_max if s_max is not None else MAX_SEARCH_SERVERS
+    extras: Dict[str, Any] = {}
+    if model == "M/M/1":
+        rows = _mms_rows(lmbda, mu, 1, 1, done)
+    elif model == "M/M/S":
+        rows = _mms_rows(lmbda, mu, s_min, limit, done)
+    elif model == "M/M/S/K":
+        rows = _mmsk_rows(lmbda, mu, K, s_min, s_max if s_max is not None else K)
+        extras["pK"] = np.array([row[2] for row in rows])
+    elif model == "M/M/S/N":
+        rows = _mmsn_rows(lmbda, mu, N, s_min, s_max if s_max is not None else N)
+    else:
+        rows = _priority_rows(model, rates, mu, s_min, limit, done)
+
+    if not rows:
+        raise ValueError("Nenhum s no intervalo pedido (s_min acima da capacidade).")
+    servers = np.arange(s_min, s_min + len(rows)) if model != "M/M/1" else np.array([1])
+    if priority:
+        L_class = np.array([row[0] for row in rows])
+        Lq_class = np.array([row[1] for row in rows])
+        waiting = (L_class if metric == "L" else Lq_class) @ costs
+        L, Lq = L_class.sum(axis=1), Lq_class.sum(axis=1)
+        extras.update({"L_class": L_class, "Lq_class": Lq_class})
+    else:
+        L = np.array([row[0] for row in rows])
+        Lq = np.array([row[1] for row in rows])
+        waiting = float(costs) * (L if metric == "L" else Lq)
+    waiting = np.where(np.isfinite(L), waiting, INF)  # evita 0 * inf
+
+    total = server_cost * servers + waiting
+    best = int(np.argmin(total))
+    if not isfinite(total[best]):
+        raise ValueError("Nenhum s do intervalo deixa o sistema estavel; aumente s_max.")
+    return {
+        "s": servers,
+        "L": L,
+        "Lq": Lq,
+        "server_cost": server_cost * servers,
+        "waiting_cost": waiting,
+        "total_cost": total,
+        "optimal_s": int(servers[best]),
+        "optimal_cost": float(total[best]),
+        **extras,
+    }
@@ -0,0 +1,215 @@
+from math import erfc, exp, expm1, lgamma, log, log1p, pi, sqrt
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+# Constantes de ajuste publicas: os nucleos escalares, batch.py e birth_death.py
+# usam as mesmas. Limite para reescalar as somas parciais e evitar overflow de float
+RESCALE_LIMIT = 1e250
+LOG_RESCALE_LIMIT = log(RESCALE_LIMIT)
+
+# A partir deste s, method="auto" troca a recursao O(s) pela expansao assintotica
+# O(1); erro relativo medido em C e P0: <= 1e-12 para s >= 5000 (3.5e-11 em s = 1000,
+# 2e-9 em s = 200, decaindo como s^(-5/2)). Ver `asymptotic_error_report`.
+ASYMPTOTIC_MIN_SERVERS = 5000
+ERLANG_METHODS = ("auto", "exact", "asymptotic")
+
+# Coeficientes de Taylor em eta de c0(eta) e c1(eta) da expansao de Temme, usados
+# perto de eta = 0 (lambda ~ s), onde as formas fechadas cancelam
+TEMME_C0 = (-1.0 / 3.0, 1.0 / 12.0, -2.0 / 135.0, 1.0 / 864.0, 1.0 / 2835.0)
+TEMME_C1 = (-1.0 / 540.0, -1.0 / 288.0, 1.0 / 378.0, -7.0 / 8640.0)
+TEMME_SERIES_ETA = 0.01
+
+# Cadeias truncadas (Erlang-A, escalar e em lote) param quando o peso cai e^-40 abaixo do maximo
+NEGLIGIBLE_LOG_WEIGHT = 40.0
+
+
+class ErlangTerms(NamedTuple):
+    """
+    Somas do M/M/s divididas por e^log_scale:
+      - partial_sum = sum_{k<s} a^k/k!
+      - last_term = a^s/s!
+    """
+
+    partial_sum: float
+    last_term: float
+    log_scale: float
+
+
+def erlang_terms(a: float, s: int) -> ErlangTerms:
+    """
+    Calcula sum_{k<s} a^k/k! e a^s/s! em uma unica passada O(s), sem fatoriais
+    inteiros: cada termo vem do anterior (t_k = t_{k-1} * a/k) e as somas sao
+    reescaladas quando crescem demais.
+    """
+    term = 1.0
+    partial = 0.0
+    log_scale = 0.0
+    for k in range(1, s + 1):
+        partial += term
+        term *= a / k
+        if term > RESCALE_LIMIT or partial > RESCALE_LIMIT:
+            term /= RESCALE_LIMIT
+            partial /= RESCALE_LIMIT
+            log_scale += LOG_RESCALE_LIMIT
+    return ErlangTerms(partial, term, log_scale)
+
+
+def erlang_b(a: float, s: int) -> float:
+    """
+    Erlang B (probabilidade de bloqueio do M/M/s/s) pela recursao
+    B(0) = 1, B(k) = a*B(k-1) / (k + a*B(k-1)).
+    """
+    if s < 0:
+        raise ValueError("s deve ser inteiro >= 0")
+    if a <= 0:
+        return 1.0 if s == 0 else 0.0
+
+    b = 1.0
+    for k in range(1, s + 1):
+        b = a * b / (k + a * b)
+    return b
+
+
+def erlang_c_from_b(a: float, s: int, b: float) -> float:
+    """Converte Erlang B em Erlang C: C = s*B / (s - a*(1 - B))."""
+    return s * b / (s - a * (1.0 - b))
+
+
+def horner(coefficients: Tuple[float, ...], x):
+    """sum_k coefficients[k] * x^k (x escalar ou array)."""
+    result = 0.0
+    for coefficient in reversed(coefficients):
+        result = result * x + coefficient
+    return result
+
+
+def use_asymptotic(s: int, method: str) -> bool:
+    if method not in ERLANG_METHODS:
+        raise ValueError(f"method deve ser um de {', '.join(ERLANG_METHODS)}")
+    return method == "asymptotic" or (method == "auto" and s >= ASYMPTOTIC_MIN_SERVERS)
+
+
+def mms_constants_asymptotic(a: float, s: int) -> Tuple[float, float]:
+    """
+    (log P0, C) do M/M/s em O(1) pela expansao uniforme de Temme da Poisson,
+    cujo termo principal e a aproximacao de Halfin-Whitt do regime QED
+    (C ~ [1 + beta Phi(beta)/phi(beta)]^-1 com beta = (s - a)/sqrt(s)):
+      - sum_{k<s} a^k/k! = e^a Q(s, a), com Q(s, a) = P(Poisson(a) <= s - 1)
+        = erfc(eta sqrt(s/2))/2 + g (c0(eta) + c1(eta)/s), g = e^{-s eta^2/2}/sqrt(2 pi s),
+        eta^2/2 = lambda - 1 - ln(lambda) e lambda = a/s < 1 (eta < 0);
+      - a^s/s! = e^a g e^{-(serie de Stirling)}.
+    O erro relativo cai como s^(-5/2) (ver ASYMPTOTIC_MIN_SERVERS).
+    """
+    rho = a / s
+    if rho >= 1:
+        raise ValueError(f"Sistema instavel (rho = {rho:.6f} >= 1).")
+    if a <= 0:
+        return 0.0, 0.0
+
+    x = rho - 1.0
+    half_eta2 = x - log1p(x)
+    eta = -sqrt(2.0 * half_eta2)
+    if abs(eta) < TEMME_SERIES_ETA:
+        c0, c1 = horner(TEMME_C0, eta), horner(TEMME_C1, eta)
+    else:
+        c0 = 1.0 / x - 1.0 / eta
+        c1 = 1.0 / eta**3 - 1.0 / x**3 - 1.0 / x**2 - 1.0 / (12.0 * x)
+    g = exp(-s * half_eta2) / sqrt(2.0 * pi * s)
+    below_s = 0.5 * erfc(eta * sqrt(0.5 * s)) + g * (c0 + c1 / s)
+    stirling = 1.0 / (12.0 * s) - 1.0 / (360.0 * s**3) + 1.0 / (1260.0 * s**5)
+    queue_term = g * exp(-stirling) / (1.0 - rho)
+    denom = below_s + queue_term
+    return -a - log(denom), queue_term / denom
+
+
+def mms_constants(a: float, s: int, method: str = "auto") -> Tuple[float, float]:
+    """
+    Retorna (log P0, C) do M/M/s com carga a = lambda/mu < s, onde C e a
+    probabilidade de espera (Erlang C). method: "exact" (recursao O(s)),
+    "asymptotic" (O(1), `mms_constants_asymptotic`) ou "auto" (assintotico
+    a partir de ASYMPTOTIC_MIN_SERVERS servidores).
+    """
+    if use_asymptotic(s, method):
+        return mms_constants_asymptotic(a, s)
+
+    rho = a / s
+    if rho >= 1:
+        raise ValueError(f"Sistema instavel (rho = {rho:.6f} >= 1).")
+
+    terms = erlang_terms(a, s)
+    queue_term = terms.last_term / (1.0 - rho)
+    denom = terms.partial_sum + queue_term
+    log_p0 = -(terms.log_scale + log(denom))
+    return log_p0, queue_term / denom
+
+
+def asymptotic_error_report(
+    s_values: Iterable[int] = (100, 1000, ASYMPTOTIC_MIN_SERVERS, 10_000, 100_000),
+    rho_values: Sequence[float] | None = None,
+    betas: Sequence[float] = (0.1, 0.5, 1.0, 2.0, 3.0),
+) -> Dict[str, List[float]]:
+    """
+    Compara `mms_constants_asymptotic` com a recursao exata: para cada s, o
+    maior erro relativo de C e de P0 sobre as ocupacoes `rho_values` e os pontos
+    do regime QED rho = 1 - beta/sqrt(s). A recursao e O(s), entao s grande demora;
+    por volta de s = 10^5 o erro de arredondamento da propria recursao em P0
+    (~1e-10, acumulado ao longo da recursao) passa a dominar a diferenca.
+    """
+    rho_values = (0.5, 0.8, 0.9, 0.95, 0.99, 0.999) if rho_values is None else rho_values
+    report: Dict[str, List[float]] = {"s": [], "max_rel_error_C": [], "max_rel_error_p0": [], "worst_rho": []}
+    for s in s_values:
+        errors = []
+        for rho in list(rho_values) + [1.0 - beta / sqrt(s) for beta in betas]:
+            if not 0 < rho < 1:
+                continue
+            log_p0, C = mms_constants(rho * s, s, "exact")
+            approx_log_p0, approx_C = mms_constants_asymptotic(rho * s, s)
+            error_C = abs(approx_C / C - 1.0) if C > 1e-300 else 0.0
+            error_p0 = abs(expm1(approx_log_p0 - log_p0))
+            errors.append((max(error_C, error_p0), error_C, error_p0, rho))
+        report["s"].append(s)
+        report["max_rel_error_C"].append(max(error[1] for error in errors))
+        report["max_rel_error_p0"].append(max(error[2] for error in errors))
+        report["worst_rho"].append(max(errors)[3])
+    return report
+
+
+def erlang_c(a: float, s: int, method: str = "auto") -> float:
+    """Erlang C (probabilidade de espera no M/M/s) para a = lambda/mu < s."""
+    if a <= 0:
+        return 0.0
+    return mms_constants(a, s, method)[1]
+
+
+def log_state_weight(a: float, s: int, n: int) -> float:
+    """
+    log do peso nao normalizado do estado n no M/M/s (a > 0):
+    a^n/n! para n <= s e a^n/(s! * s^(n-s)) para n > s.
+    """
+    if n <= s:
+        return n * log(a) - lgamma(n + 1)
+    return s * log(a) - lgamma(s + 1) + (n - s) * log(a / s)
+
+
+def log_geometric_sum(ratio: float, m: int) -> float:
+    """log de sum_{j=0}^{m} ratio^j sem overflow para ratio > 1."""
+    if ratio <= 0:
+        return 0.0
+    if abs(ratio - 1.0) < 1e-12:
+        return log(m + 1)
+    if ratio < 1:
+        return log((1.0 - ratio ** (m + 1)) / (1.0 - ratio))
+    inv = 1.0 / ratio
+    return m * log(ratio) + log((1.0 - inv ** (m + 1)) / (1.0 - inv))
+
+
+def safe_log(value: float) -> float:
+    """log que devolve -inf para zero (termos que sofreram underflow)."""
+    return log(value) if value > 0 else float("-inf")
+
+
+def log_add(x: float, y: float) -> float:
+    """log(e^x + e^y) sem overflow."""
+    high = max(x, y)
+    if high == float("-inf"):
+        return high
+    return high + log(exp(x - high) + exp(y - high))
@@ -0,0 +1,282 @@
+import csv
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence, Set
+
+import numpy as np
+
+ArrayLike = Any
+
+DEFAULT_CHUNK_ROWS = 65536
+_TIMESTAMP_UNITS = {"s": 1.0, "ms": 1e3, "us": 1e6, "ns": 1e9}
+
+
+def _to_seconds(values: Sequence[Any]) -> np.ndarray:
+    """Converte numeros (segundos) ou textos ISO 8601 em segundos (float)."""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        pass
+    seconds = np.empty(len(values))
+    for idx, value in enumerate(values):
+        if isinstance(value, datetime):
+            seconds[idx] = value.timestamp()
+            continue
+        try:
+            seconds[idx] = float(value)
+        except (TypeError, ValueError):
+            try:
+                seconds[idx] = datetime.fromisoformat(str(value).strip()).timestamp()
+            except ValueError:
+                raise ValueError(f"Instante invalido no log: {value!r}") from None
+    return seconds
+
+
+def _class_order(label: Any) -> tuple:
+    # Rotulos numericos ("1", "2", "10") em ordem numerica, os demais como texto
+    try:
+        return (0, float(label), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(label))
+
+
+class ParameterEstimator:
+    """
+    Acumula, bloco a bloco, as estatisticas de um log de atendimentos e estima
+    lambda, mu, momentos do servico e taxas de chegada por classe. A memoria
+    nao depende do tamanho do log (somas e contagens por classe).
+
+    O tempo de servico de cada registro vem, nesta ordem, de `services`
+    (duracao), de `completions - starts` ou, sem nenhum dos dois, da
+    reconstrucao de uma fila FCFS de um servidor:
+    S_i = C_i - max(A_i, C_{i-1}) (exige chegadas em ordem).
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first_arrival = float("inf")
+        self.last_arrival = float("-inf")
+        self.service_sums = np.zeros(3)  # sum S, S^2, S^3
+        self.sojourn_sum = 0.0
+        self.sojourn_count = 0
+        self.interarrival_sums = np.zeros(2)  # sum X, X^2
+        self.ordered = True
+        self.class_counts: Dict[Any, int] = {}
+        self._previous_arrival: float | None = None
+        self._previous_completion: float | None = None
+
+    def update(
+        self,
+        arrivals: ArrayLike,
+        completions: ArrayLike | None = None,
+        starts: ArrayLike | None = None,
+        services: ArrayLike | None = None,
+        classes: Sequence[Any] | None = None,
+    ) -> None:
+        arrivals = _to_seconds(arrivals)
+        size = arrivals.size
+        if size == 0:
+            return
+        completions = _to_seconds(completions) if completions is not None else None
+
+        if services is not None:
+            service = _to_seconds(services)
+        elif starts is not None and completions is not None:
+            service = completions - _to_seconds(starts)
+        elif completions is not None:
+            if not self.ordered or np.any(np.diff(arrivals) < 0):
+                raise ValueError(
+                    "Sem inicio de servico, o log precisa estar ordenado por chegada."
+                )
+            previous = np.empty(size)
+            previous[0] = (
+                self._previous_completion if self._previous_completion is not None else -np.inf
+            )
+            previous[1:] = completions[:-1]
+            service = completions - np.maximum(arrivals, previous)
+            self._previous_completion = float(completions[-1])
+        else:
+            raise ValueError("Informe a conclusao, o inicio ou a duracao do servico.")
+
+        if np.any(service < 0) or not np.all(np.isfinite(service)):
+            raise ValueError("Tempos de servico negativos ou invalidos no log.")
+
+        self.count += size
+        self.first_arrival = min(self.first_arrival, float(arrivals.min()))
+        self.last_arrival = max(self.last_arrival, float(arrivals.max()))
+        self.service_sums += (service.sum(), (service**2).sum(), (service**3).sum())
+
+        if completions is not None:
+            self.sojourn_sum += float((completions - arrivals).sum())
+            self.sojourn_count += size
+
+        if self.ordered:
+            chained = arrivals if self._previous_arrival is None else np.concatenate(
+                ([self._previous_arrival], arrivals)
+            )
+            gaps = np.diff(chained)
+            if np.any(gaps < 0):
+                self.ordered = False
+            else:
+                self.interarrival_sums += (gaps.sum(), (gaps**2).sum())
+            self._previous_arrival = float(arrivals[-1])
+
+        if classes is not None:
+            labels, counts = np.unique(np.asarray(classes), return_counts=True)
+            for label, count in zip(labels.tolist(), counts.tolist()):
+                self.class_counts[label] = self.class_counts.get(label, 0) + count
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < 2 or self.last_arrival <= self.first_arrival:
+            raise ValueError("O log precisa de ao menos duas chegadas em instantes distintos.")
+
+        span = self.last_arrival - self.first_arrival
+        lmbda = (self.count - 1) / span
+        ES, ES2, ES3 = (float(value) for value in self.service_sums / self.count)
+        if ES <= 0:
+            raise ValueError("Tempo medio de servico nulo; nao ha como estimar mu.")
+        variance = max(ES2 - ES**2, 0.0)
+
+        result: Dict[str, Any] = {
+            "n": self.count,
+            "span": span,
+            "lmbda": lmbda,
+            "mu": 1.0 / ES,
+            "ES": ES,
+            "ES2": ES2,
+            "ES3": ES3,
+            "Var(S)": variance,
+            "cs2": variance / ES**2,
+        }
+
+        if self.ordered:
+            gaps = self.count - 1
+            mean_gap, gap2 = (float(value) for value in self.interarrival_sums / gaps)
+            result["ca2"] = max(gap2 - mean_gap**2, 0.0) / mean_gap**2
+        if self.sojourn_count:
+            result["W_observed"] = self.sojourn_sum / self.sojourn_count
+
+        if self.class_counts:
+            # Classe 1 (maior prioridade) = menor rotulo na ordem natural
+            classes = sorted(self.class_counts, key=_class_order)
+            result["classes"] = classes
+            # Mesmo estimador de lmbda repartido pela fracao de cada classe: as taxas somam lmbda
+            result["arrival_rates"] = [lmbda * self.class_counts[label] / self.count for label in classes]
+        return result
+
+
+def _present(columns: List[str], names: List[str], optional: Set[str]) -> List[str]:
+    # Colunas opcionais ausentes no arquivo sao ignoradas; as demais sao exigidas
+    return [name for name in columns if name in names or name not in optional]
+
+
+def _csv_chunks(
+    path: str, columns: List[str], chunk_rows: int, delimiter: str, optional: Set[str]
+) -> Iterator[Dict[str, List[str]]]:
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        columns = _present(columns, header, optional)
+        missing = [name for name in columns if name not in header]
+        if missing:
+            raise ValueError(f"Colunas ausentes no log: {', '.join(missing)}")
+        positions = [header.index(name) for name in columns]
+        needed = max(positions) + 1
+
+        buffers: Dict[str, List[str]] = {name: [] for name in columns}
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < needed:
+                raise ValueError(
+                    f"Linha {reader.line_num} do log tem {len(row)} colunas; esperadas ao menos {needed}."
+                )
+            for name, position in zip(columns, positions):
+                buffers[name].append(row[position])
+            if len(buffers[columns[0]]) >= chunk_rows:
+                yield buffers
+                buffers = {name: [] for name in columns}
+        if buffers[columns[0]]:
+            yield buffers
+
+
+def _parquet_chunks(
+    path: str, columns: List[str], chunk_rows: int, memory_map: bool, optional: Set[str]
+) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+        import pyarrow.types as pa_types
+    except ImportError as exc:
+        raise ImportError("Leitura de Parquet requer o pacote pyarrow.") from exc
+
+    parquet = pq.ParquetFile(path, memory_map=memory_map)
+    columns = _present(columns, parquet.schema_arrow.names, optional)
+    missing = [name for name in columns if name not in parquet.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Colunas ausentes no log: {', '.join(missing)}")
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+        chunk: Dict[str, Any] = {}
+        for name in columns:
+            column = batch.column(name)
+            if pa_types.is_timestamp(column.type):
+                column = column.cast("int64").to_numpy() / _TIMESTAMP_UNITS[column.type.unit]
+            else:
+                column = column.to_numpy(zero_copy_only=False)
+            chunk[name] = column
+        yield chunk
+
+
+def estimate_parameters(
+    path: str,
+    arrival_col: str = "arrival",
+    completion_col: str | None = "completion",
+    start_col: str | None = None,
+    service_col: str | None = None,
+    class_col: str | None = None,
+    file_format: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    memory_map: bool = False,
+    delimiter: str = ",",
+) -> Dict[str, Any]:
+    """
+    Estima parametros de fila lendo um log CSV ou Parquet em blocos de
+    `chunk_rows` linhas (memoria constante; `memory_map` vale para Parquet).
+
+    Instantes podem ser numeros em segundos ou textos ISO 8601. Devolve
+    lmbda, mu, ES/ES2/ES3, Var(S), cs2, ca2 (se as chegadas estiverem em
+    ordem), W_observed e, com `class_col`, `classes` e `arrival_rates`, com
+    os mesmos nomes dos parametros de `calculator.calculate`:
+
+        fit = estimate_parameters("log.csv", class_col="prioridade")
+        calculate("M/G/1", lmbda=fit["lmbda"], ES=fit["ES"], ES2=fit["ES2"], ES3=fit["ES3"])
+        calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=fit["arrival_rates"], mu=fit["mu"])
+    """
+    if not isinstance(chunk_rows, int) or chunk_rows < 1:
+        raise ValueError("chunk_rows deve ser inteiro >= 1")
+
+    # Com a duracao do servico, a coluna de conclusao padrao so e lida se existir (W_observed)
+    optional = {completion_col} if service_col and completion_col == "completion" else set()
+    roles = {
+        "arrivals": arrival_col,
+        "completions": completion_col,
+        "starts": start_col,
+        "services": service_col,
+        "classes": class_col,
+    }
+    roles = {role: column for role, column in roles.items() if column}
+    columns = list(dict.fromkeys(roles.values()))
+
+    fmt = (file_format or ("parquet" if str(path).lower().endswith((".parquet", ".pq")) else "csv")).lower()
+    if fmt == "csv":
+        chunks: Iterator[Dict[str, Any]] = _csv_chunks(path, columns, chunk_rows, delimiter, optional)
+    elif fmt == "parquet":
+        chunks = _parquet_chunks(path, columns, chunk_rows, memory_map, optional)
+    else:
+        raise ValueError("file_format deve ser 'csv' ou 'parquet'.")
+
+    estimator = ParameterEstimator()
+    for chunk in chunks:
+        estimator.update(**{role: chunk[column] for role, column in roles.items() if column in chunk})
+    return estimator.result()
@@ -0,0 +1,98 @@
+from math import exp, sqrt
+from typing import Any, Dict
+
+from .erlang import ERLANG_METHODS, mms_constants
+
+GGS_APPROXIMATIONS = ("allen-cunneen", "kingman", "whitt")
+
+
+def whitt_factor(rho: float, s: int, ca2: float, cs2: float) -> float:
+    """
+    Correcao phi(rho, ca2, cs2, s) de Whitt (1993, "Approximations for the
+    GI/G/m queue") sobre Allen-Cunneen: Wq = phi * (ca2 + cs2)/2 * Wq(M/M/s).
+    Vale 1 quando ca2 = cs2 = 1; com s = 1 recai na correcao de
+    Kramer-Langenbach-Belz.
+    """
+    if ca2 + cs2 == 0:
+        return 1.0
+    gamma = min(0.24, (1 - rho) * (s - 1) * (sqrt(4 + 5 * s) - 2) / (16 * s * rho))
+    phi1 = 1 + gamma
+    phi3 = (1 - 4 * gamma) * exp(-2 * (1 - rho) / (3 * rho))
+    phi4 = min(1.0, ((phi1 + phi3) / 2) ** 2)
+    mean = (ca2 + cs2) / 2
+    psi = 1.0 if mean >= 1 else phi4 ** (2 * (1 - mean))
+    if ca2 >= cs2:
+        return (4 * (ca2 - cs2) * phi1 + cs2 * psi) / (4 * ca2 - 3 * cs2)
+    return ((cs2 - ca2) * phi3 + (cs2 + 3 * ca2) * psi) / (2 * (ca2 + cs2))
+
+
+def ggs(
+    lmbda: float,
+    mu: float,
+    s: int,
+    ca2: float = 1.0,
+    cs2: float = 1.0,
+    approximation: str = "allen-cunneen",
+    method: str = "auto",
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Aproximacoes do G/G/s a partir dos quadrados dos coeficientes de variacao
+    das chegadas (ca2) e do servico (cs2); ca2 = cs2 = 1 reproduz o M/M/s.
+
+    - "allen-cunneen": Wq = (ca2 + cs2)/2 * C(s, a) / (s*mu - lambda), com o
+      Erlang C do M/M/s (method escolhe a recursao ou a expansao assintotica).
+    - "kingman": formula de Kingman, Wq = (ca2 + cs2)/2 * rho/(1 - rho) / mu,
+      estendida a s servidores por Sakasegawa (rho^(sqrt(2(s+1)) - 1) / s no
+      lugar de rho); nao usa o Erlang C.
+    - "whitt": Allen-Cunneen vezes a correcao de Whitt (ver whitt_factor),
+      mais precisa para servico pouco variavel (cs2 < 1) ou muitos servidores.
+    Lq = lambda*Wq, W = Wq + 1/mu e L = lambda*W.
+    """
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    if not isinstance(s, int) or s <= 0:
+        raise ValueError("s deve ser inteiro >= 1")
+    if not ca2 >= 0 or not cs2 >= 0:
+        raise ValueError("ca2 e cs2 (coeficientes de variacao ao quadrado) devem ser >= 0")
+    if approximation not in GGS_APPROXIMATIONS:
+        raise ValueError(f"approximation deve ser uma de {', '.join(GGS_APPROXIMATIONS)}")
+    if method not in ERLANG_METHODS:
+        raise ValueError(f"method deve ser um de {', '.join(ERLANG_METHODS)}")
+
+    if lmbda == 0:
+        return {"rho": 0.0, "L": 0.0, "Lq": 0.0, "W": 0.0, "Wq": 0.0}  # mesma convencao do M/M/s
+
+    rho = lmbda / (s * mu)
+    if rho >= 1:
+        raise ValueError(f"Sistema instavel (rho = {rho:.6f} >= 1).")
+
+    variability = (ca2 + cs2) / 2
+    if approximation == "kingman":
+        Wq = variability * rho ** (sqrt(2 * (s + 1)) - 1) / (s * (1 - rho)) / mu
+    else:
+        _, C = mms_constants(lmbda / mu, s, method)
+        Wq = variability * C / (s * mu - lmbda)
+        if approximation == "whitt":
+            Wq *= whitt_factor(rho, s, ca2, cs2)
+
+    W = Wq + 1 / mu
+    return {"rho": rho, "L": lmbda * W, "Lq": lmbda * Wq, "W": W, "Wq": Wq}
+
+
+def gg1(
+    lmbda: float,
+    mu: float,
+    ca2: float = 1.0,
+    cs2: float = 1.0,
+    approximation: str = "kingman",
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    G/G/1 pela formula de Kingman (padrao) ou pelas demais aproximacoes de
+    `ggs` com s = 1; "allen-cunneen" coincide com Kingman quando s = 1.
+    """
+    kwargs.pop("s", None)
+    return ggs(lmbda, mu, 1, ca2=ca2, cs2=cs2, approximation=approximation, **kwargs)
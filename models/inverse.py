@@ -0,0 +1,436 @@
+from math import exp, isfinite, log
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+from .mg1 import _service_model, _tail, _tail_transforms, mg1
+from .priority_common import coerce_arrival_rates
+from .priority_extended import DEFAULT_SERVERS, priority_with_preemption, priority_without_preemption
+
+# Metrica em funcao da carga a: (valor, derivada em a ou None quando nao ha forma analitica)
+Metric = Callable[[float], Tuple[float, float | None]]
+
+# Metas aceitas por modelo (nomes canonicos de calculator.MODEL_MAP)
+INVERSE_TARGETS: Dict[str, Tuple[str, ...]] = {
+    "M/M/1": ("Wq", "W", "P(Wq>t)", "P(W>t)"),
+    "M/M/S": ("Wq", "W", "P(Wq>t)", "P(W>t)"),
+    "M/M/1/K": ("pK", "W", "Wq"),
+    "M/M/S/K": ("pK", "W", "Wq"),
+    "M/G/1": ("Wq", "W", "P(Wq>t)", "P(W>t)"),
+    "PRIORIDADE_PREEMPTIVA_3X3": ("W", "Wq"),
+    "PRIORIDADE_NAO_PREEMPTIVA_3X3": ("W", "Wq"),
+}
+
+_PRIORITY_MODELS = {
+    "PRIORIDADE_PREEMPTIVA_3X3": priority_with_preemption,
+    "PRIORIDADE_NAO_PREEMPTIVA_3X3": priority_without_preemption,
+}
+
+# Menor carga testada (fracao do limite de estabilidade) e maior carga em sistemas com perda
+_MIN_LOAD = 1e-9
+_MAX_LOAD = 1e12
+
+
+class _Scale:
+    """
+    Converte a carga a = lambda/mu nas taxas do problema: com solve_for="lmbda"
+    mu = rate fica fixo; com solve_for="mu" lambda = rate fica fixo. As metricas
+    crescem com a nos dois casos, entao a mesma busca serve para as duas perguntas.
+    """
+
+    def __init__(self, solve_for: str, rate: float) -> None:
+        self.solve_for = solve_for
+        self.rate = rate
+
+    def rates(self, a: float) -> Tuple[float, float]:
+        if self.solve_for == "lmbda":
+            return a * self.rate, self.rate
+        return self.rate, self.rate / a
+
+    def time(self, a: float, tau: float, dtau: float | None) -> Tuple[float, float | None]:
+        """tau/mu e sua derivada em a, para tau medido em unidades de 1/mu."""
+        if self.solve_for == "lmbda":
+            return tau / self.rate, None if dtau is None else dtau / self.rate
+        return tau * a / self.rate, None if dtau is None else (dtau * a + tau) / self.rate
+
+    def mu_t(self, a: float, t: float) -> Tuple[float, float]:
+        """theta = mu*t e d(theta)/da."""
+        theta = self.rates(a)[1] * t
+        return theta, 0.0 if self.solve_for == "lmbda" else -theta / a
+
+
+class _StateWeights:
+    """
+    Probabilidades P0..PK do M/M/s/K (K = s e o sistema de perda de Erlang) com
+    log(a^n/n!) e log(a^n/(s! s^(n-s))) montados a partir de coeficientes
+    calculados uma unica vez: cada avaliacao da busca e uma soma vetorizada O(K).
+    """
+
+    def __init__(self, s: int, K: int) -> None:
+        self.n = np.arange(K + 1, dtype=float)
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, s + 1)))))
+        tail = -log_factorial[s] - (self.n[s + 1 :] - s) * log(s)
+        self.coeffs = np.concatenate((-log_factorial, tail))
+
+    def probabilities(self, a: float) -> np.ndarray:
+        weights = self.n * log(a) + self.coeffs
+        probs = np.exp(weights - weights.max())
+        return probs / probs.sum()
+
+
+def _erlang_c(weights: _StateWeights, a: float, s: int) -> Tuple[float, float]:
+    """Erlang C e dC/da a partir de B = P_s do sistema de perda (dB/da = B (s/a - 1 + B))."""
+    b = float(weights.probabilities(a)[-1])
+    db = b * (s / a - 1.0 + b)
+    denom = s - a * (1.0 - b)
+    ddenom = -1.0 + b + a * db
+    return s * b / denom, s * (db * denom - b * ddenom) / denom**2
+
+
+def _mms_problem(scale: _Scale, target: str, s: int, t: float | None) -> Tuple[Metric, float]:
+    weights = _StateWeights(s, s)
+
+    def metric(a: float) -> Tuple[float, float | None]:
+        C, dC = _erlang_c(weights, a, s)
+        if target in ("Wq", "W"):
+            tau = C / (s - a) + (1.0 if target == "W" else 0.0)
+            return scale.time(a, tau, dC / (s - a) + C / (s - a) ** 2)
+        theta, dtheta = scale.mu_t(a, t)
+        if target == "P(Wq>t)":
+            decay = exp(-(s - a) * theta)
+            return C * decay, decay * (dC + C * (theta - (s - a) * dtheta))
+        # P(W>t): mesma expressao do mms, sem derivada fechada simples
+        denom = (s - 1) - a
+        inner = C * theta if abs(denom) < 1e-8 else C * (1.0 - exp(-theta * denom)) / denom
+        return exp(-theta) * (1.0 + inner), None
+
+    return metric, float(s)
+
+
+def _mmsk_problem(scale: _Scale, target: str, s: int, K: int) -> Tuple[Metric, float]:
+    if not isinstance(K, int) or K < s:
+        raise ValueError("K deve ser inteiro >= s")
+    weights = _StateWeights(s, K)
+    n = weights.n
+    queued = np.maximum(n - s, 0.0)
+
+    def metric(a: float) -> Tuple[float, float | None]:
+        # d log Pn / da = (n - L)/a, entao dE[X]/da = Cov(N, X)/a
+        probs = weights.probabilities(a)
+        L = float(n @ probs)
+        pK = float(probs[-1])
+        dpK = pK * (K - L) / a
+        if target == "pK":
+            return pK, dpK
+        count = n if target == "W" else queued
+        X = float(count @ probs)
+        dX = float(((n - L) * count) @ probs) / a
+        # W = L / (lambda (1 - pK)) = tau/mu com tau = L / (a (1 - pK))
+        g = X / (1.0 - pK)
+        dg = (dX * (1.0 - pK) + X * dpK) / (1.0 - pK) ** 2
+        return scale.time(a, g / a, dg / a - g / a**2)
+
+    return metric, float("inf")
+
+
+def _check_limit(target: str, limit: float, t: float | None) -> None:
+    if limit < 0:
+        raise ValueError("O limite da meta deve ser >= 0")
+    if target.startswith("P(") and (t is None or t < 0):
+        raise ValueError(f"Informe t >= 0 para a meta {target}.")
+
+
+def _find_load(metric: Metric, limit: float, upper: float, tol: float, max_iter: int) -> Tuple[float, int]:
+    """
+    Maior carga a com metric(a) <= limit (a metrica cresce com a). Usa Newton
+    protegido por bissecao quando a derivada analitica existe e Brent caso contrario.
+    """
+    evaluations = 0
+
+    def evaluate(a: float) -> Tuple[float, float | None]:
+        nonlocal evaluations
+        evaluations += 1
+        value, slope = metric(a)
+        return value - limit, slope
+
+    low = _MIN_LOAD * (upper if isfinite(upper) else 1.0)
+    f_low, slope = evaluate(low)
+    if f_low > 0:
+        raise ValueError("Nenhuma taxa atende a meta, nem com carga quase nula.")
+
+    if isfinite(upper):
+        high = upper * (1.0 - 1e-12)
+        f_high = evaluate(high)[0]
+        if f_high <= 0:
+            raise ValueError("A meta e atendida ate o limite de estabilidade (rho -> 1).")
+    else:
+        high = 1.0
+        f_high = evaluate(high)[0]
+        while f_high <= 0:
+            if high > _MAX_LOAD:
+                raise ValueError("A meta e atendida para qualquer carga (o bloqueio limita a fila).")
+            low, f_low = high, f_high
+            high *= 4.0
+            f_high = evaluate(high)[0]
+
+    if slope is None:
+        root = _brent(lambda a: evaluate(a)[0], low, high, f_low, f_high, tol, max_iter)
+    else:
+        root = _safe_newton(evaluate, low, high, tol, max_iter)
+    return root, evaluations
+
+
+def _safe_newton(
+    func: Callable[[float], Tuple[float, float | None]], low: float, high: float, tol: float, max_iter: int
+) -> float:
+    # func(low) < 0 < func(high); passos de Newton fora do intervalo viram bissecao
+    x = 0.5 * (low + high)
+    for _ in range(max_iter):
+        value, slope = func(x)
+        if value == 0:
+            return x
+        if value < 0:
+            low = x
+        else:
+            high = x
+        if slope:
+            step = x - value / slope
+            if abs(step - x) <= tol * abs(x):
+                return step
+            if low < step < high:
+                x = step
+                continue
+        x = 0.5 * (low + high)
+        if high - low <= tol * high:
+            return x
+    raise ValueError("A busca nao convergiu; aumente max_iter.")
+
+
+def _brent(
+    func: Callable[[float], float], a: float, b: float, fa: float, fb: float, tol: float, max_iter: int
+) -> float:
+    # Metodo de Brent (interpolacao inversa + secante + bissecao), como o brentq
+    x_pre, x_cur, f_pre, f_cur = a, b, fa, fb
+    x_blk = f_blk = s_pre = s_cur = 0.0
+    for _ in range(max_iter):
+        if f_pre != 0 and f_cur != 0 and (f_pre < 0) != (f_cur < 0):
+            x_blk, f_blk = x_pre, f_pre
+            s_pre = s_cur = x_cur - x_pre
+        if abs(f_blk) < abs(f_cur):
+            x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+            f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+        delta = 0.5 * tol * abs(x_cur)
+        s_bis = 0.5 * (x_blk - x_cur)
+        if f_cur == 0 or abs(s_bis) < delta:
+            return x_cur
+        if abs(s_pre) > delta and abs(f_cur) < abs(f_pre):
+            if x_pre == x_blk:
+                s_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
+            else:
+                d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                s_try = -f_cur * (f_blk * d_blk - f_pre * d_pre) / (d_blk * d_pre * (f_blk - f_pre))
+            if 2 * abs(s_try) < min(abs(s_pre), 3 * abs(s_bis) - delta):
+                s_pre, s_cur = s_cur, s_try
+            else:
+                s_pre = s_cur = s_bis
+        else:
+            s_pre = s_cur = s_bis
+        x_pre, f_pre = x_cur, f_cur
+        x_cur += s_cur if abs(s_cur) > delta else (delta if s_bis > 0 else -delta)
+        f_cur = func(x_cur)
+    raise ValueError("A busca nao convergiu; aumente max_iter.")
+
+
+def _solve(
+    model: str,
+    target: str,
+    limit: float,
+    solve_for: str,
+    rate: float | None,
+    params: Dict[str, Any],
+    tol: float,
+    max_iter: int,
+) -> Dict[str, Any]:
+    if model not in INVERSE_TARGETS:
+        raise ValueError(f"Modelo deve ser um de {', '.join(INVERSE_TARGETS)}.")
+    if target not in INVERSE_TARGETS[model]:
+        raise ValueError(f"Meta deve ser uma de {', '.join(INVERSE_TARGETS[model])}.")
+    t = params.get("t")
+    _check_limit(target, limit, t)
+
+    if model in _PRIORITY_MODELS:
+        return _solve_priority(model, target, limit, solve_for, rate, params, tol, max_iter)
+    if model == "M/G/1":
+        return _solve_mg1(target, limit, solve_for, rate, params, tol, max_iter)
+
+    name = "mu" if solve_for == "lmbda" else "lambda (lmbda)"
+    if rate is None or rate <= 0:
+        raise ValueError(f"{name} deve ser > 0")
+    s = 1 if model in ("M/M/1", "M/M/1/K") else params.get("s")
+    if not isinstance(s, int) or s < 1:
+        raise ValueError("s deve ser inteiro >= 1")
+
+    scale = _Scale(solve_for, rate)
+    if model in ("M/M/1", "M/M/S"):
+        metric, upper = _mms_problem(scale, target, s, t)
+    else:
+        metric, upper = _mmsk_problem(scale, target, s, params.get("K"))
+    a, evaluations = _find_load(metric, limit, upper, tol, max_iter)
+    lmbda, mu = scale.rates(a)
+    return {"lmbda": lmbda, "mu": mu, "rho": a / s, target: metric(a)[0], "evaluations": evaluations}
+
+
+def _solve_mg1(
+    target: str,
+    limit: float,
+    solve_for: str,
+    rate: float | None,
+    params: Dict[str, Any],
+    tol: float,
+    max_iter: int,
+) -> Dict[str, Any]:
+    t = params.get("t")
+    distribution = params.get("service_distribution", "poisson")
+    if solve_for == "mu":
+        # Com mu livre so a forma mu + service_distribution define o servico
+        if any(params.get(key) is not None for key in ("ES", "ES2", "ES3", "service_samples")):
+            raise ValueError("Para buscar mu informe service_distribution, nao momentos ou amostras.")
+        if rate is None or rate <= 0:
+            raise ValueError("lambda (lmbda) deve ser > 0")
+
+        def metric(a: float) -> Tuple[float, float | None]:
+            return mg1(rate, mu=rate / a, service_distribution=distribution, t=t)[target], None
+
+        a, evaluations = _find_load(metric, limit, 1.0, tol, max_iter)
+        return {"lmbda": rate, "mu": rate / a, "rho": a, target: metric(a)[0], "evaluations": evaluations}
+
+    # lambda livre: o servico (e a transformada, ja compactada para amostras) e montado uma vez
+    service = _service_model(
+        rate,
+        distribution,
+        params.get("ES"),
+        params.get("ES2"),
+        params.get("ES3"),
+        params.get("service_samples"),
+    )
+    ES, ES2 = service.ES, service.ES2
+    if target in ("Wq", "W"):
+        # Wq = lambda E[S^2] / (2 (1 - lambda E[S])) tem inversa fechada
+        wait = limit - (ES if target == "W" else 0.0)
+        if wait < 0:
+            raise ValueError("Nenhuma taxa atende a meta, nem com carga quase nula.")
+        lmbda = 2.0 * wait / (ES2 + 2.0 * wait * ES)
+        return {"lmbda": lmbda, "mu": 1.0 / ES, "rho": lmbda * ES, target: limit, "evaluations": 0}
+
+    times = np.array([float(t)])
+
+    def metric(a: float) -> Tuple[float, float | None]:
+        wq_tail, w_tail = _tail_transforms(a / ES, a, service)
+        if target == "P(Wq>t)":
+            return float(_tail(wq_tail, times, a)[0]), None
+        return float(_tail(w_tail, times, 1.0 - (1.0 - a) * service.p_zero)[0]), None
+
+    a, evaluations = _find_load(metric, limit, 1.0, tol, max_iter)
+    return {"lmbda": a / ES, "mu": 1.0 / ES, "rho": a, target: metric(a)[0], "evaluations": evaluations}
+
+
+def _solve_priority(
+    model: str,
+    target: str,
+    limit: float,
+    solve_for: str,
+    rate: float | None,
+    params: Dict[str, Any],
+    tol: float,
+    max_iter: int,
+) -> Dict[str, Any]:
+    solver = _PRIORITY_MODELS[model]
+    base = np.asarray(coerce_arrival_rates(params.get("arrival_rates")))
+    total = float(base.sum())
+    if total <= 0:
+        raise ValueError("arrival_rates precisa de ao menos uma taxa > 0.")
+    s = params.get("s", DEFAULT_SERVERS)
+    if not isinstance(s, int) or s < 1:
+        raise ValueError("Numero de servidores (s) deve ser um inteiro >= 1.")
+    priority_class = params.get("priority_class")
+    if priority_class is not None and not (
+        isinstance(priority_class, int) and 1 <= priority_class <= base.size
+    ):
+        raise ValueError(f"priority_class deve ser inteiro entre 1 e {base.size}.")
+    if solve_for == "mu":
+        rate = total
+    elif rate is None or rate <= 0:
+        raise ValueError("mu deve ser > 0")
+
+    # lambda livre: as taxas crescem na mesma proporcao (mix de classes fixo)
+    scale = _Scale(solve_for, rate)
+
+    def rates_at(a: float) -> Tuple[np.ndarray, float]:
+        lmbda, mu = scale.rates(a)
+        return base * (lmbda / total), mu
+
+    def metric(a: float) -> Tuple[float, float | None]:
+        rates, mu = rates_at(a)
+        result = solver(rates.tolist(), mu, s)
+        item = result if priority_class is None else result["per_class"][priority_class - 1]
+        return item[target], None
+
+    a, evaluations = _find_load(metric, limit, float(s), tol, max_iter)
+    rates, mu = rates_at(a)
+    result = {
+        "lmbda": float(rates.sum()),
+        "mu": mu,
+        "rho": a / s,
+        "arrival_rates": rates.tolist(),
+        target: metric(a)[0],
+        "evaluations": evaluations,
+    }
+    if priority_class is not None:
+        result["priority_class"] = priority_class
+    return result
+
+
+def max_arrival_rate(
+    model: str,
+    target: str,
+    limit: float,
+    mu: float | None = None,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Maior lambda tal que `target` <= `limit`, com mu e os demais parametros fixos
+    (ex.: quanto trafego 40 atendentes suportam com Wq <= 20 s).
+
+    - model: nome canonico (M/M/1, M/M/S, M/M/1/K, M/M/S/K, M/G/1 ou prioridade)
+    - target: Wq, W, P(Wq>t), P(W>t) (com t) ou pK, conforme INVERSE_TARGETS
+    - params: s, K, t, service_distribution/ES/ES2/service_samples (M/G/1) ou
+      arrival_rates (mix de classes, escalado junto) e priority_class para a
+      meta de uma unica classe nos modelos de prioridade
+
+    A busca roda na carga a = lambda/mu: M/M/s e M/M/s/K reaproveitam os
+    coeficientes dos estados entre iteracoes e usam Newton com derivadas
+    analiticas (Brent nas demais metas); W e Wq do M/G/1 tem inversa fechada.
+    Devolve lmbda, mu, rho, o valor da meta e o numero de avaliacoes.
+    """
+    return _solve(model, target, limit, "lmbda", mu, params, tol, max_iter)
+
+
+def min_service_rate(
+    model: str,
+    target: str,
+    limit: float,
+    lmbda: float | None = None,
+    tol: float = 1e-12,
+    max_iter: int = 200,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Menor mu tal que `target` <= `limit`, com lambda fixo (nos modelos de
+    prioridade lambda e a soma de arrival_rates). Mesmos modelos, metas e
+    parametros de `max_arrival_rate`; no M/G/1 o servico vem de mu +
+    service_distribution.
+    """
+    return _solve(model, target, limit, "mu", lmbda, params, tol, max_iter)
@@ -0,0 +1,39 @@
+from math import comb, log
+from typing import Callable
+
+import numpy as np
+
+# Termos do algoritmo de Euler (2M + 1 avaliacoes da transformada por instante).
+# Em precisao dupla M = 15 da cerca de 8 a 9 digitos corretos.
+_EULER_M = 15
+
+
+def _euler_coefficients(M: int) -> tuple[np.ndarray, np.ndarray]:
+    xi = np.ones(2 * M + 1)
+    xi[0] = 0.5
+    xi[2 * M] = 2.0**-M
+    for k in range(1, M):
+        xi[2 * M - k] = xi[2 * M - k + 1] + 2.0**-M * comb(M, k)
+    eta = xi * (-1.0) ** np.arange(2 * M + 1)
+    beta = M * log(10.0) / 3.0 + 1j * np.pi * np.arange(2 * M + 1)
+    return beta, eta
+
+
+_BETA, _ETA = _euler_coefficients(_EULER_M)
+
+
+def invert_laplace(
+    transform: Callable[[np.ndarray], np.ndarray], times: np.ndarray
+) -> np.ndarray:
+    """
+    Inverte numericamente F(s) = int_0^inf e^{-st} f(t) dt pelo algoritmo de
+    Euler (Abate-Whitt): f(t) ~ 10^{M/3}/t * sum_k eta_k Re F(beta_k / t).
+
+    `transform` recebe uma matriz complexa de pontos s e deve devolver F(s)
+    elemento a elemento; todos os instantes `times` (> 0) sao avaliados em
+    uma unica chamada.
+    """
+    times = np.asarray(times, dtype=float)
+    points = _BETA[None, :] / times[:, None]
+    values = np.real(transform(points))
+    return 10.0 ** (_EULER_M / 3.0) / times * (values @ _ETA)
@@ -1,48 +1,257 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Sequence
 
+import numpy as np
 
-def mg1(
-    lmbda: float,
-    mu: float,
-    service_distribution: str = "poisson",
-    **kwargs,
-) -> Dict[str, Any]:
-    """
-    Modelo M/G/1 (capacidade infinita, disciplina FCFS).
+from .laplace import invert_laplace
 
-    `service_distribution` define como os momentos do servico sao estimados:
-      - "poisson": Var(S) = E[S]
-      - "exponential": Var(S) = (E[S])^2
-      - "deterministic": Var(S) = 0
-    """
-    if lmbda < 0:
-        raise ValueError("lambda (lmbda) deve ser >= 0")
-    if mu <= 0:
-        raise ValueError("mu deve ser > 0")
+ArrayLike = Any
+
+# Limite de elementos da matriz (pontos s x amostras) avaliada por vez na
+# transformada empirica, para manter a memoria limitada com amostras grandes
+_EMPIRICAL_BLOCK = 1_000_000
+# Acima disso a amostra vira grupos de mesma contagem representados pela media
+# do grupo (os momentos continuam exatos, vindos da amostra completa)
+_MAX_SUPPORT = 4096
+_QUANTILE_ITERATIONS = 60
+
+
+class _ServiceModel:
+    """Momentos e transformada de Laplace-Stieltjes S*(s) do tempo de servico."""
+
+    def __init__(
+        self,
+        ES: float,
+        ES2: float,
+        ES3: float | None,
+        lst: Callable[[np.ndarray], np.ndarray],
+        p_zero: float = 0.0,
+    ) -> None:
+        self.ES = ES
+        self.ES2 = ES2
+        self.ES3 = ES3
+        self.lst = lst
+        self.p_zero = p_zero
+
+
+def _gamma_lst(ES: float, variance: float) -> Callable[[np.ndarray], np.ndarray]:
+    # Ajuste por dois momentos: Gamma(k, theta) com k = E[S]^2/Var(S), ou
+    # deterministico quando Var(S) = 0
+    if variance == 0:
+        return lambda s: np.exp(-s * ES)
+    theta = variance / ES
+    shape = ES / theta
+    return lambda s: (1.0 + theta * s) ** (-shape)
+
+
+def _empirical_model(samples: ArrayLike) -> _ServiceModel:
+    values = np.asarray(samples, dtype=float).ravel()
+    if values.size == 0 or not np.all(np.isfinite(values)) or np.any(values < 0):
+        raise ValueError("service_samples deve ter valores finitos e >= 0")
+    ES = float(values.mean())
+    if ES <= 0:
+        raise ValueError("service_samples deve ter media > 0")
 
+    support, counts = np.unique(values, return_counts=True)
+    weights = counts / values.size
+    p_zero = float(weights[0]) if support[0] == 0 else 0.0
+    if support.size > _MAX_SUPPORT:
+        ordered = np.sort(values)
+        starts = np.linspace(0, ordered.size, _MAX_SUPPORT, endpoint=False).astype(int)
+        sizes = np.diff(np.append(starts, ordered.size))
+        support = np.add.reduceat(ordered, starts) / sizes
+        weights = sizes / ordered.size
+
+    def lst(s: np.ndarray) -> np.ndarray:
+        flat = s.ravel()
+        out = np.empty(flat.size, dtype=complex)
+        step = max(1, _EMPIRICAL_BLOCK // support.size)
+        for start in range(0, flat.size, step):
+            block = flat[start : start + step]
+            out[start : start + step] = np.exp(-np.outer(block, support)) @ weights
+        return out.reshape(s.shape)
+
+    return _ServiceModel(
+        ES,
+        float(np.mean(values**2)),
+        float(np.mean(values**3)),
+        lst,
+        p_zero=p_zero,
+    )
+
+
+def _moments_model(ES: float, ES2: float | None, ES3: float | None) -> _ServiceModel:
+    if ES <= 0:
+        raise ValueError("E[S] (ES) deve ser > 0")
+    if ES2 is None:
+        raise ValueError("Informe E[S^2] (ES2) junto com E[S].")
+    if ES2 < ES**2:
+        raise ValueError("E[S^2] deve ser >= E[S]^2")
+    if ES3 is not None and ES3 * ES < ES2**2 * (1 - 1e-12):
+        raise ValueError("E[S^3] deve ser >= E[S^2]^2 / E[S]")
+    return _ServiceModel(ES, ES2, ES3, _gamma_lst(ES, ES2 - ES**2))
+
+
+def _named_model(mu: float, service_distribution: str) -> _ServiceModel:
+    if service_distribution is not None and not isinstance(service_distribution, str):
+        raise ValueError("service_distribution deve ser texto: 'poisson', 'exponential' ou 'deterministic'.")
     mean_service = 1.0 / mu
     dist = (service_distribution or "poisson").strip().lower()
 
     if dist == "poisson":
         variance = mean_service
+        ES3 = None
+        lst = _gamma_lst(mean_service, variance)
     elif dist == "exponential":
         variance = mean_service**2
+        ES3 = 6.0 * mean_service**3
+        lst = lambda s: mu / (mu + s)
     elif dist == "deterministic":
         variance = 0.0
+        ES3 = mean_service**3
+        lst = _gamma_lst(mean_service, 0.0)
     else:
         raise ValueError(
             "service_distribution deve ser 'poisson', 'exponential' ou 'deterministic'."
         )
+    return _ServiceModel(mean_service, variance + mean_service**2, ES3, lst)
+
+
+def _service_model(
+    mu: float | None,
+    service_distribution: str,
+    ES: float | None,
+    ES2: float | None,
+    ES3: float | None,
+    service_samples: ArrayLike | None,
+) -> _ServiceModel:
+    if service_samples is not None:
+        if ES is not None or ES2 is not None or ES3 is not None:
+            raise ValueError("Use service_samples ou os momentos ES/ES2/ES3, nao ambos.")
+        model = _empirical_model(service_samples)
+    elif ES is not None:
+        model = _moments_model(ES, ES2, ES3)
+    else:
+        if mu is None:
+            raise ValueError("Informe mu, os momentos ES/ES2 ou service_samples.")
+        if mu <= 0:
+            raise ValueError("mu deve ser > 0")
+        return _named_model(mu, service_distribution)
+
+    if mu is not None and abs(mu * model.ES - 1.0) > 1e-9:
+        raise ValueError("mu inconsistente com o E[S] informado (mu deve ser 1/E[S]).")
+    return model
+
+
+def _tail_transforms(
+    lmbda: float, rho: float, service: _ServiceModel
+) -> tuple[Callable[[np.ndarray], np.ndarray], Callable[[np.ndarray], np.ndarray]]:
+    """
+    Transformadas das caudas P(Wq>t) e P(W>t) a partir de Pollaczek-Khinchine:
+    Wq*(s) = (1 - rho) s / (s - lambda (1 - S*(s))) e W*(s) = Wq*(s) S*(s);
+    a cauda de X tem transformada (1 - X*(s)) / s.
+    """
+
+    def wq_lst(s: np.ndarray, service_lst: np.ndarray) -> np.ndarray:
+        return (1.0 - rho) * s / (s - lmbda * (1.0 - service_lst))
+
+    def wq_tail(s: np.ndarray) -> np.ndarray:
+        return (1.0 - wq_lst(s, service.lst(s))) / s
+
+    def w_tail(s: np.ndarray) -> np.ndarray:
+        service_lst = service.lst(s)
+        return (1.0 - wq_lst(s, service_lst) * service_lst) / s
 
-    ES2 = variance + mean_service**2
-    cs2 = variance / (mean_service**2) if mean_service > 0 else 0.0
+    return wq_tail, w_tail
+
+
+def _tail(transform: Callable[[np.ndarray], np.ndarray], times: np.ndarray, at_zero: float) -> np.ndarray:
+    out = np.full(times.shape, at_zero)
+    positive = times > 0
+    if positive.any():
+        out[positive] = np.clip(invert_laplace(transform, times[positive]), 0.0, 1.0)
+    return out
+
+
+def _quantiles(
+    transform: Callable[[np.ndarray], np.ndarray],
+    probs: np.ndarray,
+    at_zero: float,
+    scale: float,
+) -> np.ndarray:
+    """Menor t com P(X>t) <= 1 - p para cada p, por bissecao vetorizada."""
+    targets = 1.0 - probs
+    result = np.zeros(probs.shape)
+    pending = targets < at_zero
+    if not pending.any():
+        return result
+
+    goal = targets[pending]
+    hi = np.full(goal.shape, scale)
+    for _ in range(200):
+        above = _tail(transform, hi, at_zero) > goal
+        if not above.any():
+            break
+        hi[above] *= 2.0
+    lo = np.zeros(goal.shape)
+    for _ in range(_QUANTILE_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        above = _tail(transform, mid, at_zero) > goal
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    result[pending] = hi
+    return result
+
+
+def _as_output(values: np.ndarray, scalar: bool) -> Any:
+    return float(values[0]) if scalar else values
+
+
+def mg1(
+    lmbda: float,
+    mu: float | None = None,
+    service_distribution: str = "poisson",
+    ES: float | None = None,
+    ES2: float | None = None,
+    ES3: float | None = None,
+    service_samples: ArrayLike | None = None,
+    t: float | ArrayLike | None = None,
+    quantiles: float | Sequence[float] | None = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Modelo M/G/1 (capacidade infinita, disciplina FCFS).
+
+    O tempo de servico pode ser descrito de tres formas (em ordem de prioridade):
+      - service_samples: amostra medida; usa os momentos e a transformada empirica
+      - ES, ES2 (e opcionalmente ES3): momentos E[S], E[S^2], E[S^3]; as caudas
+        usam uma Gamma com os mesmos dois primeiros momentos
+      - mu + service_distribution:
+          - "poisson": Var(S) = E[S] (caudas por ajuste Gamma)
+          - "exponential": Var(S) = (E[S])^2
+          - "deterministic": Var(S) = 0
+
+    Parametros opcionais:
+      - t: instante ou vetor de instantes; calcula P(W>t) e P(Wq>t) invertendo
+        numericamente a transformada de Pollaczek-Khinchine (todos de uma vez)
+      - quantiles: probabilidade(s) p; calcula os quantis de Wq e W
+
+    Com E[S^3] conhecido tambem devolve Var(Wq) e Var(W) (formula de Takacs).
+    """
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+
+    service = _service_model(mu, service_distribution, ES, ES2, ES3, service_samples)
+    mean_service = service.ES
+    ES2 = service.ES2
+    variance = max(ES2 - mean_service**2, 0.0)
+    cs2 = variance / (mean_service**2)
 
     rho = lmbda * mean_service
     if rho >= 1:
         raise ValueError(f"Sistema instavel (rho = {rho:.6f} >= 1).")
 
     if lmbda == 0:
-        return {
+        result: Dict[str, Any] = {
             "rho": 0.0,
             "p0": 1.0,
             "L": 0.0,
@@ -54,28 +263,62 @@ def mg1(
             "Var(S)": variance,
             "cs2": cs2,
         }
+    else:
+        Wq = (lmbda * ES2) / (2.0 * (1.0 - rho))
+        W = Wq + mean_service
+        Lq = lmbda * Wq
+        L = Lq + rho
+        p0 = 1.0 - rho
+
+        result = {
+            "rho": rho,
+            "p0": p0,
+            "L": L,
+            "Lq": Lq,
+            "W": W,
+            "Wq": Wq,
+            "E[S]": mean_service,
+            "E[S^2]": ES2,
+            "Var(S)": variance,
+            "cs2": cs2,
+        }
+
+    if service.ES3 is not None:
+        Wq_mean = result["Wq"]
+        Wq2 = 2.0 * Wq_mean**2 + lmbda * service.ES3 / (3.0 * (1.0 - rho))
+        result["E[S^3]"] = service.ES3
+        result["Var(Wq)"] = Wq2 - Wq_mean**2
+        result["Var(W)"] = result["Var(Wq)"] + variance
+
+    if t is None and quantiles is None:
+        return result
+
+    wq_tail, w_tail = _tail_transforms(lmbda, rho, service)
+    # P(Wq>0) = rho; W so e zero se nao houver espera nem servico
+    wq_at_zero = rho
+    w_at_zero = 1.0 - (1.0 - rho) * service.p_zero
+
+    if t is not None:
+        times = np.atleast_1d(np.asarray(t, dtype=float))
+        if times.ndim != 1 or np.any(times < 0) or not np.all(np.isfinite(times)):
+            raise ValueError("t deve ser >= 0")
+        scalar = np.ndim(t) == 0
+        result["P(W>t)"] = _as_output(_tail(w_tail, times, w_at_zero), scalar)
+        result["P(Wq>t)"] = _as_output(_tail(wq_tail, times, wq_at_zero), scalar)
+
+    if quantiles is not None:
+        probs = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        if probs.ndim != 1 or np.any(probs <= 0) or np.any(probs >= 1):
+            raise ValueError("quantiles deve conter probabilidades em (0, 1)")
+        scalar = np.ndim(quantiles) == 0
+        scale = max(result["W"], mean_service)
+        result["Wq_quantiles"] = _as_output(_quantiles(wq_tail, probs, wq_at_zero, scale), scalar)
+        result["W_quantiles"] = _as_output(_quantiles(w_tail, probs, w_at_zero, scale), scalar)
 
-    Wq = (lmbda * ES2) / (2.0 * (1.0 - rho))
-    W = Wq + mean_service
-    Lq = lmbda * Wq
-    L = Lq + rho
-    p0 = 1.0 - rho
-
-    return {
-        "rho": rho,
-        "p0": p0,
-        "L": L,
-        "Lq": Lq,
-        "W": W,
-        "Wq": Wq,
-        "E[S]": mean_service,
-        "E[S^2]": ES2,
-        "Var(S)": variance,
-        "cs2": cs2,
-    }
+    return result
 
 # para M/G/1, E[S] = 1/mu, E[S^2] = 1/mu^2 (serviço determinístico)
 # Lq = (lambda^2 * E[S^2]) / (2 * (1 - rho)) = (lambda^2 / mu^2) / (2 * (1 - rho))
 # Wq = Lq / lambda = (lambda * E[S^2]) / (2 * (1 - rho)) = (lambda / mu^2) / (2 * (1 - rho))
 # W = Wq + E[S] = Wq + 1/mu
-# L = lambda * W = lambda * (Wq + 1/mu) = Lq + rho
\ No newline at end of file
+# L = lambda * W = lambda * (Wq + 1/mu) = Lq + rho
@@ -1,5 +1,5 @@
 from math import exp
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
 from .pn_utils import build_pn_distribution
 
@@ -9,6 +9,7 @@ def mm1(
     mu: float,
     n: int | None = None,
     t: float | None = None,
+    quantiles: float | Sequence[float] | None = None,
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -17,6 +18,7 @@ def mm1(
     Parametros opcionais:
       - n: calcula Pn
       - t: calcula P(W>t) e P(Wq>t)
+      - quantiles: probabilidade(s) p; calcula os quantis de Wq e W
     """
     if lmbda < 0:
         raise ValueError("lambda (lmbda) deve ser >= 0")
@@ -50,7 +52,7 @@ def mm1(
 
     if n is not None:
         result["pn"] = pn(n)
-        result["pn_distribution"] = build_pn_distribution(n, pn)
+        result["pn_distribution"] = build_pn_distribution(n, pn, geometric_tail=(0, rho))
 
     if t is not None:
         if t < 0:
@@ -62,4 +64,10 @@ def mm1(
         result["P(W>t)"] = PW_gt_t
         result["P(Wq>t)"] = PWq_gt_t
 
+    if quantiles is not None:
+        # NumPy so entra quando os quantis sao pedidos
+        from .waiting_time import mms_wait_quantiles
+
+        result.update(mms_wait_quantiles(lmbda, mu, 1, quantiles))
+
     return result
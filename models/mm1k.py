@@ -1,6 +1,7 @@
 from typing import Any, Dict
 
-from .pn_utils import build_pn_distribution
+from .birth_death import solve_birth_death
+from .pn_utils import PnDistribution, build_pn_distribution
 
 
 def mm1k(
@@ -15,7 +16,8 @@ def mm1k(
     Modelo M/M/1/K com capacidade finita K (inclui o cliente em servico).
 
     - Pn = rho^n * P0 para 0 <= n <= K (rho = lambda/mu); fora do intervalo Pn = 0.
-    - P0 = 1 / sum_{n=0..K} rho^n (ou 1/(K+1) se rho=1).
+    - P0 = 1 / sum_{n=0..K} rho^n (ou 1/(K+1) se rho=1), obtido pelo nucleo
+      nascimento-morte em uma passada O(K) sem overflow de rho^(K+1).
     - lambda_eff = lambda * (1 - P_K); L = sum n*Pn; Lq = L - (1 - P0);
       W = L/lambda_eff, Wq = Lq/lambda_eff.
     Parametros opcionais:
@@ -53,34 +55,21 @@ def mm1k(
 
     rho = lmbda / mu
 
-    if abs(rho - 1.0) < 1e-8:
-        p0 = 1.0 / (K + 1)
+    chain = solve_birth_death(K, lambda _state: rho, servers=1)
+    probs = chain.probs
+    p0 = chain.p0
 
-        def pn_func(n_val: int) -> float:
-            if n_val < 0 or int(n_val) != n_val:
-                raise ValueError(f"n deve ser inteiro entre 0 e {K}")
-            if n_val > K:
-                return 0.0
-            return p0
-
-        L = K / 2.0
-    else:
-        p0 = (1 - rho) / (1 - rho ** (K + 1))
-
-        def pn_func(n_val: int) -> float:
-            if n_val < 0 or int(n_val) != n_val:
-                raise ValueError(f"n deve ser inteiro entre 0 e {K}")
-            if n_val > K:
-                return 0.0
-            return p0 * (rho**n_val)
-
-        L = (rho * (1 - (K + 1) * rho**K + K * rho ** (K + 1))) / (
-            (1 - rho) * (1 - rho ** (K + 1))
-        )
+    def pn_func(n_val: int) -> float:
+        if n_val < 0 or int(n_val) != n_val:
+            raise ValueError(f"n deve ser inteiro entre 0 e {K}")
+        if n_val > K:
+            return 0.0
+        return probs[n_val]
 
-    pK = pn_func(K)
+    L = chain.L
+    pK = chain.pK
     lambda_eff = lmbda * (1 - pK)
-    Lq = L - (1 - p0)
+    Lq = max(L - chain.busy_servers, 0.0)
 
     if lambda_eff > 0:
         W = L / lambda_eff
@@ -101,6 +90,6 @@ def mm1k(
 
     if n is not None:
         result["pn"] = pn_func(n)
-        result["pn_distribution"] = build_pn_distribution(n, pn_func, max_state=K)
+        result["pn_distribution"] = PnDistribution.from_values(n, probs)
 
     return result
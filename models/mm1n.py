@@ -1,6 +1,7 @@
 from typing import Any, Dict
 
-from .pn_utils import build_pn_distribution
+from .birth_death import solve_birth_death
+from .pn_utils import PnDistribution, build_pn_distribution
 
 
 def mm1n(
@@ -49,20 +50,11 @@ def mm1n(
     # Razão r = lambda/mu
     r = lmbda / mu
 
-    # A_n = N!/(N-n)! * r^n, construído recursivamente
-    # A_0 = 1
-    A: list[float] = [1.0]
-    for k in range(1, N + 1):
-        # A_k = A_{k-1} * (N-(k-1)) * r
-        A_k = A[k - 1] * (N - (k - 1)) * r
-        A.append(A_k)
-
-    # P0 = 1 / sum(A_n)
-    denom = sum(A)
-    p0 = 1.0 / denom
-
-    # Pn = A_n * P0
-    pn_values = [a * p0 for a in A]
+    # A_n = A_{n-1} * (N-(n-1)) * r, construído recursivamente (com reescala) pelo
+    # núcleo nascimento-morte; Pn = A_n * P0
+    chain = solve_birth_death(N, lambda k: (N - (k - 1)) * r, servers=1)
+    pn_values = chain.probs
+    p0 = chain.p0
 
     def pn_func(n_val: int) -> float:
         if n_val < 0 or int(n_val) != n_val or n_val > N:
@@ -70,7 +62,7 @@ def mm1n(
         return pn_values[n_val]
 
     # Número médio no sistema
-    L = sum(k * pn_values[k] for k in range(N + 1))
+    L = chain.L
 
     # Número médio em serviço (só 0 ou 1 servidor): E[em serviço] = 1 - P0
     L_service = 1.0 - p0
@@ -108,7 +100,7 @@ def mm1n(
 
     if n is not None:
         result["pn"] = pn_func(n)
-        result["pn_distribution"] = build_pn_distribution(n, pn_func, max_state=N)
+        result["pn_distribution"] = PnDistribution.from_values(n, pn_values)
 
     # t (P(W>t), P(Wq>t)) não é trivial no modelo de fonte finita,
     # então deixei sem usar aqui. Se você quiser, dá pra implementar
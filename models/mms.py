@@ -1,6 +1,7 @@
-from math import exp, factorial
-from typing import Any, Dict
+from math import exp
+from typing import Any, Dict, Sequence
 
+from .erlang import ERLANG_METHODS, log_state_weight, mms_constants
 from .pn_utils import build_pn_distribution
 
 
@@ -10,6 +11,8 @@ def mms(
     s: int,
     n: int | None = None,
     t: float | None = None,
+    quantiles: float | Sequence[float] | None = None,
+    method: str = "auto",
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -18,6 +21,9 @@ def mms(
     Parametros opcionais:
       - n: calcula Pn
       - t: calcula P(W>t) e P(Wq>t) usando Erlang C
+      - quantiles: probabilidade(s) p; calcula os quantis de Wq e W
+      - method: "auto" (padrao), "exact" ou "asymptotic"; como P0 e Erlang C sao obtidos
+        (recursao O(s) ou expansao O(1) do regime Halfin-Whitt, ver erlang.mms_constants)
     """
     if lmbda < 0:
         raise ValueError("lambda (lmbda) deve ser >= 0")
@@ -25,6 +31,8 @@ def mms(
         raise ValueError("mu deve ser > 0")
     if not isinstance(s, int) or s <= 0:
         raise ValueError("s deve ser inteiro >= 1")
+    if method not in ERLANG_METHODS:
+        raise ValueError(f"method deve ser um de {', '.join(ERLANG_METHODS)}")
 
     if lmbda == 0:
         result: Dict[str, Any] = {
@@ -42,10 +50,14 @@ def mms(
                 return 1.0 if n_val == 0 else 0.0
 
             result["pn"] = zero_pn(n)
-            result["pn_distribution"] = build_pn_distribution(n, zero_pn)
+            result["pn_distribution"] = build_pn_distribution(n, zero_pn, geometric_tail=(1, 0.0))
         if t is not None:
             result["P(W>t)"] = 0.0
             result["P(Wq>t)"] = 0.0
+        if quantiles is not None:
+            from .waiting_time import mms_wait_quantiles
+
+            result.update(mms_wait_quantiles(0.0, mu, s, quantiles))
         return result
 
     rho = lmbda / (s * mu)
@@ -53,18 +65,16 @@ def mms(
         raise ValueError(f"Sistema instavel (rho = {rho:.6f} >= 1).")
 
     a = lmbda / mu
-    sum1 = sum(a**k / factorial(k) for k in range(s))
-    sum2 = (a**s) / (factorial(s) * (1 - rho))
-    p0 = 1.0 / (sum1 + sum2)
+    log_p0, C = mms_constants(a, s, method)
+    p0 = exp(log_p0)
 
     def pn_func(n_val: int) -> float:
         if n_val < 0 or int(n_val) != n_val:
             raise ValueError("n deve ser inteiro >= 0")
-        if n_val <= s:
-            return (a**n_val / factorial(n_val)) * p0
-        return (a**n_val / (factorial(s) * (s ** (n_val - s)))) * p0
+        return exp(log_p0 + log_state_weight(a, s, int(n_val)))
 
-    Lq = p0 * (a**s) * rho / (factorial(s) * (1 - rho) ** 2)
+    # Lq = C * rho / (1 - rho), com C = probabilidade de espera (Erlang C)
+    Lq = C * rho / (1 - rho)
     L = Lq + a
     Wq = Lq / lmbda
     W = L / lmbda
@@ -80,13 +90,12 @@ def mms(
 
     if n is not None:
         result["pn"] = pn_func(n)
-        result["pn_distribution"] = build_pn_distribution(n, pn_func)
+        result["pn_distribution"] = build_pn_distribution(n, pn_func, geometric_tail=(s, rho))
 
     if t is not None:
         if t < 0:
             raise ValueError("t deve ser >= 0")
 
-        C = (a**s / (factorial(s) * (1 - rho))) * p0
         PWq_gt_t = C * exp(-(1 - rho) * s * mu * t)
 
         denom = (s - 1) - a
@@ -100,4 +109,10 @@ def mms(
         result["P(Wq>t)"] = PWq_gt_t
         result["P(W>t)"] = PW_gt_t
 
+    if quantiles is not None:
+        # NumPy so entra quando os quantis sao pedidos
+        from .waiting_time import mms_wait_quantiles
+
+        result.update(mms_wait_quantiles(lmbda, mu, s, quantiles, method))
+
     return result
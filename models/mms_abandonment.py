@@ -0,0 +1,169 @@
+from typing import Any, Dict, NamedTuple, Sequence
+
+import numpy as np
+
+from .erlang import NEGLIGIBLE_LOG_WEIGHT
+from .pn_utils import PnDistribution
+
+ArrayLike = Any
+
+# A cauda da fila e gerada em blocos ate o peso cair NEGLIGIBLE_LOG_WEIGHT abaixo do maximo
+_FIRST_BLOCK = 1024
+# Limite de elementos da matriz t x estados avaliada por vez em P(Wq>t)
+_TAIL_BLOCK = 1_000_000
+
+
+class ErlangAChain(NamedTuple):
+    """P0..P(s+J) do M/M/s+M (cauda alem de s+J desprezivel) e agregados."""
+
+    probs: np.ndarray
+    s: int
+    Lq: float
+    busy_servers: float
+
+
+def _validate(lmbda: float, mu: float, s: int, theta: float) -> None:
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    if not isinstance(s, (int, np.integer)) or s <= 0:
+        raise ValueError("s deve ser inteiro >= 1")
+    if not theta > 0:
+        raise ValueError("theta (taxa de abandono) deve ser > 0; sem abandono use M/M/S")
+
+
+def erlang_a_chain(lmbda: float, mu: float, s: int, theta: float) -> ErlangAChain:
+    """
+    Cadeia nascimento-morte do M/M/s+M em escala log: pesos a^n/n! ate s e,
+    na fila, razoes lambda / (s*mu + j*theta), que sempre acabam < 1. A fila
+    e estendida em blocos (O(s + J) no total) ate o peso ficar desprezivel.
+    """
+    log_a = np.log(lmbda / mu)
+    states = np.arange(s + 1)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, s + 1)))))
+    log_weights = [states * log_a - log_factorial]
+
+    # j* = pico da fila; depois dele as razoes caem abaixo de 1
+    peak = max(0.0, (lmbda - s * mu) / theta)
+    log_last, top, start, block = float(log_weights[0][-1]), float(log_weights[0].max()), 1, _FIRST_BLOCK
+    while True:
+        j = np.arange(start, start + block)
+        chunk = log_last + np.cumsum(np.log(lmbda / (s * mu + j * theta)))
+        log_weights.append(chunk)
+        log_last, top = float(chunk[-1]), max(top, float(chunk.max()))
+        start += block
+        if start > peak and log_last < top - NEGLIGIBLE_LOG_WEIGHT:
+            break
+        block *= 2
+
+    log_weights = np.concatenate(log_weights)
+    probs = np.exp(log_weights - top)
+    probs /= probs.sum()
+    queue = np.arange(probs.size - s - 1) + 1
+    Lq = float(queue @ probs[s + 1 :])
+    busy = float(states @ probs[: s + 1]) + s * float(probs[s + 1 :].sum())
+    return ErlangAChain(probs, s, Lq, busy)
+
+
+def erlang_a_wait_tail(chain: ErlangAChain, theta: float, mu: float, t: ArrayLike) -> np.ndarray:
+    """
+    P(Wq>t) de uma chegada (espera ate ser atendida ou desistir). Quem encontra
+    s + j clientes tem espera oferecida V = soma de Exp(s*mu + i*theta),
+    i = 0..j; pela representacao de Renyi, P(V>t) = P(NB(y, q) <= j), com
+    y = s*mu/theta e q = e^{-theta t}. Como Wq = min(V, paciencia):
+      P(Wq>t) = e^{-theta t} sum_k nb_k(y, q) T_k, T_k = sum_{j>=k} P_{s+j}.
+    """
+    times = np.atleast_1d(np.asarray(t, dtype=float))
+    if times.ndim != 1 or np.any(times < 0) or not np.all(np.isfinite(times)):
+        raise ValueError("t deve ser >= 0")
+
+    s = chain.s
+    waiting = chain.probs[s:]
+    T = np.cumsum(waiting[::-1])[::-1]
+    k = np.arange(T.size)
+    y = s * mu / theta
+    # log Gamma(y+k) / (Gamma(y) k!), acumulado sem lgamma
+    log_binom = np.concatenate(([0.0], np.cumsum(np.log((y + k[:-1]) / (k[:-1] + 1.0)))))
+
+    result = np.empty(times.shape)
+    rows = max(1, _TAIL_BLOCK // T.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, times.size, rows):
+            block = times[start : start + rows, None]
+            log_q = -theta * block
+            log_p = np.log(-np.expm1(log_q))
+            log_nb = log_binom + y * log_q + np.where(k == 0, 0.0, k * log_p)
+            result[start : start + rows] = np.exp(log_q[:, 0]) * (np.exp(log_nb) @ T)
+    return np.clip(result, 0.0, 1.0)
+
+
+def mms_abandonment(
+    lmbda: float,
+    mu: float,
+    s: int,
+    theta: float,
+    n: int | None = None,
+    t: float | Sequence[float] | None = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Modelo M/M/s+M (Erlang-A): clientes desistem da fila apos uma paciencia
+    exponencial de taxa theta. Estavel para qualquer lambda (mesmo rho >= 1).
+
+    - Pn = (a^n / n!) P0 para n <= s; P(s+j) = P(s) prod_{i=1..j} lambda/(s*mu + i*theta).
+    - P(wait) = sum_{n>=s} Pn; Lq = sum j P(s+j); taxa de abandono = theta*Lq;
+      P(abandon) = theta*Lq/lambda; lambda_eff (atendidos) = lambda*(1 - P(abandon)) = mu*ocupacao.
+    - Wq = Lq/lambda e W = L/lambda sao medias sobre todas as chegadas (inclui quem desiste).
+    Parametros opcionais:
+      - n: calcula Pn
+      - t: calcula P(Wq>t) (espera ate atendimento ou desistencia), escalar ou vetor
+    """
+    _validate(lmbda, mu, s, theta)
+
+    if lmbda == 0:
+        result: Dict[str, Any] = {
+            "rho": 0.0,
+            "p0": 1.0,
+            "L": 0.0,
+            "Lq": 0.0,
+            "W": 0.0,
+            "Wq": 0.0,
+            "P(wait)": 0.0,
+            "P(abandon)": 0.0,
+            "lambda_eff": 0.0,
+        }
+        if n is not None:
+            result["pn"] = PnDistribution.from_values(n, [1.0]).pn(n)
+            result["pn_distribution"] = PnDistribution.from_values(n, [1.0])
+        if t is not None:
+            result["P(Wq>t)"] = 0.0 if np.ndim(t) == 0 else np.zeros(np.shape(t))
+        return result
+
+    chain = erlang_a_chain(lmbda, mu, s, theta)
+    probs = chain.probs
+    L = chain.Lq + chain.busy_servers
+    abandon = theta * chain.Lq / lmbda
+
+    result = {
+        "rho": lmbda / (s * mu),
+        "p0": float(probs[0]),
+        "L": L,
+        "Lq": chain.Lq,
+        "W": L / lmbda,
+        "Wq": chain.Lq / lmbda,
+        "P(wait)": float(probs[s:].sum()),
+        "P(abandon)": abandon,
+        "lambda_eff": lmbda * (1.0 - abandon),
+    }
+
+    if n is not None:
+        distribution = PnDistribution.from_values(n, probs)
+        result["pn"] = distribution.pn(n)
+        result["pn_distribution"] = distribution
+
+    if t is not None:
+        tail = erlang_a_wait_tail(chain, theta, mu, t)
+        result["P(Wq>t)"] = float(tail[0]) if np.ndim(t) == 0 else tail
+
+    return result
@@ -1,7 +1,6 @@
 from typing import Any, Dict, Iterable, List
 
-from math import factorial
-
+from .erlang import erlang_terms
 from .mms_priority_preemptive import mms_priority_preemptive
 from .priority_common import aggregate_totals, prefix_sums, validate_common_inputs
 from .mm1_priority_non_preemptive import mm1_priority_non_preemptive
@@ -28,11 +27,16 @@ def mms_priority_non_preemptive(
 
     # Formula do gabarito para s > 1 (sem interrupcao).
     r = total_lambda / mu
-    sum_terms = sum((r**j) / factorial(j) for j in range(s))
     if r == 0:
         base_factor = s * mu
     else:
-        base_factor = (factorial(s) * (s * mu - total_lambda) / (r**s)) * sum_terms + (s * mu)
+        # s! / r^s * sum_{j<s} r^j/j! calculado como razao das somas reescaladas
+        terms = erlang_terms(r, s)
+        if terms.last_term == 0:
+            base_factor = float("inf")
+        else:
+            ratio = terms.partial_sum / terms.last_term
+            base_factor = (s * mu - total_lambda) * ratio + (s * mu)
 
     class_metrics: List[Dict[str, float]] = []
     for idx, lam in enumerate(rates):
@@ -1,7 +1,8 @@
+from math import exp
 from typing import Any, Dict, Iterable, List
 
-from .mms import mms
-from .priority_common import erlang_c, prefix_sums, validate_common_inputs
+from .erlang import mms_constants
+from .priority_common import erlang_c_cumulative, prefix_sums, validate_common_inputs
 from .mm1_priority_preemptive import mm1_priority_preemptive
 
 
@@ -14,6 +15,9 @@ def mms_priority_preemptive(
     Modelo M/M/s com prioridades preemptivas.
     Para s=1 usa as formulas dedicadas; para s>=2 usa a media ponderada do M/M/s agregado
     para obter Wk (bate com o gabarito de S=2).
+
+    As probabilidades de espera de todas as subfilas acumuladas saem de uma unica
+    recursao de Erlang B, entao o custo e O(s + classes) operacoes vetorizadas.
     """
     if s == 1:
         return mm1_priority_preemptive(arrival_rates, mu)
@@ -47,38 +51,32 @@ def mms_priority_preemptive(
             "service_in_progress": 0.0,
         }
 
-    totals_mms = mms(total_lambda, mu, s)
-    total_W = totals_mms["W"]
-    total_Wq = totals_mms["Wq"]
-    total_L = totals_mms["L"]
-    total_Lq = totals_mms["Lq"]
-    p0 = totals_mms["p0"]
+    # Erlang C de todas as subfilas 1..k de uma vez; a ultima e o sistema agregado
+    waiting = erlang_c_cumulative(prefix, mu, s)
+    capacity = s * mu
 
     class_metrics: List[Dict[str, float]] = []
-    W_list: List[float] = []
+    # sum_{j<k} lambda_j * W_j acumulada, para obter cada Wk em O(1)
+    weighted_W = 0.0
 
     for idx, lam in enumerate(rates):
         cum_lambda = prefix[idx]
-        erlang_c_value = erlang_c(cum_lambda, mu, s)
+        erlang_c_value = waiting[idx]
 
-        # Wbar para subfila 1..k via M/M/s agregado
-        mms_cum = mms(cum_lambda, mu, s)
-        Wbar_cum = mms_cum["W"]
+        # Wbar para subfila 1..k via M/M/s agregado (0 sem chegadas, como em `mms`)
+        Wbar_cum = erlang_c_value / (capacity - cum_lambda) + 1.0 / mu if cum_lambda > 0 else 0.0
 
         if idx == 0:
             Wk = Wbar_cum
         else:
-            numer = cum_lambda * Wbar_cum
-            for j in range(idx):
-                numer -= rates[j] * W_list[j]
-            Wk = numer / lam
+            Wk = (cum_lambda * Wbar_cum - weighted_W) / lam
 
         Wqk = max(Wk - 1.0 / mu, 0.0)
         L_cum = cum_lambda * Wk
         Lq_cum = max(L_cum - (cum_lambda / mu), 0.0)
         L_class = lam * Wk
         Lq_class = lam * Wqk
-        W_list.append(Wk)
+        weighted_W += lam * Wk
 
         class_metrics.append(
             {
@@ -96,6 +94,12 @@ def mms_priority_preemptive(
             }
         )
 
+    total_Wq = waiting[-1] / (capacity - total_lambda)
+    total_W = total_Wq + 1.0 / mu
+    total_Lq = total_lambda * total_Wq
+    total_L = total_lambda * total_W
+    p0 = exp(mms_constants(total_lambda / mu, s)[0])
+
     return {
         "rho": total_lambda / (s * mu),
         "p0": p0,
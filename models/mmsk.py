@@ -1,7 +1,7 @@
-from math import factorial
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
-from .pn_utils import build_pn_distribution
+from .birth_death import solve_birth_death
+from .pn_utils import PnDistribution, build_pn_distribution
 
 
 def mmsk(
@@ -10,7 +10,8 @@ def mmsk(
     s: int,
     K: int,
     n: int | None = None,
-    t: float | None = None,
+    t: float | Sequence[float] | None = None,
+    quantiles: float | Sequence[float] | None = None,
     **kwargs,
 ) -> Dict[str, Any]:
     """
@@ -20,9 +21,11 @@ def mmsk(
     - P0 = 1 / [ sum_{n=0}^{s-1} a^n/n! + sum_{n=s}^{K} a^n/(s! s^{n-s}) ].
     - lambda_eff = lambda * (1 - P_K); L = sum n*Pn; ocupacao = sum min(n,s)*Pn; Lq = L - ocupacao;
       W = L/lambda_eff; Wq = Lq/lambda_eff.
+    - P0..PK, L e ocupacao saem de uma unica passada O(K) do nucleo nascimento-morte.
     Parametros opcionais:
       - n: calcula Pn
-      - t: aceito, mas nao utilizado
+      - t: calcula P(W>t) e P(Wq>t) de um cliente aceito (escalar ou vetor)
+      - quantiles: probabilidade(s) p; calcula os quantis de Wq e W de um cliente aceito
     """
     if lmbda < 0:
         raise ValueError("lambda (lmbda) deve ser >= 0")
@@ -55,35 +58,38 @@ def mmsk(
         if n is not None:
             result["pn"] = pn_func_zero(n)
             result["pn_distribution"] = build_pn_distribution(n, pn_func_zero, max_state=K)
+        if t is not None:
+            # Mesmo formato de t que o ramo com chegadas (mmsk_wait_tails)
+            import numpy as np
+
+            shape = np.shape(t)
+            result["P(W>t)"] = np.zeros(shape) if shape else 0.0
+            result["P(Wq>t)"] = np.zeros(shape) if shape else 0.0
+        if quantiles is not None:
+            from .waiting_time import mms_wait_quantiles
+
+            result.update(mms_wait_quantiles(0.0, mu, s, quantiles))
         return result
 
     rho = lmbda / (s * mu)
     a = lmbda / mu
 
-    sum_first = sum(a**n_state / factorial(n_state) for n_state in range(s))
-    sum_tail = sum(
-        (a**n_state) / (factorial(s) * (s ** (n_state - s)))
-        for n_state in range(s, K + 1)
-    )
-    p0 = 1.0 / (sum_first + sum_tail)
+    chain = solve_birth_death(K, lambda state: a / min(state, s), servers=s)
+    probs = chain.probs
+    p0 = chain.p0
 
     def pn_func(n_val: int) -> float:
         if n_val < 0 or int(n_val) != n_val:
             raise ValueError(f"n deve ser inteiro entre 0 e {K}")
         if n_val > K:
             return 0.0
-        if n_val <= s:
-            return (a**n_val / factorial(n_val)) * p0
-        return (a**n_val / (factorial(s) * (s ** (n_val - s)))) * p0
-
-    pn_values = [pn_func(nv) for nv in range(K + 1)]
+        return probs[n_val]
 
-    pK = pn_values[K]
+    pK = chain.pK
     lambda_eff = lmbda * (1 - pK)
 
-    L = sum(nv * pn_values[nv] for nv in range(K + 1))
-    busy_servers = sum(min(nv, s) * pn_values[nv] for nv in range(K + 1))
-    Lq = L - busy_servers
+    L = chain.L
+    Lq = L - chain.busy_servers
     if Lq < 0:
         Lq = 0.0  # protecao numerica
 
@@ -103,6 +109,15 @@ def mmsk(
 
     if n is not None:
         result["pn"] = pn_func(n)
-        result["pn_distribution"] = build_pn_distribution(n, pn_func, max_state=K)
+        result["pn_distribution"] = PnDistribution.from_values(n, probs)
+
+    if t is not None or quantiles is not None:
+        # Wq de quem entra e uma mistura de Erlangs; NumPy so entra aqui
+        from .waiting_time import mmsk_wait_quantiles, mmsk_wait_tails
+
+        if t is not None:
+            result.update(mmsk_wait_tails(lmbda, mu, s, K, t))
+        if quantiles is not None:
+            result.update(mmsk_wait_quantiles(lmbda, mu, s, K, quantiles))
 
     return result
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from .pn_utils import build_pn_distribution
+from .birth_death import solve_birth_death
+from .pn_utils import PnDistribution, build_pn_distribution
 
 
 def mmsn(
@@ -51,25 +52,13 @@ def mmsn(
             result["pn_distribution"] = build_pn_distribution(n, pn_zero, max_state=N)
         return result
 
-    lambdas: List[float] = [(N - k) * lmbda for k in range(N + 1)]
-    mus: List[float] = [0.0] + [min(i, s) * mu for i in range(1, N + 1)]
+    # alpha_i = lambda_{i-1}/mu_i = (N - i + 1) * lambda / (min(i, s) * mu)
+    chain = solve_birth_death(N, lambda i: (N - i + 1) * lmbda / (min(i, s) * mu), servers=s)
+    p = chain.probs
+    p0 = chain.p0
 
-    alpha = [0.0] * (N + 1)
-    for i in range(1, N + 1):
-        alpha[i] = lambdas[i - 1] / mus[i]
-
-    products = [1.0] * (N + 1)
-    prod = 1.0
-    for i in range(1, N + 1):
-        prod *= alpha[i]
-        products[i] = prod
-
-    denom = sum(products)
-    p0 = 1.0 / denom
-    p = [p0 * products[i] for i in range(N + 1)]
-
-    L = sum(i * p[i] for i in range(N + 1))
-    busy_servers = sum(min(i, s) * p[i] for i in range(N + 1))
+    L = chain.L
+    busy_servers = chain.busy_servers
     Lq = L - busy_servers
 
     lambda_eff = lmbda * (N - L)
@@ -99,7 +88,7 @@ def mmsn(
     if n is not None:
         if 0 <= n <= N:
             result["pn"] = p[n]
-            result["pn_distribution"] = build_pn_distribution(n, lambda idx: p[idx], max_state=N)
+            result["pn_distribution"] = PnDistribution.from_values(n, p)
         else:
             raise ValueError(f"n deve estar entre 0 e {N}")
 
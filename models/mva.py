@@ -0,0 +1,236 @@
+from itertools import product
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+ArrayLike = Any
+
+MVA_METHODS = ("exact", "schweitzer")
+
+
+class _Network:
+    """Demandas D[k, c] = visitas / mu por estacao k e classe c."""
+
+    def __init__(self, stations: Sequence[Mapping[str, Any]], n_classes: int) -> None:
+        if not stations:
+            raise ValueError("Informe ao menos uma estacao.")
+        demands: List[np.ndarray] = []
+        visits: List[np.ndarray] = []
+        servers: List[int] = []
+        delay: List[bool] = []
+        for idx, station in enumerate(stations):
+            kind = station.get("type", "queue")
+            if kind not in ("queue", "delay"):
+                raise ValueError(f"Estacao {idx}: type deve ser 'queue' ou 'delay'.")
+            mu = np.broadcast_to(np.asarray(station.get("mu", 0.0), dtype=float), (n_classes,))
+            visit = np.broadcast_to(np.asarray(station.get("visits", 1.0), dtype=float), (n_classes,))
+            if np.any(mu <= 0):
+                raise ValueError(f"Estacao {idx}: mu deve ser > 0.")
+            if np.any(visit < 0):
+                raise ValueError(f"Estacao {idx}: visits deve ser >= 0.")
+            s = station.get("s", 1)
+            if not isinstance(s, int) or s < 1:
+                raise ValueError(f"Estacao {idx}: s deve ser inteiro >= 1.")
+            demands.append(visit / mu)
+            visits.append(np.array(visit))
+            servers.append(s)
+            delay.append(kind == "delay")
+
+        self.D = np.array(demands)
+        self.visits = np.array(visits)
+        self.servers = np.array(servers)
+        self.delay = np.array(delay)
+        # Aproximacao de Seidmann para s > 1 nos metodos sem probabilidades
+        # marginais: fila com demanda D/s em serie com atraso D (s-1)/s
+        queue = ~self.delay
+        scale = np.where(queue, 1.0 / self.servers, 0.0)[:, None]
+        self.D_queue = self.D * scale
+        self.D_fixed = np.where(self.delay[:, None], self.D, self.D - self.D_queue)
+
+    def residence(self, arrival_queue: np.ndarray) -> np.ndarray:
+        """R[k, c] dado o numero medio visto na chegada A[k, c]."""
+        return self.D_queue * (1.0 + arrival_queue) + self.D_fixed
+
+    def class_residence(self, arrival_queue: np.ndarray, c: int) -> np.ndarray:
+        """R[:, c] dado o numero medio A[k] visto pela classe c na chegada."""
+        return self.D_queue[:, c] * (1.0 + arrival_queue) + self.D_fixed[:, c]
+
+
+def _exact_single_class(net: _Network, N: int, Z: float) -> Dict[str, np.ndarray]:
+    """
+    MVA exato de uma classe, populacao 1..N em uma unica passada. Estacoes com
+    s > 1 usam as probabilidades marginais p_k(j), j < s:
+    R_k = D_k/s [1 + Q_k(n-1) + sum_{j<s-1} (s-1-j) p_k(j | n-1)].
+    """
+    D = net.D[:, 0]
+    K = D.size
+    Q = np.zeros(K)
+    single = ~net.delay & (net.servers == 1)
+    multi = [k for k in range(K) if not net.delay[k] and net.servers[k] > 1]
+    marginals = {k: np.eye(1, int(net.servers[k]))[0] for k in multi}
+    history = {"X": np.zeros(N), "R": np.zeros((N, K)), "Q": np.zeros((N, K))}
+
+    for n in range(1, N + 1):
+        R = np.where(single, D * (1.0 + Q), D)
+        for k in multi:
+            s = int(net.servers[k])
+            idle = np.arange(s - 1, 0, -1) @ marginals[k][: s - 1]
+            R[k] = D[k] / s * (1.0 + Q[k] + idle)
+        X = n / (Z + R.sum())
+        Q = X * R
+        for k in multi:
+            s = int(net.servers[k])
+            previous = marginals[k]
+            current = np.zeros(s)
+            current[1:] = D[k] * X / np.arange(1, s) * previous[:-1]
+            current[0] = max(1.0 - (D[k] * X + np.arange(s - 1, 0, -1) @ current[1:]) / s, 0.0)
+            marginals[k] = current
+        history["X"][n - 1] = X
+        history["R"][n - 1] = R
+        history["Q"][n - 1] = Q
+    return history
+
+
+def _exact_multi_class(net: _Network, populations: np.ndarray, Z: np.ndarray) -> tuple:
+    """MVA exato multiclasse sobre o reticulado de populacoes 0..N_c (ordem lexicografica)."""
+    K, C = net.D.shape
+    totals = np.zeros(tuple(populations + 1) + (K,))
+    R = np.zeros((K, C))
+    X = np.zeros(C)
+    for point in product(*(range(size + 1) for size in populations)):
+        if not any(point):
+            continue
+        X = np.zeros(C)
+        R = np.zeros((K, C))
+        for c in range(C):
+            if point[c] == 0:
+                continue
+            previous = list(point)
+            previous[c] -= 1
+            R[:, c] = net.class_residence(totals[tuple(previous)], c)
+            X[c] = point[c] / (Z[c] + R[:, c].sum())
+        totals[point] = R @ X
+    return X, R
+
+
+def _schweitzer(
+    net: _Network, populations: np.ndarray, Z: np.ndarray, tol: float, max_iter: int
+) -> tuple:
+    """
+    Aproximacao de Bard-Schweitzer: Q_kc(N - e_c) ~ Q_kc(N) (N_c - 1)/N_c,
+    iterada ate o ponto fixo; custo por iteracao O(estacoes x classes).
+    """
+    K, C = net.D.shape
+    active = populations > 0
+    Q = np.where(active, populations / K, 0.0) * np.ones((K, 1))
+    shrink = np.where(active, (populations - 1) / np.maximum(populations, 1), 0.0)
+    for _ in range(max_iter):
+        seen = Q.sum(axis=1, keepdims=True) - Q * (1.0 - shrink)
+        R = net.residence(seen)
+        X = np.where(active, populations / (Z + R.sum(axis=0)), 0.0)
+        updated = R * X
+        if np.max(np.abs(updated - Q)) < tol:
+            return X, R
+        Q = updated
+    raise ValueError("Schweitzer nao convergiu; aumente max_iter ou use method='exact'.")
+
+
+def _station_metrics(net: _Network, X: np.ndarray, R: np.ndarray) -> List[Dict[str, Any]]:
+    stations: List[Dict[str, Any]] = []
+    for k in range(net.D.shape[0]):
+        throughput = float(net.visits[k] @ X)
+        L = float(R[k] @ X)
+        busy = float(net.D[k] @ X)
+        W = L / throughput if throughput > 0 else 0.0
+        metrics: Dict[str, Any] = {"lambda_eff": throughput, "L": L, "W": W, "busy_servers": busy}
+        if not net.delay[k]:
+            s = int(net.servers[k])
+            metrics["rho"] = busy / s
+            metrics["Lq"] = max(L - busy, 0.0)
+            metrics["Wq"] = metrics["Lq"] / throughput if throughput > 0 else 0.0
+        stations.append(metrics)
+    return stations
+
+
+def mva(
+    stations: Sequence[Mapping[str, Any]],
+    N: int | Sequence[int],
+    think_time: float | Sequence[float] = 0.0,
+    method: str = "exact",
+    tol: float = 1e-10,
+    max_iter: int = 100000,
+) -> Dict[str, Any]:
+    """
+    Analise de valor medio (MVA) de redes fechadas com N clientes circulando.
+
+    - stations: uma por estacao, ex. {"mu": 2, "s": 4, "visits": 1} ou
+      {"type": "delay", "mu": 0.5}; mu e visits aceitam listas por classe
+    - N: populacao (inteiro) ou lista de populacoes por classe
+    - think_time: tempo fora das estacoes (Z), como o 1/lambda do M/M/s/N
+    - method: "exact" (recursao na populacao) ou "schweitzer" (ponto fixo
+      aproximado, para populacoes grandes)
+
+    Com uma classe e method="exact" todas as populacoes 1..N saem da mesma
+    passada em `by_population`, e estacoes com s > 1 sao exatas. Com varias
+    classes (ou no modo aproximado) s > 1 usa a aproximacao de Seidmann.
+
+    Segue as convencoes do `mmsn`: lambda_eff (vazao), L (clientes nas
+    estacoes), W (tempo de resposta por ciclo, sem Z), L_operational (N - L,
+    clientes fora das estacoes) e rho por estacao; `stations` traz as
+    metricas de cada estacao.
+    """
+    if method not in MVA_METHODS:
+        raise ValueError(f"method deve ser um de {', '.join(MVA_METHODS)}.")
+    single = np.ndim(N) == 0
+    populations = np.atleast_1d(np.asarray(N))
+    if populations.ndim != 1 or not all(
+        isinstance(value, (int, np.integer)) and value >= 0 for value in populations.tolist()
+    ):
+        raise ValueError("N deve ser inteiro >= 0 (ou lista de inteiros por classe).")
+    populations = populations.astype(int)
+    C = populations.size
+    Z = np.broadcast_to(np.asarray(think_time, dtype=float), (C,)).copy()
+    if np.any(Z < 0):
+        raise ValueError("think_time deve ser >= 0.")
+
+    net = _Network(stations, C)
+    K = net.D.shape[0]
+    if np.any((net.D.sum(axis=0) + Z <= 0) & (populations > 0)):
+        raise ValueError("Cada classe com clientes precisa de demanda ou think_time > 0.")
+
+    by_population = None
+    if populations.sum() == 0:
+        X, R = np.zeros(C), np.zeros((K, C))
+    elif method == "schweitzer":
+        X, R = _schweitzer(net, populations, Z, tol, max_iter)
+    elif C == 1:
+        history = _exact_single_class(net, int(populations[0]), float(Z[0]))
+        X, R = history["X"][-1:], history["R"][-1][:, None]
+        by_population = {
+            "N": np.arange(1, populations[0] + 1),
+            "lambda_eff": history["X"],
+            "W": history["R"].sum(axis=1),
+            "L": history["Q"].sum(axis=1),
+        }
+    else:
+        X, R = _exact_multi_class(net, populations, Z)
+
+    station_metrics = _station_metrics(net, X, R)
+    W = R.sum(axis=0)
+    L = W * X  # clientes de cada classe nas estacoes (Little)
+
+    def scalar(values: np.ndarray) -> Any:
+        return float(values[0]) if single else values
+
+    result: Dict[str, Any] = {
+        "lambda_eff": scalar(X),
+        "L": scalar(L),
+        "W": scalar(W),
+        "L_operational": scalar(populations - L),
+        "rho": np.array([station.get("rho", np.nan) for station in station_metrics]),
+        "stations": station_metrics,
+        "method": method,
+    }
+    if by_population is not None:
+        result["by_population"] = by_population
+    return result
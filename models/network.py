@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from .mm1 import mm1
+from .mm1k import mm1k
+from .mms import mms
+from .mmsk import mmsk
+
+ArrayLike = Any
+
+# Modelos de no aceitos (nomes canonicos de calculator.MODEL_MAP)
+NODE_MODELS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "M/M/1": mm1,
+    "M/M/S": mms,
+    "M/M/1/K": mm1k,
+    "M/M/S/K": mmsk,
+}
+
+_MAX_BLOCKING_ITERATIONS = 200
+_BLOCKING_TOL = 1e-12
+
+
+def _is_sparse(matrix: Any) -> bool:
+    return hasattr(matrix, "tocsr") and hasattr(matrix, "nnz")
+
+
+def _solve(matrix: Any, rhs: np.ndarray, transpose: bool) -> np.ndarray:
+    """Resolve (I - M^T) x = rhs (ou I - M) com solver esparso quando M e scipy.sparse."""
+    n = rhs.size
+    if _is_sparse(matrix):
+        from scipy.sparse import identity
+        from scipy.sparse.linalg import spsolve
+
+        system = identity(n, format="csc") - (matrix.T if transpose else matrix).tocsc()
+        solution = np.asarray(spsolve(system, rhs), dtype=float)
+    else:
+        system = np.eye(n) - (matrix.T if transpose else matrix)
+        try:
+            solution = np.linalg.solve(system, rhs)
+        except np.linalg.LinAlgError:
+            solution = np.full(n, np.nan)
+    if not np.all(np.isfinite(solution)):
+        raise ValueError("Roteamento sem saida: algum ciclo nunca deixa a rede.")
+    return solution
+
+
+def _routing_matrix(routing: Any, n: int) -> Any:
+    if _is_sparse(routing):
+        matrix = routing.tocsr().astype(float)
+        values = matrix.data
+        row_sums = np.asarray(matrix.sum(axis=1)).ravel()
+    else:
+        matrix = np.asarray(routing, dtype=float)
+        values = matrix
+        row_sums = matrix.sum(axis=1) if matrix.ndim == 2 else None
+    if matrix.shape != (n, n):
+        raise ValueError(f"routing deve ser uma matriz {n}x{n}.")
+    if np.any(values < 0) or not np.all(np.isfinite(values)):
+        raise ValueError("Probabilidades de roteamento devem ser finitas e >= 0.")
+    if np.any(row_sums > 1.0 + 1e-9):
+        raise ValueError("Cada linha do roteamento deve somar no maximo 1 (o resto sai da rede).")
+    return matrix
+
+
+def _node_specs(nodes: Sequence[Mapping[str, Any]] | Mapping[str, Any], n: int) -> List[Dict[str, Any]]:
+    specs = [dict(nodes)] * n if isinstance(nodes, Mapping) else [dict(spec) for spec in nodes]
+    if len(specs) != n:
+        raise ValueError(f"Informe {n} especificacoes de no (uma por no).")
+    for idx, spec in enumerate(specs):
+        model = spec.get("model")
+        if model not in NODE_MODELS:
+            raise ValueError(
+                f"No {idx}: modelo deve ser um de {', '.join(NODE_MODELS)} (recebido {model!r})."
+            )
+    return specs
+
+
+def _evaluate_node(idx: int, spec: Dict[str, Any], lmbda: float) -> Dict[str, Any]:
+    params = {key: value for key, value in spec.items() if key != "model"}
+    if lmbda <= 0:
+        # No sem trafego: vazio, sem espera (mesma convencao dos modelos com lambda = 0)
+        return {"rho": 0.0, "p0": 1.0, "L": 0.0, "Lq": 0.0, "W": 0.0, "Wq": 0.0}
+    try:
+        return NODE_MODELS[spec["model"]](lmbda=lmbda, **params)
+    except ValueError as exc:
+        raise ValueError(f"No {idx}: {exc}") from None
+
+
+def jackson_network(
+    external_rates: ArrayLike,
+    routing: ArrayLike,
+    nodes: Sequence[Mapping[str, Any]] | Mapping[str, Any],
+    tol: float = _BLOCKING_TOL,
+    max_iter: int = _MAX_BLOCKING_ITERATIONS,
+) -> Dict[str, Any]:
+    """
+    Rede aberta de Jackson: resolve as equacoes de trafego
+    lambda = gamma + P^T lambda e avalia cada no com o modelo isolado
+    (M/M/1, M/M/S, M/M/1/K ou M/M/S/K).
+
+    - external_rates: gamma_i, chegadas externas em cada no
+    - routing: P[i][j] = probabilidade de ir de i para j (1 - soma da linha sai
+      da rede); matriz densa ou scipy.sparse (resolvida com spsolve)
+    - nodes: uma especificacao por no, ex. {"model": "M/M/S", "mu": 4, "s": 2},
+      ou uma unica especificacao usada em todos os nos
+
+    Nos com capacidade K perdem os clientes bloqueados: o trafego repassado e
+    lambda_i (1 - PK_i), e as equacoes sao iteradas ate as taxas convergirem
+    (aproximacao por decomposicao; sem K a forma produto e exata). `tol` e
+    `max_iter` controlam esse ponto fixo; sem convergencia levanta ValueError.
+
+    Devolve arrays por no (lambda, rho, L, Lq, W, Wq, visits, sojourn_from_node),
+    os resultados completos em `nodes` e os totais fim a fim: L_total, W_total
+    (tempo medio na rede por chegada externa; bloqueados contam 0), throughput e bottleneck.
+    """
+    gamma = np.atleast_1d(np.asarray(external_rates, dtype=float))
+    if gamma.ndim != 1 or np.any(gamma < 0) or not np.all(np.isfinite(gamma)):
+        raise ValueError("external_rates deve ser um vetor de taxas >= 0.")
+    n = gamma.size
+    total_external = float(gamma.sum())
+    if total_external <= 0:
+        raise ValueError("A rede precisa de ao menos uma chegada externa > 0.")
+
+    matrix = _routing_matrix(routing, n)
+    specs = _node_specs(nodes, n)
+
+    # Fracao aceita em cada no (1 - PK); 1 para nos sem capacidade finita
+    accepted = np.ones(n)
+    for _ in range(max_iter):
+        if _is_sparse(matrix):
+            from scipy.sparse import diags
+
+            forwarded = diags(accepted) @ matrix
+        else:
+            forwarded = accepted[:, None] * matrix
+        lmbda = _solve(forwarded, gamma, transpose=True)
+        results = [_evaluate_node(idx, spec, float(lmbda[idx])) for idx, spec in enumerate(specs)]
+        updated = np.array([1.0 - result.get("pK", 0.0) for result in results])
+        converged = np.max(np.abs(updated - accepted)) < tol
+        accepted = updated
+        if converged:
+            break
+    else:
+        raise ValueError("Ponto fixo do bloqueio nao convergiu; aumente max_iter ou tol.")
+
+    def column(key: str) -> np.ndarray:
+        return np.array([result[key] for result in results], dtype=float)
+
+    L = column("L")
+    W = column("W")
+    # Tempo de servico sem espera para nos ociosos, caso alguem chegue neles
+    idle = lmbda <= 0
+    W_visit = np.where(idle, [1.0 / spec.get("mu", np.inf) for spec in specs], W)
+
+    # T_i = (1 - B_i) (W_i + sum_j P_ij T_j): tempo ate sair da rede entrando em i
+    sojourn = _solve(forwarded, accepted * W_visit, transpose=False)
+    lost = lmbda * (1.0 - accepted)
+    throughput = total_external - float(lost.sum())
+    rho = column("rho")
+
+    return {
+        "lambda": lmbda,
+        "visits": lmbda / total_external,
+        "rho": rho,
+        "L": L,
+        "Lq": column("Lq"),
+        "W": W,
+        "Wq": column("Wq"),
+        "P(blocked)": 1.0 - accepted,
+        "sojourn_from_node": sojourn,
+        "nodes": results,
+        "L_total": float(L.sum()),
+        "W_total": float(gamma @ sojourn) / total_external,
+        "throughput": throughput,
+        "bottleneck": int(np.argmax(rho)),
+    }
@@ -1,26 +1,149 @@
-from typing import Callable, Dict
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from math import ceil, log
+from typing import Callable, Dict, Tuple
 
 
-def build_pn_distribution(
-    n: int, pn_func: Callable[[int], float], max_state: int | None = None
-) -> Dict[str, float]:
+class PnDistribution:
     """
-    Constroi um dicionario ordenado com P(0)...P(n) e o complemento P(>n).
+    Distribuicao P(N = k) de um modelo, calculada sob demanda.
+
+    - Os estados sao guardados em um `array('d')` indexado por inteiro e so
+      sao avaliados quando alguem pede por eles (`dist[k]`, `dist[a:b]`).
+    - `tail(k)` = P(N > k) vem de forma fechada quando a cauda e geometrica
+      (P_{n+1} = r * P_n para n >= inicio) ou de somas acumuladas nos modelos
+      com capacidade finita.
+    - `to_dict()` devolve o formato antigo {"0": P0, ..., ">n": P(N>n)} da UI.
     """
-    limit = n if max_state is None else min(n, max_state)
 
-    distribution: Dict[str, float] = {}
-    for state in range(limit + 1):
-        distribution[str(state)] = pn_func(state)
+    def __init__(
+        self,
+        n: int,
+        pn_func: Callable[[int], float],
+        max_state: int | None = None,
+        geometric_tail: Tuple[int, float] | None = None,
+    ) -> None:
+        self.n = n
+        self.max_state = max_state
+        self._pn_func = pn_func
+        self._geometric_tail = geometric_tail
+        self._values = array("d")
+        self._suffix: array | None = None
+
+    @classmethod
+    def from_values(cls, n: int, values) -> "PnDistribution":
+        """Distribuicao finita a partir de P(0..K) ja calculados."""
+        dist = cls(n, lambda _state: 0.0, max_state=len(values) - 1)
+        dist._values = array("d", values)
+        return dist
+
+    def _ensure(self, state: int) -> None:
+        if self.max_state is not None:
+            state = min(state, self.max_state)
+        for k in range(len(self._values), state + 1):
+            self._values.append(self._pn_func(k))
+
+    def pn(self, state: int) -> float:
+        if state < 0 or int(state) != state:
+            raise ValueError("n deve ser inteiro >= 0")
+        if self.max_state is not None and state > self.max_state:
+            return 0.0
+        self._ensure(state)
+        return self._values[state]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.start or 0, key.stop, key.step or 1
+            if stop is None:
+                if self.max_state is None:
+                    raise ValueError("Fatia sem fim so e valida para capacidade finita.")
+                stop = self.max_state + 1
+            return array("d", (self.pn(k) for k in range(start, stop, step)))
+        if isinstance(key, str):
+            # Compatibilidade com o formato antigo de chaves texto ("3", ">3")
+            if key.startswith(">"):
+                return self.tail(int(key[1:]))
+            return self.pn(int(key))
+        return self.pn(key)
+
+    def _suffix_sums(self) -> array:
+        if self._suffix is None:
+            self._ensure(self.max_state)
+            reversed_sums = list(accumulate(reversed(self._values)))
+            self._suffix = array("d", reversed(reversed_sums))
+        return self._suffix
+
+    def tail(self, state: int) -> float:
+        """P(N > state)."""
+        if state < 0:
+            return 1.0
+        if self.max_state is not None:
+            if state >= self.max_state:
+                return 0.0
+            return max(0.0, min(1.0, self._suffix_sums()[state + 1]))
+
+        if self._geometric_tail is not None:
+            start, ratio = self._geometric_tail
+            if state >= start - 1:
+                return max(0.0, min(1.0, self.pn(state + 1) / (1.0 - ratio)))
+            head = sum(self.pn(k) for k in range(state + 1, start))
+            return max(0.0, min(1.0, head + self.tail(start - 1)))
+
+        self._ensure(state)
+        return max(0.0, min(1.0, 1.0 - sum(self._values[: state + 1])))
 
-    if max_state is None:
-        tail = 1.0 - sum(distribution.values())
-    elif n < max_state:
-        tail = sum(pn_func(state) for state in range(limit + 1, max_state + 1))
-    else:
-        tail = 0.0
+    def cdf(self, state: int) -> float:
+        """P(N <= state)."""
+        return 1.0 - self.tail(state)
 
-    tail = max(0.0, min(1.0, tail))
-    distribution[f">{n}"] = tail
+    def quantile(self, q: float) -> int:
+        """Menor k com P(N <= k) >= q."""
+        if not 0 <= q <= 1:
+            raise ValueError("q deve estar entre 0 e 1")
 
-    return distribution
+        if self.max_state is not None:
+            self._ensure(self.max_state)
+            prefix = list(accumulate(self._values))
+            return min(bisect_left(prefix, q - 1e-15), self.max_state)
+
+        if q >= 1:
+            raise ValueError("Quantil 1 e infinito para capacidade infinita.")
+
+        start, ratio = self._geometric_tail or (0, 0.0)
+        cumulative = 0.0
+        for k in range(start):
+            cumulative += self.pn(k)
+            if cumulative >= q:
+                return k
+
+        k = start
+        p_start = self.pn(start)
+        if self._geometric_tail is not None and 0 < ratio < 1 and p_start > 0:
+            # Para k >= inicio - 1: P(N > k) = P_inicio * r^(k+1-inicio) / (1 - r)
+            steps = log((1.0 - q) * (1.0 - ratio) / p_start) / log(ratio)
+            k = max(start, ceil(steps) + start - 1)
+            while k > start and self.cdf(k - 1) >= q:
+                k -= 1
+        while self.cdf(k) < q:
+            k += 1
+        return k
+
+    def to_dict(self) -> Dict[str, float]:
+        """Formato antigo: P(0)...P(n) com chaves texto e o complemento P(>n)."""
+        limit = self.n if self.max_state is None else min(self.n, self.max_state)
+        distribution: Dict[str, float] = {str(state): self.pn(state) for state in range(limit + 1)}
+        distribution[f">{self.n}"] = self.tail(self.n)
+        return distribution
+
+
+def build_pn_distribution(
+    n: int,
+    pn_func: Callable[[int], float],
+    max_state: int | None = None,
+    geometric_tail: Tuple[int, float] | None = None,
+) -> PnDistribution:
+    """
+    Constroi a distribuicao lazy P(0)...P(n) (e o complemento P(>n) via `to_dict`).
+    """
+    return PnDistribution(n, pn_func, max_state=max_state, geometric_tail=geometric_tail)
@@ -0,0 +1,225 @@
+from math import log
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+import numpy as np
+
+from .erlang import mms_constants
+from .mg1 import _as_output, _service_model, _tail, _tail_transforms, mg1
+from .mm1 import mm1
+from .mm1k import mm1k
+from .mm1n import mm1n
+from .mms import mms
+from .mmsk import mmsk
+from .mmsn import mmsn
+
+ArrayLike = Any
+
+
+def _states(states: ArrayLike) -> np.ndarray:
+    values = np.asarray(states if hasattr(states, "__len__") else list(states))
+    if values.ndim != 1 or (values.size and (values.dtype.kind not in "iu" or values.min() < 0)):
+        raise ValueError("n deve ser inteiro >= 0")
+    return values.astype(int)
+
+
+def _times(t: ArrayLike) -> np.ndarray:
+    times = np.atleast_1d(np.asarray(t, dtype=float))
+    if times.ndim != 1 or np.any(times < 0) or not np.all(np.isfinite(times)):
+        raise ValueError("t deve ser >= 0")
+    return times
+
+
+class PreparedModel(Mapping):
+    """
+    Sistema com parametros fixos: as constantes de normalizacao sao calculadas
+    uma vez e cada consulta de Pn ou de cauda custa O(1) por ponto. As
+    metricas resumidas (rho, p0, L, Lq, W, Wq, ...) sao as mesmas de
+    `calculate` e ficam acessiveis como um dicionario somente leitura.
+    """
+
+    __slots__ = ("model", "params", "_metrics")
+
+    def __init__(self, model: str, params: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        object.__setattr__(self, "model", model)
+        object.__setattr__(self, "params", dict(params))
+        object.__setattr__(self, "_metrics", metrics)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Modelo preparado e imutavel; use prepare(...) com os novos parametros.")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._metrics[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._metrics)
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def pn(self, n: int) -> float:
+        """P(N = n)."""
+        if not isinstance(n, (int, np.integer)) or n < 0:
+            raise ValueError("n deve ser inteiro >= 0")
+        return float(self.pn_array([n])[0])
+
+    def pn_array(self, states: ArrayLike) -> np.ndarray:
+        """P(N = n) para cada n de `states` (range, lista ou array de inteiros)."""
+        raise ValueError(f"Pn nao disponivel para {self.model}.")
+
+    def w_tail(self, t: ArrayLike) -> Any:
+        """P(W > t) para t escalar ou vetor."""
+        raise ValueError(f"P(W>t) nao disponivel para {self.model}.")
+
+    def wq_tail(self, t: ArrayLike) -> Any:
+        """P(Wq > t) para t escalar ou vetor."""
+        raise ValueError(f"P(Wq>t) nao disponivel para {self.model}.")
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"<PreparedModel {self.model} {params}>"
+
+
+class _PreparedMMS(PreparedModel):
+    """M/M/1 e M/M/s: log P0, Erlang C e log(k!) para k <= s guardados."""
+
+    __slots__ = ("_lmbda", "_mu", "_s", "_a", "_log_p0", "_erlang_c", "_log_factorial")
+
+    def __init__(self, model: str, params: Dict[str, Any], metrics: Dict[str, Any], s: int) -> None:
+        super().__init__(model, params, metrics)
+        lmbda, mu = params["lmbda"], params["mu"]
+        a = lmbda / mu
+        log_p0, C = mms_constants(a, s, params.get("method", "auto")) if a > 0 else (0.0, 0.0)
+        for name, value in (("_lmbda", lmbda), ("_mu", mu), ("_s", s), ("_a", a), ("_log_p0", log_p0)):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_erlang_c", C)
+        object.__setattr__(self, "_log_factorial", np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, s + 1))))))
+
+    def pn_array(self, states: ArrayLike) -> np.ndarray:
+        n = _states(states)
+        if self._a == 0:
+            return (n == 0).astype(float)
+        s, log_a = self._s, log(self._a)
+        # a^n/n! ate s e a^s/s! * rho^(n-s) depois (cauda geometrica)
+        head = n * log_a - self._log_factorial[np.minimum(n, s)]
+        tail = s * log_a - self._log_factorial[s] + (n - s) * log(self._a / s)
+        return np.exp(self._log_p0 + np.where(n <= s, head, tail))
+
+    def wq_tail(self, t: ArrayLike) -> Any:
+        times = _times(t)
+        if self._lmbda == 0:
+            return _as_output(np.zeros(times.shape), np.ndim(t) == 0)
+        drain = self._s * self._mu - self._lmbda
+        return _as_output(self._erlang_c * np.exp(-drain * times), np.ndim(t) == 0)
+
+    def w_tail(self, t: ArrayLike) -> Any:
+        times = _times(t)
+        if self._lmbda == 0:
+            return _as_output(np.zeros(times.shape), np.ndim(t) == 0)
+        mu, C = self._mu, self._erlang_c
+        denom = (self._s - 1) - self._a
+        if abs(denom) < 1e-8:
+            inner = C * mu * times
+        else:
+            inner = C * -np.expm1(-mu * times * denom) / denom
+        return _as_output(np.exp(-mu * times) * (1.0 + inner), np.ndim(t) == 0)
+
+
+class _PreparedFinite(PreparedModel):
+    """Modelos com capacidade ou populacao finita: P0..PK guardados em um array."""
+
+    __slots__ = ("_probs",)
+
+    def __init__(self, model: str, params: Dict[str, Any], metrics: Dict[str, Any], probs: np.ndarray) -> None:
+        super().__init__(model, params, metrics)
+        probs = np.array(probs, dtype=float)
+        probs.flags.writeable = False
+        object.__setattr__(self, "_probs", probs)
+
+    def pn_array(self, states: ArrayLike) -> np.ndarray:
+        n = _states(states)
+        inside = n < self._probs.size
+        return np.where(inside, self._probs[np.where(inside, n, 0)], 0.0)
+
+
+class _PreparedMG1(PreparedModel):
+    """M/G/1: momentos e transformada do servico (amostras ja compactadas) guardados."""
+
+    __slots__ = ("_transforms", "_at_zero")
+
+    def __init__(self, model: str, params: Dict[str, Any], metrics: Dict[str, Any], service: Any) -> None:
+        super().__init__(model, params, metrics)
+        lmbda, rho = params["lmbda"], metrics["rho"]
+        object.__setattr__(self, "_transforms", _tail_transforms(lmbda, rho, service))
+        object.__setattr__(self, "_at_zero", (rho, 1.0 - (1.0 - rho) * service.p_zero))
+
+    def wq_tail(self, t: ArrayLike) -> Any:
+        return _as_output(_tail(self._transforms[0], _times(t), self._at_zero[0]), np.ndim(t) == 0)
+
+    def w_tail(self, t: ArrayLike) -> Any:
+        return _as_output(_tail(self._transforms[1], _times(t), self._at_zero[1]), np.ndim(t) == 0)
+
+
+def _prepare_infinite(func: Callable[..., Dict[str, Any]], s_fixed: int | None) -> Callable[..., PreparedModel]:
+    def build(model: str, params: Dict[str, Any]) -> PreparedModel:
+        metrics = func(**params)
+        s = s_fixed if s_fixed is not None else params["s"]
+        return _PreparedMMS(model, params, metrics, s)
+
+    return build
+
+
+def _prepare_finite(func: Callable[..., Dict[str, Any]]) -> Callable[..., PreparedModel]:
+    def build(model: str, params: Dict[str, Any]) -> PreparedModel:
+        # n=0 faz o modelo devolver a distribuicao completa P0..PK da mesma passada
+        result = func(**params, n=0)
+        distribution = result.pop("pn_distribution")
+        result.pop("pn")
+        return _PreparedFinite(model, params, result, distribution[:])
+
+    return build
+
+
+def _prepare_mg1(model: str, params: Dict[str, Any]) -> PreparedModel:
+    metrics = mg1(**params)
+    service = _service_model(
+        params.get("mu"),
+        params.get("service_distribution", "poisson"),
+        params.get("ES"),
+        params.get("ES2"),
+        params.get("ES3"),
+        params.get("service_samples"),
+    )
+    return _PreparedMG1(model, params, metrics, service)
+
+
+# Nomes canonicos de calculator.MODEL_MAP
+PREPARED_MODELS: Dict[str, Callable[[str, Dict[str, Any]], PreparedModel]] = {
+    "M/M/1": _prepare_infinite(mm1, 1),
+    "M/M/S": _prepare_infinite(mms, None),
+    "M/M/1/K": _prepare_finite(mm1k),
+    "M/M/S/K": _prepare_finite(mmsk),
+    "M/M/1/N": _prepare_finite(mm1n),
+    "M/M/S/N": _prepare_finite(mmsn),
+    "M/G/1": _prepare_mg1,
+}
+
+
+def prepare(model: str, **params) -> PreparedModel:
+    """
+    Prepara `model` com os parametros do sistema (lmbda, mu, s, K, N, servico
+    do M/G/1...) e devolve um objeto imutavel que responde, sem refazer as
+    somas de normalizacao:
+
+      - prepared["L"], prepared["Wq"], ...: metricas de `calculate`
+      - prepared.pn(n) e prepared.pn_array(range(0, 50))
+      - prepared.w_tail(t) e prepared.wq_tail(t): P(W>t) e P(Wq>t) para t
+        escalar ou vetor (M/M/1, M/M/S e M/G/1)
+    """
+    builder = PREPARED_MODELS.get(model)
+    if builder is None:
+        raise ValueError(f"Modelo deve ser um de {', '.join(PREPARED_MODELS)}.")
+    for key in ("n", "t", "quantiles"):
+        if params.get(key) is not None:
+            raise ValueError(f"'{key}' nao faz parte do sistema; consulte-o no objeto preparado.")
+    params = {key: value for key, value in params.items() if value is not None}
+    return builder(model, params)
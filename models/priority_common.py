@@ -1,6 +1,11 @@
-from math import factorial
+from math import exp
 from typing import Any, Dict, Iterable, List
 
+import numpy as np
+
+from . import erlang as erlang_kernel
+from .batch import erlang_b_batch
+
 
 def coerce_arrival_rates(arrival_rates: Iterable[float]) -> List[float]:
     if arrival_rates is None:
@@ -46,21 +51,18 @@ def prefix_sums(values: List[float]) -> List[float]:
     return result
 
 
-def erlang_c(lmbda: float, mu: float, s: int) -> float:
-    if lmbda <= 0:
-        return 0.0
-
-    rho = lmbda / (s * mu)
-    if rho >= 1:
-        raise ValueError(
-            f"Subfila com lambda={lmbda:.6f} e s*mu={s*mu:.6f} e instavel (rho={rho:.6f} >= 1)."
-        )
-
-    a = lmbda / mu
-    sum_terms = sum((a**k) / factorial(k) for k in range(s))
-    last_term = (a**s) / (factorial(s) * (1 - rho))
-    p0 = 1.0 / (sum_terms + last_term)
-    return last_term * p0
+def erlang_c_cumulative(cumulative_rates: List[float], mu: float, s: int) -> List[float]:
+    """
+    Erlang C de cada subfila 1..k (cargas lambda_{1..k}/mu) em uma unica
+    passada da recursao de Erlang B sobre todas as classes: O(s) operacoes
+    vetorizadas em vez de O(classes * s) somas separadas.
+    """
+    loads = np.asarray(cumulative_rates, dtype=float) / mu
+    if np.any(loads >= s):
+        raise ValueError(f"Subfila com lambda >= s*mu = {s * mu:.6f} e instavel.")
+    b = erlang_b_batch(loads, s)
+    waiting = s * b / (s - loads * (1.0 - b))
+    return np.where(loads > 0, waiting, 0.0).tolist()
 
 
 def aggregate_totals(class_metrics: List[Dict[str, float]], mu: float, s: int) -> Dict[str, Any]:
@@ -78,11 +80,10 @@ def aggregate_totals(class_metrics: List[Dict[str, float]], mu: float, s: int) -
 
     if s == 1:
         p0 = 1.0 - rho
+    elif total_lambda > 0:
+        p0 = exp(erlang_kernel.mms_constants(total_lambda / mu, s)[0])
     else:
-        a = total_lambda / mu
-        sum_terms = sum((a**k) / factorial(k) for k in range(s))
-        last_term = (a**s) / (factorial(s) * (1 - rho))
-        p0 = 1.0 / (sum_terms + last_term)
+        p0 = 1.0
 
     return {
         "rho": rho,
@@ -6,12 +6,13 @@ from .mms_priority_preemptive import mms_priority_preemptive
 
 
 MIN_PRIORITY_CLASSES = 1
-MAX_SERVERS = 3
+# Padrao do exemplo da aula; nao ha limite superior de servidores ou classes
+DEFAULT_SERVERS = 3
 
 
 def _enforce_minimums(arrival_rates: Iterable[float], s: int) -> List[float]:
     """
-    Garante que o modelo seja usado com pelo menos 1 classe de prioridade e no maximo 3 servidores.
+    Garante que o modelo seja usado com pelo menos 1 classe de prioridade e s >= 1.
     Retorna as taxas convertidas para float para reaproveitar nas funcoes base.
     """
     rates = coerce_arrival_rates(arrival_rates)
@@ -19,18 +20,16 @@ def _enforce_minimums(arrival_rates: Iterable[float], s: int) -> List[float]:
         raise ValueError(f"Informe pelo menos {MIN_PRIORITY_CLASSES} classe de prioridade.")
     if not isinstance(s, int) or s < 1:
         raise ValueError("Numero de servidores (s) deve ser um inteiro >= 1.")
-    if s > MAX_SERVERS:
-        raise ValueError(f"Numero de servidores (s) deve ser <= {MAX_SERVERS}.")
     return rates
 
 
 def priority_with_preemption(
     arrival_rates: Iterable[float],
     mu: float,
-    s: int = MAX_SERVERS,
+    s: int = DEFAULT_SERVERS,
 ) -> Dict[str, Any]:
     """
-    Modelo M/M/s com prioridades preemptivas para pelo menos 3 classes e ate 3 servidores.
+    Modelo M/M/s com prioridades preemptivas para qualquer numero de classes e servidores.
     A logica de calculo reaproveita o modelo geral de prioridade preemptiva (mms).
     """
     rates = _enforce_minimums(arrival_rates, s)
@@ -40,10 +39,10 @@ def priority_with_preemption(
 def priority_without_preemption(
     arrival_rates: Iterable[float],
     mu: float,
-    s: int = MAX_SERVERS,
+    s: int = DEFAULT_SERVERS,
 ) -> Dict[str, Any]:
     """
-    Modelo M/M/s com prioridades nao preemptivas para pelo menos 3 classes e ate 3 servidores.
+    Modelo M/M/s com prioridades nao preemptivas para qualquer numero de classes e servidores.
     Utiliza o calculo geral de prioridade nao preemptiva (mms).
     """
     rates = _enforce_minimums(arrival_rates, s)
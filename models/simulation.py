@@ -0,0 +1,331 @@
+import heapq
+import random
+from collections import deque
+from math import isnan, sqrt
+from typing import Any, Deque, Dict, Iterable, List, Sequence, Tuple
+
+from .priority_common import coerce_arrival_rates
+
+_ARRIVAL = 0
+_DEPARTURE = 1
+
+# Quantis t de Student (bicaudal 95%) por graus de liberdade; acima de 30 usa 1.96
+_T_975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+class _Customer:
+    __slots__ = ("cls", "arrival", "service", "remaining", "started", "token")
+
+    def __init__(self, cls: int, arrival: float, service: float) -> None:
+        self.cls = cls
+        self.arrival = arrival
+        self.service = service
+        self.remaining = service
+        self.started = 0.0
+        self.token = 0
+
+
+def _run_replication(
+    rates: List[float],
+    mu: float,
+    s: int,
+    K: int | None,
+    N: int | None,
+    preemptive: bool,
+    horizon: float,
+    warmup: float,
+    arrival_rng: random.Random,
+    service_rng: random.Random,
+) -> Dict[str, Any]:
+    """Uma replicacao independente; devolve medias temporais e por cliente."""
+    n_classes = len(rates)
+    calendar: List[Tuple[float, int, int, Any, int]] = []
+    seq = 0
+
+    def schedule(time: float, kind: int, payload: Any, token: int = 0) -> None:
+        nonlocal seq
+        heapq.heappush(calendar, (time, seq, kind, payload, token))
+        seq += 1
+
+    if N is not None:
+        for _source in range(N):
+            schedule(arrival_rng.expovariate(rates[0]), _ARRIVAL, 0)
+    else:
+        for cls, rate in enumerate(rates):
+            if rate > 0:
+                schedule(arrival_rng.expovariate(rate), _ARRIVAL, cls)
+
+    queues: List[Deque[_Customer]] = [deque() for _ in range(n_classes)]
+    in_service: List[_Customer] = []
+    in_system = [0] * n_classes
+    total_in_system = 0
+
+    area_system = [0.0] * n_classes
+    area_queue = [0.0] * n_classes
+    area_busy = 0.0
+    time_empty = 0.0
+    time_full = 0.0
+    time_idle_server = 0.0
+    last_time = 0.0
+
+    sum_W = [0.0] * n_classes
+    sum_Wq = [0.0] * n_classes
+    completed = [0] * n_classes
+    accepted = 0
+    offered = 0
+    blocked = 0
+
+    def advance(now: float) -> None:
+        nonlocal last_time, area_busy, time_empty, time_full, time_idle_server
+        start = last_time if last_time > warmup else warmup
+        end = now if now < horizon else horizon
+        last_time = now
+        if end <= start:
+            return
+        dt = end - start
+        for cls in range(n_classes):
+            area_system[cls] += in_system[cls] * dt
+            area_queue[cls] += len(queues[cls]) * dt
+        busy = len(in_service)
+        area_busy += busy * dt
+        if total_in_system == 0:
+            time_empty += dt
+        if K is not None and total_in_system >= K:
+            time_full += dt
+        if busy < s:
+            time_idle_server += dt
+
+    def start_service(customer: _Customer, now: float) -> None:
+        customer.started = now
+        customer.token += 1
+        in_service.append(customer)
+        schedule(now + customer.remaining, _DEPARTURE, customer, customer.token)
+
+    while calendar:
+        now, _, kind, payload, token = heapq.heappop(calendar)
+        if now > horizon:
+            break
+
+        if kind == _DEPARTURE:
+            customer = payload
+            if token != customer.token:
+                continue  # servico interrompido por preempcao
+            advance(now)
+            in_service.remove(customer)
+            cls = customer.cls
+            in_system[cls] -= 1
+            total_in_system -= 1
+            if customer.arrival >= warmup:
+                W = now - customer.arrival
+                sum_W[cls] += W
+                sum_Wq[cls] += W - customer.service
+                completed[cls] += 1
+            for queue in queues:
+                if queue:
+                    start_service(queue.popleft(), now)
+                    break
+            if N is not None:
+                schedule(now + arrival_rng.expovariate(rates[0]), _ARRIVAL, 0)
+            continue
+
+        cls = payload
+        advance(now)
+        if N is None:
+            schedule(now + arrival_rng.expovariate(rates[cls]), _ARRIVAL, cls)
+        if now >= warmup:
+            offered += 1
+        if K is not None and total_in_system >= K:
+            if now >= warmup:
+                blocked += 1
+            if N is not None:
+                schedule(now + arrival_rng.expovariate(rates[0]), _ARRIVAL, 0)
+            continue
+
+        if now >= warmup:
+            accepted += 1
+        customer = _Customer(cls, now, service_rng.expovariate(mu))
+        in_system[cls] += 1
+        total_in_system += 1
+
+        if len(in_service) < s:
+            start_service(customer, now)
+            continue
+
+        if preemptive:
+            victim = max(in_service, key=lambda c: c.cls)
+            if victim.cls > cls:
+                in_service.remove(victim)
+                victim.remaining -= now - victim.started
+                victim.token += 1
+                queues[victim.cls].appendleft(victim)
+                start_service(customer, now)
+                continue
+
+        queues[cls].append(customer)
+
+    advance(horizon)
+    window = horizon - warmup
+    total_completed = sum(completed)
+    L = sum(area_system) / window
+    Lq = sum(area_queue) / window
+
+    metrics: Dict[str, Any] = {
+        "rho": area_busy / (s * window),
+        "p0": time_empty / window,
+        "L": L,
+        "Lq": Lq,
+        "W": sum(sum_W) / total_completed if total_completed else float("nan"),
+        "Wq": sum(sum_Wq) / total_completed if total_completed else float("nan"),
+    }
+    if K is not None:
+        metrics["lambda_eff"] = accepted / window
+        metrics["pK"] = time_full / window
+        metrics["P(blocked)"] = blocked / offered if offered else 0.0
+    if N is not None:
+        metrics["lambda_eff"] = accepted / window
+        metrics["L_operational"] = N - L
+        if s == 1:
+            metrics["server_utilization"] = area_busy / window
+        else:
+            metrics["P(any_idle_server)"] = time_idle_server / window
+    if n_classes > 1:
+        metrics["per_class"] = [
+            {
+                "priority": cls + 1,
+                "lambda": rates[cls],
+                "W": sum_W[cls] / completed[cls] if completed[cls] else float("nan"),
+                "Wq": sum_Wq[cls] / completed[cls] if completed[cls] else float("nan"),
+                "L_class": area_system[cls] / window,
+                "Lq_class": area_queue[cls] / window,
+            }
+            for cls in range(n_classes)
+        ]
+        metrics["lambda_total"] = sum(rates)
+        metrics["service_in_progress"] = area_busy / window
+    return metrics
+
+
+def _mean_and_interval(samples: Iterable[float]) -> Tuple[float, Tuple[float, float] | None]:
+    values = [value for value in samples if not isnan(value)]
+    if not values:
+        return float("nan"), None
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, None
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    df = len(values) - 1
+    t_value = _T_975[df - 1] if df <= len(_T_975) else 1.96
+    half = t_value * sqrt(variance / len(values))
+    return mean, (mean - half, mean + half)
+
+
+def simulate_queue(
+    mu: float,
+    s: int = 1,
+    lmbda: float | None = None,
+    arrival_rates: Sequence[float] | None = None,
+    K: int | None = None,
+    N: int | None = None,
+    preemptive: bool = False,
+    horizon: float | None = None,
+    warmup: float | None = None,
+    replications: int = 10,
+    seed: int = 0,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Simulacao por eventos discretos (calendario em heap) de filas markovianas:
+    M/M/s, M/M/s/K (`K`), populacao finita (`N`, taxa `lmbda` por fonte) e
+    multiplas classes com prioridade (`arrival_rates`, classe 1 = maior
+    prioridade; `preemptive` escolhe com ou sem interrupcao).
+
+    Devolve as mesmas chaves dos modelos analiticos (medias das replicacoes)
+    e `confidence_intervals` com intervalos de 95% (t de Student) entre as
+    replicacoes; `rho` e a utilizacao observada dos servidores. Cada replicacao
+    usa fluxos de numeros aleatorios proprios para chegadas e servicos,
+    derivados de `seed`.
+
+    - horizon: duracao de cada replicacao (padrao: ~20000 chegadas esperadas)
+    - warmup: periodo descartado no inicio (padrao: 10% do horizonte)
+    """
+    if arrival_rates is None:
+        if lmbda is None:
+            raise ValueError("Informe lmbda ou arrival_rates.")
+        arrival_rates = [lmbda]
+    rates = coerce_arrival_rates(arrival_rates)
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    if not isinstance(s, int) or s <= 0:
+        raise ValueError("s deve ser inteiro >= 1")
+    if K is not None and (not isinstance(K, int) or K < s):
+        raise ValueError("K deve ser inteiro >= s")
+    if N is not None:
+        if not isinstance(N, int) or N < 0:
+            raise ValueError("N deve ser inteiro >= 0")
+        if len(rates) > 1:
+            raise ValueError("Populacao finita suporta apenas uma classe.")
+    if not isinstance(replications, int) or replications < 1:
+        raise ValueError("replications deve ser inteiro >= 1")
+
+    total_rate = sum(rates) * (N if N is not None else 1)
+    if total_rate <= 0:
+        raise ValueError("A taxa total de chegada deve ser > 0 para simular.")
+    if K is None and N is None and total_rate >= s * mu:
+        raise ValueError(f"Sistema instavel (rho = {total_rate / (s * mu):.6f} >= 1).")
+
+    if horizon is None:
+        horizon = 20000.0 / total_rate
+    if warmup is None:
+        warmup = 0.1 * horizon
+    if not 0 <= warmup < horizon:
+        raise ValueError("warmup deve estar em [0, horizon).")
+
+    runs = [
+        _run_replication(
+            rates,
+            mu,
+            s,
+            K,
+            N,
+            preemptive,
+            horizon,
+            warmup,
+            random.Random(f"{seed}-{rep}-arrivals"),
+            random.Random(f"{seed}-{rep}-services"),
+        )
+        for rep in range(replications)
+    ]
+
+    result: Dict[str, Any] = {}
+    intervals: Dict[str, Any] = {}
+    for key, value in runs[0].items():
+        if isinstance(value, list):
+            continue
+        result[key], intervals[key] = _mean_and_interval(run[key] for run in runs)
+
+    if "per_class" in runs[0]:
+        per_class: List[Dict[str, Any]] = []
+        per_class_ci: List[Dict[str, Any]] = []
+        cumulative_L = cumulative_Lq = 0.0
+        for idx, base in enumerate(runs[0]["per_class"]):
+            metrics: Dict[str, Any] = {"priority": base["priority"], "lambda": base["lambda"]}
+            ci: Dict[str, Any] = {}
+            for key in ("W", "Wq", "L_class", "Lq_class"):
+                metrics[key], ci[key] = _mean_and_interval(run["per_class"][idx][key] for run in runs)
+            # L/Lq seguem a convencao do modelo analitico correspondente
+            cumulative_L += metrics["L_class"]
+            cumulative_Lq += metrics["Lq_class"]
+            metrics["L"] = cumulative_L if preemptive else metrics["L_class"]
+            metrics["Lq"] = cumulative_Lq if preemptive else metrics["Lq_class"]
+            per_class.append(metrics)
+            per_class_ci.append(ci)
+        result["per_class"] = per_class
+        intervals["per_class"] = per_class_ci
+
+    result["replications"] = replications
+    result["confidence_intervals"] = intervals
+    return result
@@ -0,0 +1,106 @@
+from math import exp, log
+from numbers import Integral
+from typing import Any, Dict
+
+from .erlang import erlang_c_from_b, log_add, log_geometric_sum, safe_log
+
+MAX_SEARCH_SERVERS = 1_000_000
+
+MMS_TARGETS = ("Wq", "W", "P(Wq>t)")
+MMSK_TARGETS = ("pK",)
+
+
+def _validate_rates(lmbda: float, mu: float, limit: float) -> None:
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    if limit < 0:
+        raise ValueError("O limite da meta deve ser >= 0")
+
+
+def mms_min_servers(
+    lmbda: float,
+    mu: float,
+    target: str,
+    limit: float,
+    t: float | None = None,
+    max_servers: int = MAX_SEARCH_SERVERS,
+) -> Dict[str, Any]:
+    """
+    Menor s do M/M/s tal que `target` <= `limit`, com target em Wq, W ou P(Wq>t).
+
+    Percorre s = 1, 2, ... atualizando Erlang B pela recursao
+    B(s) = a*B(s-1) / (s + a*B(s-1)), entao a busca inteira custa O(s).
+    """
+    _validate_rates(lmbda, mu, limit)
+    if target not in MMS_TARGETS:
+        raise ValueError(f"Meta deve ser uma de {', '.join(MMS_TARGETS)}.")
+    if target == "P(Wq>t)" and (t is None or t < 0):
+        raise ValueError("Informe t >= 0 para a meta P(Wq>t).")
+    # Pisos que nenhum s atravessa: W >= 1/mu (so o servico) e, com chegadas,
+    # Wq e P(Wq>t) sempre > 0; rejeitados antes de percorrer max_servers.
+    if target == "W" and (limit < 1.0 / mu or (lmbda > 0 and limit == 1.0 / mu)):
+        raise ValueError(f"Meta inviavel: W >= 1/mu = {1.0 / mu:.6g} para qualquer s.")
+    if target in ("Wq", "P(Wq>t)") and lmbda > 0 and limit == 0:
+        raise ValueError(f"Meta inviavel: {target} > 0 para qualquer s quando lambda > 0.")
+
+    a = lmbda / mu
+    b = 1.0
+    for s in range(1, max_servers + 1):
+        b = a * b / (s + a * b)
+        if a >= s:
+            continue  # ainda instavel
+
+        C = erlang_c_from_b(a, s, b)
+        drain_rate = s * mu - lmbda
+        metrics = {"Wq": C / drain_rate}
+        metrics["W"] = metrics["Wq"] + 1.0 / mu
+        if t is not None:
+            metrics["P(Wq>t)"] = C * exp(-drain_rate * t)
+
+        if metrics[target] <= limit:
+            return {"s": s, "rho": a / s, "P(wait)": C, **metrics}
+
+    raise ValueError(f"Nenhum s <= {max_servers} atende {target} <= {limit}.")
+
+
+def mmsk_min_servers(
+    lmbda: float,
+    mu: float,
+    K: int,
+    limit: float,
+    target: str = "pK",
+) -> Dict[str, Any]:
+    """
+    Menor s (1 <= s <= K) do M/M/s/K com probabilidade de bloqueio pK <= `limit`.
+
+    Com S_s = sum_{n<s} a^n/n! e T_s = a^s/s!, S_s/T_s = 1/B(s) - 1, logo
+    pK = rho^(K-s) / (1/B(s) - 1 + sum_{j=0}^{K-s} rho^j): cada s custa O(1).
+    """
+    _validate_rates(lmbda, mu, limit)
+    if target not in MMSK_TARGETS:
+        raise ValueError(f"Meta deve ser uma de {', '.join(MMSK_TARGETS)}.")
+    if not isinstance(K, Integral) or K < 1:
+        raise ValueError("K deve ser inteiro >= 1")
+    K = int(K)  # aceita inteiros NumPy vindos das grades/lotes
+
+    a = lmbda / mu
+    if a == 0:
+        return {"s": 1, "rho": 0.0, "pK": 0.0}
+
+    b = 1.0
+    for s in range(1, K + 1):
+        b = a * b / (s + a * b)
+        rho = a / s
+        m = K - s
+        if b == 0:
+            pK = 0.0
+        else:
+            log_pK = m * log(rho) - log_add(safe_log(1.0 / b - 1.0), log_geometric_sum(rho, m))
+            pK = exp(log_pK)
+
+        if pK <= limit:
+            return {"s": s, "rho": rho, "pK": pK}
+
+    raise ValueError(f"Nenhum s <= K={K} atende pK <= {limit}.")
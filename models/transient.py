@@ -0,0 +1,234 @@
+from math import sqrt
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from .birth_death import solve_birth_death
+
+ArrayLike = Any
+
+# Pesos de Poisson abaixo disso nao alteram o resultado em precisao dupla
+_MIN_WEIGHT = 1e-300
+# Massa abaixo disso nas pontas da janela de estados e descartada
+_TRIM_MASS = 1e-20
+
+
+def solve_transient(
+    births: np.ndarray,
+    deaths: np.ndarray,
+    times: ArrayLike,
+    initial_state: int | Sequence[float] = 0,
+    tol: float = 1e-12,
+) -> np.ndarray:
+    """
+    P(n, t) de um processo nascimento-morte com estados 0..K por uniformizacao.
+
+    Com Lambda >= max(lambda_n + mu_n) e P = I + Q/Lambda (tridiagonal),
+    p(t) = sum_k Poisson(k; Lambda*t) * p(0) P^k. Cada termo e um produto
+    tridiagonal O(K) e serve para toda a grade de tempos de uma vez; quando
+    p(0) P^k chega a distancia L1 < tol do vetor estacionario (solve_birth_death),
+    o peso restante vai todo para ele. Um passo pequeno sozinho nao basta: em
+    cadeias que misturam devagar o iterado anda pouco por passo longe do equilibrio.
+    O custo e O(Lambda * max(t) * largura), onde a largura e a faixa de estados
+    com massa relevante (limitada por K + 1).
+
+    Retorna uma matriz (len(times), K + 1).
+    """
+    births = np.asarray(births, dtype=float)
+    deaths = np.asarray(deaths, dtype=float)
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    if times.ndim != 1:
+        raise ValueError("times deve ser um vetor de instantes")
+    if np.any(times < 0) or not np.all(np.isfinite(times)):
+        raise ValueError("Todos os instantes t devem ser finitos e >= 0")
+
+    n_states = births.size
+    if isinstance(initial_state, (int, np.integer)):
+        if not 0 <= initial_state < n_states:
+            raise ValueError(f"Estado inicial deve estar entre 0 e {n_states - 1}")
+        vector = np.zeros(n_states)
+        vector[initial_state] = 1.0
+    else:
+        vector = np.asarray(initial_state, dtype=float)
+        if vector.shape != (n_states,) or np.any(vector < 0) or abs(vector.sum() - 1.0) > 1e-9:
+            raise ValueError(f"Distribuicao inicial deve ter {n_states} probabilidades somando 1")
+        vector = vector.copy()
+
+    out = np.zeros((times.size, n_states))
+    rate = float(np.max(births + deaths))
+    if rate == 0:
+        out[:] = vector
+        return out
+
+    # Coeficientes da matriz P = I + Q/Lambda
+    up = births[:-1] / rate
+    down = deaths[1:] / rate
+    stay = 1.0 - (births + deaths) / rate
+
+    scaled_times = rate * times
+    max_scaled = float(scaled_times.max())
+    max_terms = int(max_scaled + 8.0 * sqrt(max_scaled) + 20)
+    log_scaled = np.log(np.where(scaled_times > 0, scaled_times, 1.0))
+    log_weight = np.where(scaled_times > 0, -scaled_times, 0.0)  # log Poisson(0)
+    accumulated = np.zeros(times.size)
+
+    # Vetor estacionario para a parada antecipada (so existe se todo mu_n > 0)
+    stationary = None
+    if np.all(deaths[1:] > 0):
+        stationary = np.asarray(
+            solve_birth_death(n_states - 1, lambda n: births[n - 1] / deaths[n], 1).probs
+        )
+
+    # Janela [lo, hi] dos estados com massa relevante: cada passo so alcanca os
+    # vizinhos, entao o custo por termo e a largura da janela, nao K.
+    support = np.nonzero(vector > _TRIM_MASS)[0]
+    lo, hi = int(support[0]), int(support[-1])
+    last = n_states - 1
+
+    for k in range(max_terms + 1):
+        if k > 0:
+            log_weight = np.where(
+                scaled_times > 0, log_weight + log_scaled - np.log(k), -np.inf
+            )
+            new_lo, new_hi = max(lo - 1, 0), min(hi + 1, last)
+            previous = vector[new_lo : new_hi + 1].copy()
+            window = stay[new_lo : new_hi + 1] * previous
+            window[1:] += up[new_lo:new_hi] * previous[:-1]
+            window[:-1] += down[new_lo:new_hi] * previous[1:]
+            vector[new_lo : new_hi + 1] = window
+            lo, hi = new_lo, new_hi
+            while lo < hi and vector[lo] < _TRIM_MASS:
+                vector[lo] = 0.0
+                lo += 1
+            while hi > lo and vector[hi] < _TRIM_MASS:
+                vector[hi] = 0.0
+                hi -= 1
+
+        weights = np.exp(log_weight)
+        active = weights > _MIN_WEIGHT
+        if active.any():
+            out[active, lo : hi + 1] += weights[active, None] * vector[None, lo : hi + 1]
+            accumulated[active] += weights[active]
+
+        # Passo pequeno e filtro barato (O(janela)); a distancia ao estacionario e O(K)
+        if (
+            k > 0
+            and stationary is not None
+            and np.abs(vector[new_lo : new_hi + 1] - previous).sum() < tol
+            and np.abs(vector - stationary).sum() < tol
+        ):
+            remaining = np.clip(1.0 - accumulated, 0.0, None)
+            out += remaining[:, None] * stationary[None, :]
+            break
+
+    return out
+
+
+def _summarize(
+    probs: np.ndarray, times: np.ndarray, servers: int, capacity_bound: bool
+) -> Dict[str, Any]:
+    states = np.arange(probs.shape[1])
+    L = probs @ states
+    busy = probs @ np.minimum(states, servers)
+    result: Dict[str, Any] = {
+        "t": times,
+        "pn": probs,
+        "p0": probs[:, 0],
+        "L": L,
+        "Lq": np.maximum(L - busy, 0.0),
+        "busy_servers": busy,
+    }
+    if capacity_bound:
+        result["pK"] = probs[:, -1]
+    return result
+
+
+def _validate(lmbda: float, mu: float, s: int) -> None:
+    if lmbda < 0:
+        raise ValueError("lambda (lmbda) deve ser >= 0")
+    if mu <= 0:
+        raise ValueError("mu deve ser > 0")
+    if not isinstance(s, int) or s <= 0:
+        raise ValueError("s deve ser inteiro >= 1")
+
+
+def mmsk_transient(
+    lmbda: float,
+    mu: float,
+    s: int,
+    K: int,
+    times: ArrayLike,
+    initial_state: int | Sequence[float] = 0,
+    tol: float = 1e-12,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Regime transitorio do M/M/s/K: P(n, t), L(t), Lq(t), P0(t) e PK(t) para
+    toda a grade `times`, partindo de `initial_state` (estado ou distribuicao).
+    """
+    _validate(lmbda, mu, s)
+    if not isinstance(K, int) or K < s:
+        raise ValueError("K deve ser inteiro >= s")
+
+    states = np.arange(K + 1)
+    births = np.where(states < K, lmbda, 0.0)
+    deaths = np.minimum(states, s) * mu
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    probs = solve_transient(births, deaths, times, initial_state, tol=tol)
+    return _summarize(probs, times, s, capacity_bound=True)
+
+
+def mm1k_transient(
+    lmbda: float,
+    mu: float,
+    K: int,
+    times: ArrayLike,
+    initial_state: int | Sequence[float] = 0,
+    tol: float = 1e-12,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Regime transitorio do M/M/1/K (ver `mmsk_transient`)."""
+    if not isinstance(K, int) or K < 1:
+        raise ValueError("K deve ser inteiro >= 1")
+    return mmsk_transient(lmbda, mu, 1, K, times, initial_state, tol=tol)
+
+
+def mmsn_transient(
+    lmbda: float,
+    mu: float,
+    s: int,
+    N: int,
+    times: ArrayLike,
+    initial_state: int | Sequence[float] = 0,
+    tol: float = 1e-12,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Regime transitorio do M/M/s/N (populacao finita): lambda_n = (N - n) * lambda,
+    mu_n = min(n, s) * mu. Tambem devolve lambda_eff(t) = lambda * (N - L(t)).
+    """
+    _validate(lmbda, mu, s)
+    if not isinstance(N, int) or N < 0:
+        raise ValueError("N deve ser inteiro >= 0")
+
+    states = np.arange(N + 1)
+    births = (N - states) * lmbda
+    deaths = np.minimum(states, s) * mu
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    probs = solve_transient(births, deaths, times, initial_state, tol=tol)
+    result = _summarize(probs, times, s, capacity_bound=False)
+    result["lambda_eff"] = lmbda * (N - result["L"])
+    return result
+
+
+def mm1n_transient(
+    lmbda: float,
+    mu: float,
+    N: int,
+    times: ArrayLike,
+    initial_state: int | Sequence[float] = 0,
+    tol: float = 1e-12,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Regime transitorio do M/M/1/N (ver `mmsn_transient`)."""
+    return mmsn_transient(lmbda, mu, 1, N, times, initial_state, tol=tol)
@@ -0,0 +1,300 @@
+"""
+Caudas e quantis dos tempos de espera (Wq) e de permanencia (W) no M/M/s e no
+M/M/s/K (FCFS), vetorizados sobre arrays de parametros e de probabilidades.
+O formato da saida segue o broadcasting: shape(parametros) + shape(quantiles),
+com float quando os dois forem escalares.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+from .batch import mms_constants_batch
+
+ArrayLike = Any
+Tail = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+_NEWTON_ITERATIONS = 100
+_NEWTON_RTOL = 1e-14
+# Termos de Poisson alem de media +/- 12 desvios (+30) sao desprezados
+_POISSON_SPREAD = 12.0
+_POISSON_MARGIN = 30.0
+# Limite de elementos da matriz Pois(j; x) avaliada por vez
+_POISSON_BLOCK = 1_000_000
+
+
+def quantile_probabilities(quantiles: ArrayLike) -> np.ndarray:
+    probs = np.atleast_1d(np.asarray(quantiles, dtype=float))
+    if probs.ndim != 1 or np.any(probs <= 0) or np.any(probs >= 1):
+        raise ValueError("quantiles deve conter probabilidades em (0, 1)")
+    return probs
+
+
+def _output(values: np.ndarray, shape: Tuple[int, ...]) -> Any:
+    values = values.reshape(shape)
+    return float(values) if values.ndim == 0 else values
+
+
+def _invert(tail: Tail, target: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Resolve P(X>t) = target por Newton em log P(X>t), protegido por bissecao no
+    intervalo [lo, hi] com P(X>lo) >= target >= P(X>hi). Tudo elemento a elemento.
+    """
+    lo, hi = lo.copy(), hi.copy()
+    t = 0.5 * (lo + hi)
+    log_target = np.log(target)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(_NEWTON_ITERATIONS):
+            value, slope = tail(t)
+            gap = np.log(value) - log_target
+            above = gap > 0
+            lo = np.where(above, t, lo)
+            hi = np.where(above, hi, t)
+            step = gap * value / slope
+            candidate = t - step
+            # passo ja desprezivel vale mesmo encostado no intervalo (a raiz pode ser lo ou hi)
+            converged = np.abs(step) <= _NEWTON_RTOL * t
+            inside = converged | ((candidate > lo) & (candidate < hi))
+            t = np.where(inside, candidate, 0.5 * (lo + hi))
+            if np.all(converged | (hi - lo <= _NEWTON_RTOL * hi)):
+                break
+    return t
+
+
+def _log_geometric(q: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """log de sum_{i<m} q^i para 0 <= q <= 1 e m >= 1 (expm1 mantem a precisao com q ~ 1)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_q = np.log(q)
+        ratio = np.expm1(m * log_q) / np.expm1(log_q)
+        return np.where(q == 1.0, np.log(m), np.log(ratio))
+
+
+def _log_power_sum(big: float, small: float, m: np.ndarray) -> np.ndarray:
+    """log de sum_{i<m} big^(m-1-i) * small^i com big >= small >= 0."""
+    with np.errstate(divide="ignore"):
+        return (m - 1) * np.log(big) + _log_geometric(np.full(m.shape, small / big), m)
+
+
+# ---------------------------------------------------------------- M/M/s
+
+
+def mms_wait_quantiles(
+    lmbda: ArrayLike, mu: ArrayLike, s: ArrayLike, quantiles: ArrayLike, method: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Quantis de Wq e W no M/M/s (M/M/1 com s = 1) para parametros estaveis:
+      - P(Wq>t) = C e^{-(s mu - lambda) t} da o quantil de Wq em forma fechada;
+      - P(W>t) = e^{-mu t} [1 + C (1 - e^{-mu t d}) / d], d = s - 1 - a, e
+        invertida por Newton a partir de max(q_S, q_Wq) <= q_W <= q_S(p') + q_Wq(p'),
+        p' = (1 + p)/2.
+    """
+    probs = quantile_probabilities(quantiles)
+    lmbda, mu, s = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (lmbda, mu, s)))
+    shape = lmbda.shape + np.shape(quantiles)
+    lmbda, mu, s = (value.reshape(-1, 1) for value in (lmbda, mu, s))
+
+    a = lmbda / mu
+    C = mms_constants_batch(a.ravel(), s.ravel(), method)[1].reshape(a.shape)
+    drain = s * mu - lmbda
+    d = s - 1.0 - a
+    near = np.abs(d) < 1e-8
+    safe_d = np.where(near, 1.0, d)
+
+    def wq_quantile(p: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            return np.where(C > 1.0 - p, np.log(C / (1.0 - p)) / drain, 0.0)
+
+    def w_tail(t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        x = mu * t * d
+        decay = np.exp(-mu * t)
+        # (e^{-mu t} - e^{-(s mu - lambda) t}) / d e derivada; expm1 quando x e pequeno
+        small = x > -1.0
+        ratio = np.where(small, decay * -np.expm1(-x) / safe_d, (decay - np.exp(-drain * t)) / safe_d)
+        ratio_slope = np.where(
+            small,
+            mu * decay * (np.exp(-x) + np.expm1(-x) / safe_d),
+            (drain * np.exp(-drain * t) - mu * decay) / safe_d,
+        )
+        ratio = np.where(near, mu * t * decay, ratio)
+        ratio_slope = np.where(near, mu * decay * (1.0 - mu * t), ratio_slope)
+        return decay + C * ratio, -mu * decay + C * ratio_slope
+
+    q_wq = wq_quantile(probs)
+    q_service = -np.log1p(-probs) / mu
+    outer = 0.5 * (1.0 + probs)
+    lo = np.maximum(q_service, q_wq)
+    hi = -np.log1p(-outer) / mu + wq_quantile(outer)
+    q_w = _invert(w_tail, np.broadcast_to(1.0 - probs, lo.shape), lo, hi)
+
+    idle = lmbda == 0  # sem chegadas o modelo reporta W = Wq = 0
+    return {
+        "Wq_quantiles": _output(np.where(idle, 0.0, q_wq), shape),
+        "W_quantiles": _output(np.where(idle, 0.0, q_w), shape),
+    }
+
+
+# ---------------------------------------------------------------- M/M/s/K
+
+
+class _FiniteWait:
+    """
+    Distribuicao de Wq e W de um cliente aceito no M/M/s/K. Quem chega e
+    encontra n >= s clientes (probabilidade pi_n = P_n / (1 - P_K)) espera
+    k = n - s + 1 saidas a taxa theta = s*mu, ou seja, Wq ~ Erlang(k, theta), e
+    W = Wq + Exp(mu). Com x = theta*t e Pois(j; x) = e^{-x} x^j / j!:
+      - P(Wq>t) = sum_j Pois(j; x) T_j, T_j = sum_{k>j} pi_{s+k-1};
+      - P(W>t) = P(Wq=0) e^{-mu t} + sum_j Pois(j; x) (T_j + h_j),
+        h_j = sum_{k<=j} pi_{s+k-1} r^{j-k}, r = (s-1)/s.
+    pi_{s+k-1} e geometrica de razao rho = a/s em k, entao T_j e h_j saem em
+    forma fechada e so a janela de j onde Pois(j; x) importa e avaliada.
+    """
+
+    def __init__(self, lmbda: float, mu: float, s: int, K: int) -> None:
+        a = lmbda / mu
+        rho = a / s
+        states = np.arange(K + 1)
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, s + 1)))))
+        log_weights = np.where(
+            states <= s,
+            states * np.log(a) - log_factorial[np.minimum(states, s)],
+            s * np.log(a) - log_factorial[s] + (states - s) * np.log(rho),
+        )
+        # Distribuicao vista por quem entra: estados 0..K-1 renormalizados
+        log_arrival = log_weights[:K] - np.logaddexp.reduce(log_weights[:K])
+
+        self.mu = mu
+        self.theta = s * mu
+        self.waiting_states = K - s
+        self.rho = rho
+        self.r = (s - 1) / s
+        self.log_first = log_arrival[s] if K > s else -np.inf
+        self.wait_probability = float(np.exp(np.logaddexp.reduce(log_arrival[s:]))) if K > s else 0.0
+        self._log_factorial = np.zeros(1)
+
+    def _log_factorials(self, top: int) -> np.ndarray:
+        if self._log_factorial.size <= top:
+            self._log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, 2 * top + 2)))))
+        return self._log_factorial
+
+    def _coefficients(self, j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(T_j, h_j) para um array de j >= 0."""
+        M, rho, r = self.waiting_states, self.rho, self.r
+        if M == 0:
+            return np.zeros(j.shape), np.zeros(j.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # T_j = pi_s * sum_{i=j}^{M-1} rho^i
+            count = np.maximum(M - j, 1)
+            if rho <= 1:
+                log_T = j * np.log(rho) + _log_geometric(np.full(j.shape, rho), count)
+            else:
+                log_T = (M - 1) * np.log(rho) + _log_geometric(np.full(j.shape, 1.0 / rho), count)
+            T = np.where(j < M, np.exp(self.log_first + log_T), 0.0)
+
+            # h_j = pi_s * sum_{i<j} rho^i r^{j-1-i} ate M; depois decai como r^{j-M}
+            big, small = max(rho, r), min(rho, r)
+            capped = np.clip(j, 1, M)
+            log_h = self.log_first + _log_power_sum(big, small, capped)
+            log_h = np.where(j > M, log_h + (j - M) * np.log(r), log_h)
+            h = np.where(j == 0, 0.0, np.exp(log_h))
+        return T, h
+
+    def _mixture(self, t: np.ndarray, with_service: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        sum_j Pois(j; theta t) c_j e sua derivada em t, c = T (Wq) ou T + h (W).
+        Os t sao agrupados em ordem crescente para que cada matriz t x janela
+        de j tenha no maximo _POISSON_BLOCK elementos.
+        """
+        x = self.theta * t
+        order = np.argsort(x)
+        ordered = x[order]
+        width = 2.0 * (_POISSON_SPREAD * np.sqrt(ordered) + _POISSON_MARGIN) + 2.0
+        value, slope = np.empty(x.shape), np.empty(x.shape)
+        start = 0
+        while start < ordered.size:
+            stop = start + 1
+            while stop < ordered.size and (stop + 1 - start) * (
+                ordered[stop] - ordered[start] + width[stop]
+            ) <= _POISSON_BLOCK:
+                stop += 1
+            rows = order[start:stop]
+            value[rows], slope[rows] = self._mixture_block(ordered[start:stop], with_service)
+            start = stop
+        return value, slope
+
+    def _mixture_block(self, x: np.ndarray, with_service: bool) -> Tuple[np.ndarray, np.ndarray]:
+        low, high = float(x[0]), float(x[-1])
+        first = int(max(0.0, low - _POISSON_SPREAD * np.sqrt(low) - _POISSON_MARGIN))
+        last = int(high + _POISSON_SPREAD * np.sqrt(high) + _POISSON_MARGIN) + 1
+        if not with_service:
+            last = min(last, self.waiting_states)  # T_j = 0 para j >= M
+        j = np.arange(first, max(first, last) + 2)
+        T, h = self._coefficients(j)
+        c = T + h if with_service else T
+        log_factorial = self._log_factorials(int(j[-1]))[j]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_x = np.log(x)[:, None]
+            log_pois = -x[:, None] + np.where(j == 0, 0.0, j * log_x) - log_factorial
+        pois = np.exp(log_pois[:, :-1])
+        return pois @ c[:-1], self.theta * (pois @ np.diff(c))
+
+    def wq_tail(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._mixture(t, with_service=False)
+
+    def w_tail(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        value, slope = self._mixture(t, with_service=True)
+        idle = (1.0 - self.wait_probability) * np.exp(-self.mu * t)
+        return value + idle, slope - self.mu * idle
+
+    def quantiles(self, probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        target = 1.0 - probs
+        scale = (self.waiting_states + 1) / self.theta + 1.0 / self.mu
+        return self._solve(self.wq_tail, target, self.wait_probability, scale), self._solve(
+            self.w_tail, target, 1.0, scale
+        )
+
+    @staticmethod
+    def _solve(tail: Tail, target: np.ndarray, at_zero: float, scale: float) -> np.ndarray:
+        result = np.zeros(target.shape)
+        pending = target < at_zero
+        if not pending.any():
+            return result
+        goal = target[pending]
+        hi = np.full(goal.shape, scale)
+        for _ in range(200):
+            above = tail(hi)[0] > goal
+            if not above.any():
+                break
+            hi[above] *= 2.0
+        result[pending] = _invert(tail, goal, np.zeros(goal.shape), hi)
+        return result
+
+
+def mmsk_wait_tails(lmbda: float, mu: float, s: int, K: int, t: ArrayLike) -> Dict[str, Any]:
+    """P(Wq>t) e P(W>t) de um cliente aceito no M/M/s/K (lmbda > 0), t escalar ou vetor."""
+    times = np.atleast_1d(np.asarray(t, dtype=float))
+    if times.ndim != 1 or np.any(times < 0) or not np.all(np.isfinite(times)):
+        raise ValueError("t deve ser >= 0")
+    wait = _FiniteWait(lmbda, mu, s, K)
+    wq = np.where(times == 0, wait.wait_probability, np.clip(wait.wq_tail(times)[0], 0.0, 1.0))
+    w = np.where(times == 0, 1.0, np.clip(wait.w_tail(times)[0], 0.0, 1.0))
+    return {"P(W>t)": _output(w, np.shape(t)), "P(Wq>t)": _output(wq, np.shape(t))}
+
+
+def mmsk_wait_quantiles(
+    lmbda: ArrayLike, mu: ArrayLike, s: ArrayLike, K: ArrayLike, quantiles: ArrayLike
+) -> Dict[str, Any]:
+    """
+    Quantis de Wq e W de um cliente aceito no M/M/s/K (bloqueados nao entram).
+    Cada conjunto de parametros monta sua mistura uma vez; todas as
+    probabilidades sao resolvidas juntas.
+    """
+    probs = quantile_probabilities(quantiles)
+    lmbda, mu, s, K = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (lmbda, mu, s, K)))
+    shape = lmbda.shape + np.shape(quantiles)
+    wq = np.zeros((lmbda.size, probs.size))
+    w = np.zeros((lmbda.size, probs.size))
+    for row, (lm, m, servers, capacity) in enumerate(zip(lmbda.ravel(), mu.ravel(), s.ravel(), K.ravel())):
+        if lm > 0:
+            wq[row], w[row] = _FiniteWait(lm, m, int(servers), int(capacity)).quantiles(probs)
+    return {"Wq_quantiles": _output(wq, shape), "W_quantiles": _output(w, shape)}
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List
 
 from calculator import MODEL_MAP, calculate
+from models.pn_utils import PnDistribution
 
 
 @dataclass
@@ -51,6 +52,28 @@ MODEL_CONFIG: Dict[str, Dict[str, Any]] = {
             ),
         ],
     },
+    "M/M/S+M": {
+        "description": "Fila M/M/s com abandono (Erlang-A): clientes desistem apos uma paciencia exponencial.",
+        "fields": [
+            InputField("lmbda", "Taxa de chegada (lambda)", placeholder="ex: 120"),
+            InputField("mu", "Taxa de servico (mu)", placeholder="ex: 10"),
+            InputField("s", "Numero de servidores (s)", field_type="int", placeholder="ex: 11"),
+            InputField(
+                "theta",
+                "Taxa de abandono (theta = 1 / paciencia media)",
+                placeholder="ex: 6",
+                help_text="Mesma unidade de λ e μ. Ex: paciencia media de 10 min com λ por hora -> theta = 6.",
+            ),
+            InputField("n", "n (probabilidade Pn)", field_type="int", required=False, placeholder="opcional"),
+            InputField(
+                "t",
+                "t (tempo para P(Wq>t)) [mesma unidade de λ e μ]",
+                field_type="float",
+                required=False,
+                placeholder="ex: 0.05 (3 min se λ, μ em horas)",
+            ),
+        ],
+    },
     "M/M/1/K": {
         "description": "Fila M/M/1 com capacidade total K (incluindo o cliente em servico).",
         "fields": [
@@ -90,44 +113,97 @@ MODEL_CONFIG: Dict[str, Dict[str, Any]] = {
         ],
     },
     "PRIORIDADE_PREEMPTIVA_3X3": {
-        "description": "Modelo com prioridades com interrupcao (preemptivo), 1 a 3 classes e ate 3 canais.",
+        "description": "Modelo com prioridades com interrupcao (preemptivo), qualquer numero de classes e canais.",
         "fields": [
             InputField(
                 "arrival_rates",
-                "Taxas de chegada por prioridade (1 a 3 classes)",
+                "Taxas de chegada por prioridade",
                 field_type="list_float",
                 placeholder="ex: 0.2, 0.6, 1.2",
-                help_text="Informe entre uma e tres taxas (classe 1 = maior prioridade).",
+                help_text="Informe uma taxa por classe (classe 1 = maior prioridade).",
             ),
             InputField("mu", "Taxa de servico (mu)", placeholder="ex: 3"),
             InputField(
                 "s",
-                "Numero de servidores (1 a 3)",
+                "Numero de servidores (s)",
                 field_type="int",
                 default=3,
                 placeholder="ex: 3",
-                help_text="Use entre 1 e 3 canais (exemplo da aula usa 3).",
+                help_text="Qualquer s >= 1 (exemplo da aula usa 3).",
             ),
         ],
     },
     "PRIORIDADE_NAO_PREEMPTIVA_3X3": {
-        "description": "Modelo com prioridades sem interrupcao (nao preemptivo), 1 a 3 classes e ate 3 canais.",
+        "description": "Modelo com prioridades sem interrupcao (nao preemptivo), qualquer numero de classes e canais.",
         "fields": [
             InputField(
                 "arrival_rates",
-                "Taxas de chegada por prioridade (1 a 3 classes)",
+                "Taxas de chegada por prioridade",
                 field_type="list_float",
                 placeholder="ex: 0.2, 0.6, 1.2",
-                help_text="Informe entre uma e tres taxas (classe 1 = maior prioridade).",
+                help_text="Informe uma taxa por classe (classe 1 = maior prioridade).",
             ),
             InputField("mu", "Taxa de servico (mu)", placeholder="ex: 3"),
             InputField(
                 "s",
-                "Numero de servidores (1 a 3)",
+                "Numero de servidores (s)",
                 field_type="int",
                 default=3,
                 placeholder="ex: 3",
-                help_text="Use entre 1 e 3 canais (exemplo da aula usa 3).",
+                help_text="Qualquer s >= 1 (exemplo da aula usa 3).",
+            ),
+        ],
+    },
+    "G/G/1": {
+        "description": "Fila G/G/1 aproximada (Kingman) a partir da variabilidade de chegadas e servico.",
+        "fields": [
+            InputField("lmbda", "Taxa de chegada (lambda)", placeholder="ex: 8"),
+            InputField("mu", "Taxa de servico (mu)", placeholder="ex: 2"),
+            InputField(
+                "ca2",
+                "ca² (variabilidade das chegadas)",
+                default=1.0,
+                help_text="Quadrado do coeficiente de variacao entre chegadas (1 = Poisson; > 1 = em rajadas).",
+            ),
+            InputField(
+                "cs2",
+                "cs² (variabilidade do servico)",
+                default=1.0,
+                help_text="Quadrado do coeficiente de variacao do servico (1 = exponencial, 0 = deterministico).",
+            ),
+            InputField(
+                "approximation",
+                "Aproximacao",
+                field_type="select",
+                options=["kingman", "allen-cunneen", "whitt"],
+                default="kingman",
+            ),
+        ],
+    },
+    "G/G/S": {
+        "description": "Fila G/G/s aproximada (Allen-Cunneen, Kingman-Sakasegawa ou Whitt) sobre o Erlang C.",
+        "fields": [
+            InputField("lmbda", "Taxa de chegada (lambda)", placeholder="ex: 8"),
+            InputField("mu", "Taxa de servico (mu)", placeholder="ex: 2"),
+            InputField("s", "Numero de servidores (s)", field_type="int", placeholder="ex: 5"),
+            InputField(
+                "ca2",
+                "ca² (variabilidade das chegadas)",
+                default=1.0,
+                help_text="Quadrado do coeficiente de variacao entre chegadas (1 = Poisson; > 1 = em rajadas).",
+            ),
+            InputField(
+                "cs2",
+                "cs² (variabilidade do servico)",
+                default=1.0,
+                help_text="Quadrado do coeficiente de variacao do servico (1 = exponencial, 0 = deterministico).",
+            ),
+            InputField(
+                "approximation",
+                "Aproximacao",
+                field_type="select",
+                options=["allen-cunneen", "kingman", "whitt"],
+                default="allen-cunneen",
             ),
         ],
     },
@@ -166,9 +242,11 @@ METRIC_LABELS: Dict[str, str] = {
     "lambda_total": "Taxa total de chegada",
     "P(any_idle_server)": "Probabilidade de haver servidor ocioso",
     "L_operational": "Numero medio operando",
+    "P(wait)": "Probabilidade de esperar",
+    "P(abandon)": "Probabilidade de abandono",
 }
 
-PROBABILITY_KEYS = {"p0", "pn", "pK", "P(W>t)", "P(Wq>t)", "P(any_idle_server)", "P(wait)"}
+PROBABILITY_KEYS = {"p0", "pn", "pK", "P(W>t)", "P(Wq>t)", "P(any_idle_server)", "P(wait)", "P(abandon)"}
 TIME_KEYS = {"W", "Wq"}
 
 
@@ -296,7 +374,7 @@ def display_results(model_key: str, result: Dict[str, Any]) -> None:
     scalar_items = {}
     nested_items = {}
     for key, value in result.items():
-        if isinstance(value, (dict, list)):
+        if isinstance(value, (dict, list, PnDistribution)):
             nested_items[key] = value
         else:
             scalar_items[key] = value
@@ -315,6 +393,8 @@ def display_results(model_key: str, result: Dict[str, Any]) -> None:
 
     if "pn_distribution" in nested_items:
         pn_dist = nested_items.pop("pn_distribution")
+        if isinstance(pn_dist, PnDistribution):
+            pn_dist = pn_dist.to_dict()
         dist_rows = [
             {"n": state, "Pn": format_result_value("pn", prob)} for state, prob in pn_dist.items()
         ]
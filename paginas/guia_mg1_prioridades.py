@@ -52,7 +52,7 @@ def show_mg1_priority_guide() -> None:
 """
     )
 
-    st.markdown("**Entradas no software:** lista de lambdas (ex.: 0.2, 0.6, 1.2), mu exponencial, servidores (normalmente 1, ate 3).")
+    st.markdown("**Entradas no software:** lista de lambdas (ex.: 0.2, 0.6, 1.2), mu exponencial, servidores (normalmente 1; qualquer s >= 1).")
     st.markdown("**Nao use se:** o enunciado diz sem interrupcao, o servidor nao pode parar no meio ou o caso for M/G/1 ou com populacao finita.")
 
     st.divider()
@@ -0,0 +1,266 @@
+"""
+Benchmarks de desempenho de todos os modelos de `calculator.MODEL_MAP` (e das
+versoes em lote) ao longo de eixos de escala: servidores s, capacidade K,
+populacao N, numero de classes e tamanho do lote.
+
+    python run_benchmarks.py --save bench_baseline.json        # grava a linha de base
+    python run_benchmarks.py --baseline bench_baseline.json    # falha se regredir
+    python run_benchmarks.py --quick --filter M/M/S            # subconjunto rapido
+    python run_benchmarks.py --cold-start --filter cold_start   # partida a frio
+
+Cada caso e medido como o menor tempo por chamada entre `--repeat` rodadas
+(cada rodada repete a chamada ate somar ~`--min-time` segundos). Um caso
+regride quando fica mais de `--threshold` (padrao 25%) mais lento que a base.
+Com `--cold-start`, mede tambem `import calculator` + o primeiro `calculate`
+em um interpretador novo, so com o M/M/1 e forcando a carga de todos os modelos.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numpy as np
+
+from calculator import BATCH_MODEL_MAP, MODEL_MAP, calculate, calculate_batch
+
+DEFAULT_THRESHOLD = 0.25
+
+# Roda em um interpretador novo: importa o nucleo e faz uma unica chamada
+_COLD_START_SCRIPT = """
+import time
+started = time.perf_counter()
+import calculator
+{preload}
+calculator.calculate("M/M/1", lmbda=1.0, mu=2.0)
+print(time.perf_counter() - started)
+"""
+COLD_START_CASES: Dict[str, str] = {
+    "cold_start|M/M/1": "",
+    # Equivale a importar todos os modelos de antemao (comportamento antes da carga sob demanda)
+    "cold_start|todos_os_modelos": "[calculator.MODEL_MAP[name] for name in calculator.MODEL_MAP]",
+}
+
+
+class BenchmarkCase(NamedTuple):
+    model: str
+    axis: str
+    size: int
+    func: Callable[[], Any]
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}|{self.axis}={self.size}"
+
+
+def _scalar_cases(quick: bool) -> List[BenchmarkCase]:
+    servers = [10, 100] if quick else [10, 100, 1000, 10_000]
+    capacities = [100, 10_000] if quick else [100, 10_000, 1_000_000]
+    classes = [3, 10] if quick else [3, 10, 100]
+
+    cases = [
+        BenchmarkCase("M/M/1", "n", 1, lambda: calculate("M/M/1", lmbda=3.0, mu=4.0, n=5, t=0.5)),
+        BenchmarkCase(
+            "M/G/1", "t", 1, lambda: calculate("M/G/1", lmbda=3.0, mu=4.0, service_distribution="deterministic")
+        ),
+    ]
+    for s in servers:
+        cases.append(
+            BenchmarkCase("M/M/S", "s", s, lambda s=s: calculate("M/M/S", lmbda=0.9 * s, mu=1.0, s=s, n=s, t=0.1))
+        )
+    for s in servers:
+        cases.append(
+            BenchmarkCase(
+                "M/M/S+M", "s", s, lambda s=s: calculate("M/M/S+M", lmbda=1.1 * s, mu=1.0, s=s, theta=0.5, t=0.1)
+            )
+        )
+    cases.append(BenchmarkCase("G/G/1", "n", 1, lambda: calculate("G/G/1", lmbda=3.0, mu=4.0, ca2=3.0, cs2=0.5)))
+    for s in servers:
+        cases.append(
+            BenchmarkCase(
+                "G/G/S",
+                "s",
+                s,
+                lambda s=s: calculate("G/G/S", lmbda=0.9 * s, mu=1.0, s=s, ca2=3.0, approximation="whitt"),
+            )
+        )
+    for K in capacities:
+        cases.append(BenchmarkCase("M/M/1/K", "K", K, lambda K=K: calculate("M/M/1/K", lmbda=0.9, mu=1.0, K=K)))
+        cases.append(
+            BenchmarkCase("M/M/S/K", "K", K, lambda K=K: calculate("M/M/S/K", lmbda=9.0, mu=1.0, s=10, K=K))
+        )
+        cases.append(BenchmarkCase("M/M/1/N", "N", K, lambda K=K: calculate("M/M/1/N", lmbda=0.5 / K, mu=1.0, N=K)))
+        cases.append(
+            BenchmarkCase("M/M/S/N", "N", K, lambda K=K: calculate("M/M/S/N", lmbda=5.0 / K, mu=1.0, s=10, N=K))
+        )
+    for s in servers:
+        cases.append(
+            BenchmarkCase("M/M/S/K", "s", s, lambda s=s: calculate("M/M/S/K", lmbda=0.9 * s, mu=1.0, s=s, K=2 * s))
+        )
+    for count in classes:
+        for model in ("PRIORIDADE_PREEMPTIVA_3X3", "PRIORIDADE_NAO_PREEMPTIVA_3X3"):
+            cases.append(
+                BenchmarkCase(
+                    model,
+                    "classes",
+                    count,
+                    lambda model=model, count=count: calculate(
+                        model, arrival_rates=[0.9 * 500 / count] * count, mu=1.0, s=500
+                    ),
+                )
+            )
+    return cases
+
+
+def _batch_cases(quick: bool) -> List[BenchmarkCase]:
+    sizes = [1000, 100_000] if quick else [1000, 100_000, 1_000_000]
+    params: Dict[str, Callable[[np.ndarray], Dict[str, Any]]] = {
+        "M/M/1": lambda lam: {"lmbda": lam, "mu": 1.0},
+        "M/M/S": lambda lam: {"lmbda": lam * 8, "mu": 1.0, "s": 10},
+        "M/M/1/K": lambda lam: {"lmbda": lam, "mu": 1.0, "K": 50},
+        "M/M/S/K": lambda lam: {"lmbda": lam * 8, "mu": 1.0, "s": 10, "K": 50},
+        "M/G/1": lambda lam: {"lmbda": lam, "mu": 1.0, "service_distribution": "exponential"},
+        "M/M/S+M": lambda lam: {"lmbda": lam * 12, "mu": 1.0, "s": 10, "theta": 0.5},
+        "G/G/1": lambda lam: {"lmbda": lam, "mu": 1.0, "ca2": 3.0, "cs2": 0.5},
+        "G/G/S": lambda lam: {"lmbda": lam * 8, "mu": 1.0, "s": 10, "ca2": 3.0, "approximation": "whitt"},
+    }
+    cases: List[BenchmarkCase] = []
+    for model in BATCH_MODEL_MAP:
+        for size in sizes:
+            loads = np.linspace(0.05, 0.95, size)
+            cases.append(
+                BenchmarkCase(
+                    f"batch:{model}",
+                    "rows",
+                    size,
+                    lambda model=model, kwargs=params[model](loads): calculate_batch(model, **kwargs),
+                )
+            )
+    return cases
+
+
+def build_cases(quick: bool = False) -> List[BenchmarkCase]:
+    cases = _scalar_cases(quick) + _batch_cases(quick)
+    covered = {case.model for case in cases}
+    missing = [model for model in MODEL_MAP if model not in covered]
+    if missing:
+        raise ValueError(f"Modelos sem benchmark: {', '.join(missing)}")
+    return cases
+
+
+def time_case(case: BenchmarkCase, repeat: int = 3, min_time: float = 0.2) -> float:
+    """Menor tempo medio por chamada entre `repeat` rodadas de ~min_time segundos."""
+    started = time.perf_counter()
+    case.func()
+    single = time.perf_counter() - started
+    number = max(1, int(min_time / single)) if single > 0 else 1000
+
+    best = single
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            case.func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def run(cases: List[BenchmarkCase], repeat: int = 3, min_time: float = 0.2, stream=sys.stdout) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for case in cases:
+        seconds = time_case(case, repeat=repeat, min_time=min_time)
+        results[case.name] = seconds
+        if stream is not None:
+            print(f"{case.name:<55} {seconds * 1e3:12.4f} ms", file=stream)
+    return results
+
+
+def cold_start(repeat: int = 5, names: List[str] | None = None, stream=sys.stdout) -> Dict[str, float]:
+    """Menor tempo de `import calculator` + primeiro `calculate` entre `repeat` processos novos."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    results: Dict[str, float] = {}
+    for name, preload in COLD_START_CASES.items():
+        if names is not None and name not in names:
+            continue
+        script = _COLD_START_SCRIPT.format(preload=preload)
+        runs = []
+        for _ in range(repeat):
+            process = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+            runs.append(float(process.stdout))
+        results[name] = min(runs)
+        if stream is not None:
+            print(f"{name:<55} {results[name] * 1e3:12.4f} ms", file=stream)
+    return results
+
+
+def compare(
+    current: Dict[str, float], baseline: Dict[str, float], threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """Casos presentes nas duas medicoes que ficaram mais de `threshold` mais lentos."""
+    regressions = []
+    for name, seconds in current.items():
+        reference = baseline.get(name)
+        if reference is None or reference <= 0:
+            continue
+        ratio = seconds / reference
+        if ratio > 1.0 + threshold:
+            regressions.append({"case": name, "baseline": reference, "current": seconds, "ratio": ratio})
+    return regressions
+
+
+def _metadata() -> Dict[str, Any]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks dos modelos de fila.")
+    parser.add_argument("--quick", action="store_true", help="Eixos menores (para CI)")
+    parser.add_argument("--filter", default="", help="Roda apenas casos cujo nome contem o texto")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Segundos por rodada")
+    parser.add_argument("--save", help="Grava os tempos em JSON (linha de base)")
+    parser.add_argument("--baseline", help="Compara com uma linha de base JSON")
+    parser.add_argument("--cold-start", action="store_true", help="Mede tambem a partida a frio")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regressao tolerada (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases(args.quick) if args.filter in case.name]
+    cold_names = [name for name in COLD_START_CASES if args.cold_start and args.filter in name]
+    if not cases and not cold_names:
+        parser.error("Nenhum caso corresponde ao filtro.")
+
+    results = run(cases, repeat=args.repeat, min_time=args.min_time)
+    if cold_names:
+        results.update(cold_start(repeat=max(args.repeat, 5), names=cold_names))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"meta": _metadata(), "results": results}, handle, indent=2, sort_keys=True)
+        print(f"Linha de base gravada em {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for item in regressions:
+            print(
+                f"[REGRESSAO] {item['case']}: {item['baseline'] * 1e3:.4f} ms -> "
+                f"{item['current'] * 1e3:.4f} ms ({item['ratio']:.2f}x)"
+            )
+        print(f"\nResumo: {len(results)} casos, {len(regressions)} regressoes.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Servico HTTP/JSON sem Streamlit para expor `calculator.calculate`.
+
+    python server.py --port 8000 --cache-size 4096
+
+Rotas:
+  GET  /health     -> {"status": "ok"}
+  GET  /models     -> modelos de MODEL_MAP e sinonimos aceitos
+  GET  /cache      -> contadores do cache de resultados
+  GET  /metrics    -> metricas de calculate em texto Prometheus (com --metrics)
+  POST /calculate  -> {"model": "M/M/S", "params": {"lmbda": 20, "mu": 12, "s": 3}}
+  POST /batch      -> {"requests": [{"model": ..., "params": {...}}, ...]}
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+from calculator import (
+    MODEL_ALIASES,
+    MODEL_MAP,
+    cache_stats,
+    enable_instrumentation,
+    enable_result_cache,
+    evaluate_request,
+    export_metrics,
+    instrumentation_stats,
+)
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _evaluate(request: Any) -> Tuple[int, Dict[str, Any]]:
+    """
+    (status HTTP, corpo) de um pedido. Uma excecao inesperada vira 500 com
+    {"error": ...} em vez de fechar a conexao sem resposta; no /batch ela fica
+    restrita ao item que a causou.
+    """
+    try:
+        outcome = evaluate_request(request)
+    except Exception as exc:
+        return 500, {"error": f"{type(exc).__name__}: {exc}"}
+    return (400 if "error" in outcome else 200), outcome
+
+
+class QueueTheoryHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantem a conexao aberta (keep-alive) entre pedidos do mesmo cliente
+    protocol_version = "HTTP/1.1"
+    # Sem Nagle: cabecalho e corpo pequenos nao esperam o ACK atrasado do cliente
+    disable_nagle_algorithm = True
+    server_version = "QueueTheory/1.0"
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        # allow_nan=False: NaN/Infinity nao sao JSON valido (to_jsonable ja os troca por null)
+        try:
+            text = json.dumps(payload, allow_nan=False)
+        except (TypeError, ValueError) as exc:
+            status, text = 500, json.dumps({"error": f"Resposta nao serializavel: {exc}"})
+        self._send_text(status, text, "application/json")
+
+    def _send_text(self, status: int, text: str, content_type: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Tuple[bool, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(400, {"error": "Corpo JSON ausente ou grande demais."})
+            return False, None
+        try:
+            return True, json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as exc:
+            self._send_json(400, {"error": f"JSON invalido: {exc.msg}"})
+            return False, None
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/models":
+            self._send_json(200, {"models": list(MODEL_MAP), "aliases": MODEL_ALIASES})
+        elif self.path == "/cache":
+            self._send_json(200, {"cache": cache_stats()})
+        elif self.path == "/metrics":
+            if instrumentation_stats() is None:
+                self._send_json(404, {"error": "Metricas desligadas; inicie com --metrics."})
+            else:
+                self._send_text(200, export_metrics("prometheus"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "Rota nao encontrada."})
+
+    def do_POST(self) -> None:
+        if self.path not in ("/calculate", "/batch"):
+            self._send_json(404, {"error": "Rota nao encontrada."})
+            return
+
+        ok, payload = self._read_json()
+        if not ok:
+            return
+
+        if self.path == "/calculate":
+            self._send_json(*_evaluate(payload))
+            return
+
+        requests = payload.get("requests") if isinstance(payload, dict) else None
+        if not isinstance(requests, list):
+            self._send_json(400, {"error": "Envie {'requests': [...]} para /batch."})
+            return
+        self._send_json(200, {"results": [_evaluate(item)[1] for item in requests]})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_size: int = 4096,
+    quiet: bool = True,
+    metrics: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Cria o servidor (ainda parado); `cache_size=0` desliga o cache de resultados
+    e `metrics=True` liga a instrumentacao exposta em /metrics.
+    """
+    if cache_size > 0:
+        enable_result_cache(maxsize=cache_size)
+    if metrics:
+        enable_instrumentation()
+    server = ThreadingHTTPServer((host, port), QueueTheoryHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servico HTTP/JSON da calculadora de filas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=4096, help="0 desliga o cache")
+    parser.add_argument("--verbose", action="store_true", help="Loga cada requisicao")
+    parser.add_argument("--metrics", action="store_true", help="Expoe metricas em /metrics")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.cache_size, quiet=not args.verbose, metrics=args.metrics)
+    print(f"Servindo em http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -178,8 +178,8 @@ def test_priority_non_preemptive():
 
 
 def test_priority_limits_and_single_class():
-    with pytest.raises(ValueError, match="<= 3"):
-        calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=[0.2, 0.6, 1.2], mu=3, s=4)
+    with pytest.raises(ValueError, match=">= 1"):
+        calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=[0.2, 0.6, 1.2], mu=3, s=0)
 
     single = calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=[0.5], mu=3, s=2)
     assert len(single["per_class"]) == 1
@@ -230,3 +230,742 @@ def test_priority_non_preemptive_s2_matches_slide_example():
     assert c3["Wq"] == pytest.approx(0.04808, abs=2e-3)
     assert c3["L"] == pytest.approx(0.45769, abs=4e-3)
     assert c3["Lq"] == pytest.approx(0.05769, abs=4e-3)
+
+
+def test_erlang_kernel_matches_factorial_formula():
+    from math import factorial
+
+    from models.erlang import erlang_b, erlang_c, erlang_c_from_b
+
+    a, s = 20 / 12, 3
+    rho = a / s
+    last = a**s / (factorial(s) * (1 - rho))
+    expected = last / (sum(a**k / factorial(k) for k in range(s)) + last)
+    assert erlang_c(a, s) == pytest.approx(expected, rel=1e-12)
+    assert erlang_c_from_b(a, s, erlang_b(a, s)) == pytest.approx(expected, rel=1e-12)
+
+
+def test_mms_large_server_pool_is_stable():
+    # s = 2000 estoura a**k/factorial(k) com floats; o nucleo de Erlang deve seguir finito
+    result = calculate("M/M/S", lmbda=1900, mu=1, s=2000, n=2010, t=0.01)
+    assert 0 < result["Lq"] < 1
+    assert result["L"] == pytest.approx(1900 + result["Lq"])
+    assert 0 <= result["P(Wq>t)"] <= 1
+
+    finite = calculate("M/M/S/K", lmbda=2100, mu=1, s=2000, K=2200)
+    assert 0 < finite["pK"] < 1
+    assert finite["lambda_eff"] < 2000
+
+
+def test_calculate_batch_matches_scalar_models_and_flags_unstable_rows():
+    import numpy as np
+
+    from calculator import calculate_batch
+
+    batch = calculate_batch("M/M/S", lmbda=np.array([20.0, 40.0, 95.0]), mu=12, s=np.array([3, 3, 10]))
+    assert list(batch["unstable"]) == [False, True, False]
+    assert np.isnan(batch["L"][1])
+    for row, lam, s in [(0, 20.0, 3), (2, 95.0, 10)]:
+        expected = calculate("M/M/S", lmbda=lam, mu=12, s=s)
+        for key in ("rho", "p0", "L", "Lq", "W", "Wq"):
+            assert batch[key][row] == pytest.approx(expected[key], rel=1e-9)
+
+    finite = calculate_batch("M/M/S/K", lmbda=[1, 50], mu=2, s=[2, 10], K=[3, 40])
+    for row, (lam, s, K) in enumerate([(1, 2, 3), (50, 10, 40)]):
+        expected = calculate("M/M/S/K", lmbda=lam, mu=2, s=s, K=K)
+        for key in ("p0", "L", "Lq", "W", "Wq", "pK", "lambda_eff"):
+            assert finite[key][row] == pytest.approx(expected[key], rel=1e-9, abs=1e-12)
+
+    mg1_rows = calculate_batch("M/G/1", lmbda=[3, 3], mu=4, service_distribution=["deterministic", "x"])
+    assert mg1_rows["Wq"][0] == pytest.approx(0.375)
+    assert list(mg1_rows["invalid"]) == [False, True]
+    mixed = calculate_batch("M/G/1", lmbda=[3] * 4, mu=4, service_distribution=["deterministic", 5, float("nan"), None])
+    assert list(mixed["invalid"]) == [False, True, True, False]
+
+
+def test_min_servers_returns_smallest_s_meeting_target():
+    from calculator import min_servers
+
+    staffed = min_servers("M/M/S", lmbda=95, mu=1, target="Wq", limit=0.05)
+    assert calculate("M/M/S", lmbda=95, mu=1, s=staffed["s"])["Wq"] <= 0.05
+    assert calculate("M/M/S", lmbda=95, mu=1, s=staffed["s"] - 1)["Wq"] > 0.05
+
+    tail = min_servers("M/M/S", lmbda=95, mu=1, target="P(Wq>t)", limit=0.2, t=0.1)
+    assert tail["P(Wq>t)"] == pytest.approx(
+        calculate("M/M/S", lmbda=95, mu=1, s=tail["s"], t=0.1)["P(Wq>t)"], rel=1e-9
+    )
+
+    blocking = min_servers("M/M/S/K", lmbda=50, mu=2, target="pK", limit=0.01, K=40)
+    assert blocking["pK"] == pytest.approx(
+        calculate("M/M/S/K", lmbda=50, mu=2, s=blocking["s"], K=40)["pK"], rel=1e-9
+    )
+    assert calculate("M/M/S/K", lmbda=50, mu=2, s=blocking["s"] - 1, K=40)["pK"] > 0.01
+
+    import time
+
+    import numpy as np
+
+    # K vindo de uma grade NumPy; metas abaixo do piso falham sem varrer max_servers
+    assert min_servers("M/M/S/K", lmbda=50, mu=2, target="pK", limit=0.01, K=np.int64(40)) == blocking
+    started = time.perf_counter()
+    for target, limit in (("W", 1.0), ("W", 0.5), ("Wq", 0.0), ("P(Wq>t)", 0.0)):
+        with pytest.raises(ValueError, match="inviavel"):
+            min_servers("M/M/S", lmbda=95, mu=1, target=target, limit=limit, t=0.1)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_result_cache_counts_hits_misses_and_evictions():
+    from calculator import cache_stats, disable_result_cache, enable_result_cache
+
+    enable_result_cache(maxsize=2, digits=9)
+    try:
+        first = calculate("M/M/1", lmbda=10.0, mu=15)
+        first["L"] = -1.0  # mutar o retorno nao pode contaminar o cache
+        again = calculate("mm1", lmbda=10.0000000000001, mu=15)
+        assert again["L"] == pytest.approx(2.0)
+
+        calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=[0.2, 0.6], mu=3, s=2)
+        calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=(0.2, 0.6), mu=3, s=2)
+        calculate("M/M/S", lmbda=20, mu=12, s=3)
+
+        assert cache_stats() == {"hits": 2, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+        with pytest.raises(ValueError):
+            calculate("M/M/S", lmbda=20, mu=12, s=3.0)
+        # O cache nao aceita o que o modelo rejeitaria sem ele
+        import numpy as np
+
+        with pytest.raises(ValueError):
+            calculate("M/M/S", lmbda=20, mu=12, s=np.int64(3))
+    finally:
+        disable_result_cache()
+    assert cache_stats() is None
+
+
+def test_pn_distribution_object_cdf_quantile_and_dict_conversion():
+    from itertools import accumulate
+
+    dist = calculate("M/M/S", lmbda=20, mu=12, s=3, n=5)["pn_distribution"]
+    cumulative = list(accumulate(dist[0:400]))
+    for q in (0.1, 0.5, 0.9, 0.99):
+        expected = next(k for k, value in enumerate(cumulative) if value >= q)
+        assert dist.quantile(q) == expected
+    assert dist.tail(5) == pytest.approx(1 - cumulative[5], abs=1e-12)
+    assert dist.cdf(5) == pytest.approx(cumulative[5], abs=1e-12)
+
+    as_dict = dist.to_dict()
+    assert list(as_dict) == ["0", "1", "2", "3", "4", "5", ">5"]
+    assert as_dict[">5"] == pytest.approx(dist.tail(5))
+
+    finite = calculate("M/M/S/K", lmbda=5, mu=2, s=3, K=10, n=4)["pn_distribution"]
+    assert finite.tail(4) == pytest.approx(sum(finite[5:]), rel=1e-12)
+    assert finite.quantile(1.0) == 10
+    assert finite[11] == 0.0
+
+
+def test_birth_death_kernel_handles_large_finite_capacities():
+    from calculator import calculate_batch
+
+    scalar = calculate("M/M/S/K", lmbda=1200, mu=1, s=1000, K=20000)
+    closed_form = calculate_batch("M/M/S/K", lmbda=1200, mu=1, s=1000, K=20000)
+    for key in ("pK", "L", "Lq", "lambda_eff"):
+        assert scalar[key] == pytest.approx(closed_form[key][0], rel=1e-8)
+
+    overloaded = calculate("M/M/1/K", lmbda=3, mu=2, K=5000)
+    assert overloaded["pK"] == pytest.approx(1 / 3, rel=1e-9)
+
+    population = calculate("M/M/S/N", lmbda=1, mu=2, s=10, N=2000)
+    assert population["lambda_eff"] == pytest.approx(20, rel=1e-6)
+
+
+def test_simulation_agrees_with_analytic_models():
+    from calculator import simulate
+
+    analytic = calculate("M/M/S/K", lmbda=5, mu=2, s=3, K=6)
+    simulated = simulate("M/M/S/K", lmbda=5, mu=2, s=3, K=6, horizon=2000, replications=5, seed=7)
+    assert simulated["replications"] == 5
+    for key in ("L", "W", "pK", "lambda_eff"):
+        low, high = simulated["confidence_intervals"][key]
+        assert low <= simulated[key] <= high
+        assert simulated[key] == pytest.approx(analytic[key], rel=0.1)
+
+    again = simulate("M/M/S/K", lmbda=5, mu=2, s=3, K=6, horizon=2000, replications=5, seed=7)
+    assert again["L"] == simulated["L"]
+
+    priority = simulate(
+        "PRIORIDADE_NAO_PREEMPTIVA_3X3", arrival_rates=[2, 1], mu=5, s=1, horizon=2000, replications=4
+    )
+    assert priority["per_class"][0]["Wq"] == pytest.approx(0.2, rel=0.15)
+    assert priority["per_class"][1]["Wq"] == pytest.approx(0.5, rel=0.15)
+
+
+def test_transient_solver_converges_to_steady_state():
+    import numpy as np
+
+    from calculator import calculate_transient
+
+    grid = np.array([0.0, 0.5, 2.0, 500.0])
+    transient = calculate_transient("M/M/S/K", times=grid, lmbda=5, mu=2, s=3, K=10)
+    assert transient["pn"].shape == (4, 11)
+    assert transient["pn"].sum(axis=1) == pytest.approx(np.ones(4), abs=1e-10)
+    assert transient["L"][0] == 0.0
+    assert np.all(np.diff(transient["L"]) > 0)
+
+    steady = calculate("M/M/S/K", lmbda=5, mu=2, s=3, K=10)
+    assert transient["L"][-1] == pytest.approx(steady["L"], rel=1e-8)
+    assert transient["pK"][-1] == pytest.approx(steady["pK"], rel=1e-8)
+
+    # M/M/1/1: P1(t) = lambda/(lambda+mu) * (1 - e^{-(lambda+mu)t})
+    single = calculate_transient("M/M/1/K", times=[0.3], lmbda=1, mu=2, K=1)
+    assert single["pK"][0] == pytest.approx((1 / 3) * (1 - np.exp(-0.9)), rel=1e-10)
+
+    population = calculate_transient("M/M/1/N", times=[1000.0], lmbda=1, mu=2, N=2, initial_state=2)
+    assert population["L"][0] == pytest.approx(0.8, rel=1e-8)
+
+    from models.transient import solve_transient
+
+    # Cadeia lenta (um estado rapido domina Lambda): passos minusculos longe do equilibrio
+    births = np.r_[np.ones(50), 0.0]
+    deaths = np.r_[0.0, np.ones(49), 200.0]
+    loose = solve_transient(births, deaths, [10.0], 0, tol=2e-2) @ np.arange(51)
+    exact = solve_transient(births, deaths, [10.0], 0, tol=0.0) @ np.arange(51)
+    assert loose[0] == pytest.approx(exact[0], rel=1e-10)
+    assert exact[0] > 2
+
+
+def test_http_service_calculate_and_batch():
+    import http.client
+    import json
+    import threading
+
+    from calculator import disable_result_cache
+    from server import make_server
+
+    server = make_server(port=0, cache_size=16)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+        def post(path, payload):
+            conn.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+
+        status, body = post("/calculate", {"model": "mm1", "params": {"lmbda": 1, "mu": 2, "n": 1}})
+        assert status == 200
+        assert body["result"]["pn_distribution"][">1"] == pytest.approx(0.25)
+
+        status, body = post("/calculate", {"model": "M/M/1", "params": {"lmbda": 3, "mu": 2}})
+        assert status == 400
+        assert "Sistema instavel" in body["error"]
+
+        # mesma conexao (keep-alive) para o lote
+        status, body = post(
+            "/batch",
+            {"requests": [{"model": "M/M/S", "params": {"lmbda": 20, "mu": 12, "s": 3}}, {"model": "XYZ"}]},
+        )
+        assert status == 200
+        assert body["results"][0]["result"]["L"] == pytest.approx(2.0413, abs=1e-3)
+        assert body["results"][1] == {"error": "Modelo nao implementado"}
+
+        # Um item que quebra dentro do modelo nao derruba a conexao nem o lote
+        bad = {"model": "M/G/1", "params": {"lmbda": 1, "mu": 2, "service_distribution": 5}}
+        status, body = post("/calculate", bad)
+        assert status in (400, 500) and "error" in body
+        status, body = post("/batch", {"requests": [{"model": "MM1", "params": {"lmbda": 1, "mu": 2}}, bad]})
+        assert status == 200
+        assert body["results"][0]["result"]["L"] == pytest.approx(1.0) and "error" in body["results"][1]
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        disable_result_cache()
+
+
+def test_to_jsonable_maps_non_finite_values_to_null():
+    import json
+
+    import numpy as np
+
+    from calculator import to_jsonable
+
+    converted = to_jsonable({"x": float("nan"), "y": np.array([1.0, np.inf]), "z": (np.float64(-np.inf), 2)})
+    assert converted == {"x": None, "y": [1.0, None], "z": [None, 2]}
+    json.dumps(converted, allow_nan=False)
+
+
+def test_batch_runner_streams_results_and_errors():
+    import io
+    import json
+
+    from batch_runner import run
+
+    source = io.StringIO(
+        '{"id": "a", "model": "M/M/1", "params": {"lmbda": 1, "mu": 2}}\n'
+        "\n"
+        "nao e json\n"
+        '{"model": "M/M/1", "params": {"lmbda": 3, "mu": 2}}\n'
+    )
+    sink = io.StringIO()
+    stats = run(source, sink, window=2)
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [line["line"] for line in lines] == [1, 3, 4]
+    assert lines[0]["id"] == "a"
+    assert lines[0]["result"]["L"] == pytest.approx(1.0)
+    assert "error" in lines[1] and "error" in lines[2]
+    assert stats["records"] == 3 and stats["errors"] == 2
+    assert stats["latency_p50_s"] <= stats["latency_max_s"]
+
+    # Registro malformado entre dois validos: vira erro na propria linha e o lote segue
+    source = io.StringIO(
+        '{"model": "M/M/1", "params": {"lmbda": 1, "mu": 2}}\n'
+        '{"model": "M/G/1", "params": {"lmbda": 1, "mu": 2, "service_distribution": 5}}\n'
+        '{"id": NaN, "model": "M/M/1", "params": {"lmbda": 1, "mu": 4}}\n'
+    )
+    sink = io.StringIO()
+    run(source, sink)
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert len(lines) == 3
+    assert "service_distribution" in lines[1]["error"]
+    assert lines[0]["result"]["L"] == pytest.approx(1.0) and lines[2]["result"]["L"] == pytest.approx(1 / 3)
+    assert lines[2]["id"] is None
+
+
+def test_mg1_general_service_tails_and_quantiles():
+    import numpy as np
+
+    # Momentos exponenciais: caudas e quantis devem bater com a forma fechada do M/M/1
+    times = np.array([0.0, 0.5, 2.0])
+    result = calculate("M/G/1", lmbda=3, ES=0.25, ES2=0.125, ES3=6 / 4**3, t=times, quantiles=[0.5, 0.9])
+    assert result["Wq"] == pytest.approx(0.75)
+    assert result["P(W>t)"] == pytest.approx(np.exp(-times), abs=1e-8)
+    assert result["P(Wq>t)"] == pytest.approx(0.75 * np.exp(-times), abs=1e-8)
+    assert result["W_quantiles"] == pytest.approx(-np.log([0.5, 0.1]), rel=1e-6)
+    assert result["Var(Wq)"] == pytest.approx(0.9375)
+
+    # Amostra empirica de um servico deterministico equivale ao preset "deterministic"
+    sampled = calculate("M/G/1", lmbda=3, service_samples=[0.25] * 50, t=1.0)
+    preset = calculate("M/G/1", lmbda=3, mu=4, service_distribution="deterministic", t=1.0)
+    assert sampled["Wq"] == pytest.approx(preset["Wq"])
+    assert sampled["P(Wq>t)"] == pytest.approx(preset["P(Wq>t)"])
+    assert preset["P(Wq>t)"] == pytest.approx(0.092205, abs=1e-5)
+
+    with pytest.raises(ValueError):
+        calculate("M/G/1", lmbda=3, ES=0.25, ES2=0.01)
+
+
+def test_estimate_parameters_streams_csv_log():
+    import os
+    import tempfile
+
+    from models import estimate_parameters
+
+    # Fila FCFS de um servidor: chegadas a cada 2s, servicos alternando 1s e 3s
+    rows = ["arrival,completion,prioridade"]
+    completion = 0.0
+    for idx in range(8):
+        arrival = 2.0 * idx
+        completion = max(arrival, completion) + (1.0 if idx % 2 == 0 else 3.0)
+        rows.append(f"{arrival},{completion},{1 if idx < 6 else 2}")
+    with tempfile.TemporaryDirectory() as folder:
+        log = os.path.join(folder, "log.csv")
+        with open(log, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(rows) + "\n")
+        fit = estimate_parameters(log, class_col="prioridade", chunk_rows=3)
+        with open(log, "a", encoding="utf-8") as handle:
+            handle.write("16.0,19.0\n")  # linha curta: falta a coluna da classe
+        with pytest.raises(ValueError, match="Linha 10"):
+            estimate_parameters(log, class_col="prioridade")
+
+        # Log so com chegada e duracao: a coluna de conclusao padrao nao e exigida
+        durations = os.path.join(folder, "duracoes.csv")
+        with open(durations, "w", encoding="utf-8") as handle:
+            handle.write("arrival,duration\n" + "".join(f"{2.0 * idx},{1 + 2 * (idx % 2)}\n" for idx in range(8)))
+        by_duration = estimate_parameters(durations, service_col="duration")
+        assert by_duration["ES"] == pytest.approx(2.0) and "W_observed" not in by_duration
+
+    assert fit["n"] == 8
+    assert fit["lmbda"] == pytest.approx(0.5)
+    assert fit["ES"] == pytest.approx(2.0)
+    assert fit["ES2"] == pytest.approx(5.0)
+    assert fit["mu"] == pytest.approx(0.5)
+    assert fit["ca2"] == pytest.approx(0.0)
+    # Taxas por classe usam o mesmo estimador de lmbda e somam a taxa total
+    assert fit["arrival_rates"] == pytest.approx([0.5 * 6 / 8, 0.5 * 2 / 8])
+    assert sum(fit["arrival_rates"]) == pytest.approx(fit["lmbda"])
+
+    result = calculate("M/G/1", lmbda=0.4, ES=fit["ES"], ES2=fit["ES2"])
+    assert result["rho"] == pytest.approx(0.8)
+
+
+def test_priority_models_scale_to_many_classes_and_servers():
+    from models.mms import mms
+
+    rates = [0.9 * 500 / 40] * 40
+    preemptive = calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=rates, mu=1, s=500)
+    aggregate = mms(sum(rates), 1, 500)
+    assert len(preemptive["per_class"]) == 40
+    assert preemptive["Wq"] == pytest.approx(aggregate["Wq"], rel=1e-9)
+    assert preemptive["p0"] == pytest.approx(aggregate["p0"], rel=1e-9)
+    # Conservacao: a media ponderada dos W por classe e o W agregado
+    weighted = sum(c["lambda"] * c["W"] for c in preemptive["per_class"]) / sum(rates)
+    assert weighted == pytest.approx(aggregate["W"], rel=1e-9)
+    waits = [c["Wq"] for c in preemptive["per_class"]]
+    assert waits == sorted(waits)
+
+    non_preemptive = calculate("PRIORIDADE_NAO_PREEMPTIVA_3X3", arrival_rates=rates, mu=1, s=500)
+    assert non_preemptive["per_class"][-1]["Wq"] > non_preemptive["per_class"][0]["Wq"]
+
+
+def test_jackson_network_tandem_and_feedback():
+    from calculator import calculate_network
+
+    tandem = calculate_network(
+        external_rates=[2, 0, 0],
+        routing=[[0, 1, 0], [0, 0, 1], [0, 0, 0]],
+        nodes=[{"model": "MM1", "mu": 4}, {"model": "M/M/S", "mu": 3, "s": 1}, {"model": "M/M/1", "mu": 5}],
+    )
+    assert list(tandem["lambda"]) == pytest.approx([2, 2, 2])
+    assert tandem["W_total"] == pytest.approx(1 / 2 + 1 / 1 + 1 / 3)
+    assert tandem["L_total"] == pytest.approx(2 * tandem["W_total"])
+    assert tandem["bottleneck"] == 1
+
+    # Retorno com prob. 0.5: lambda = 1 / (1 - 0.5), duas visitas em media
+    feedback = calculate_network([1], [[0.5]], {"model": "M/M/1", "mu": 4})
+    assert feedback["lambda"][0] == pytest.approx(2.0)
+    assert feedback["W_total"] == pytest.approx(2 * 1 / (4 - 2))
+
+    with pytest.raises(ValueError):
+        calculate_network([1], [[1.0]], {"model": "M/M/1", "mu": 4})
+
+    # No com bloqueio em retorno: ponto fixo iterado; sem convergencia levanta erro
+    blocking = {"model": "M/M/1/K", "mu": 4, "K": 3}
+    converged = calculate_network([3], [[0.5]], blocking)
+    assert converged["lambda"][0] == pytest.approx(3 / (1 - 0.5 * (1 - converged["nodes"][0]["pK"])))
+    with pytest.raises(ValueError, match="nao convergiu"):
+        calculate_network([3], [[0.5]], blocking, max_iter=5)
+    # tol frouxo converge nas mesmas 5 iteracoes que a tolerancia padrao nao alcanca
+    loose = calculate_network([3], [[0.5]], blocking, tol=1e-2, max_iter=5)
+    assert loose["lambda"][0] == pytest.approx(converged["lambda"][0], rel=1e-2)
+
+
+def test_mva_matches_finite_population_and_multiclass():
+    from calculator import calculate_closed_network
+
+    # M/M/3/20 e uma rede fechada: estacao com 3 servidores + tempo de "pensar" 1/lambda
+    reference = calculate("M/M/S/N", lmbda=0.3, mu=2, s=3, N=20)
+    network = calculate_closed_network([{"mu": 2, "s": 3}], N=20, think_time=1 / 0.3)
+    for key in ("L", "W", "lambda_eff", "L_operational"):
+        assert network[key] == pytest.approx(reference[key], rel=1e-9)
+    assert network["rho"][0] == pytest.approx(reference["rho"], rel=1e-9)
+    assert len(network["by_population"]["lambda_eff"]) == 20
+
+    # Duas classes identicas somam a mesma vazao que uma classe com a populacao total
+    stations = [{"mu": 2}, {"mu": 3, "visits": 2}, {"type": "delay", "mu": 1}]
+    single = calculate_closed_network(stations, N=6)
+    split = calculate_closed_network(stations, N=[3, 3])
+    assert sum(split["lambda_eff"]) == pytest.approx(single["lambda_eff"])
+
+    approx = calculate_closed_network(stations, N=[3, 3], method="schweitzer")
+    assert sum(approx["lambda_eff"]) == pytest.approx(single["lambda_eff"], rel=0.05)
+
+
+def test_benchmark_harness_covers_models_and_flags_regressions():
+    from calculator import MODEL_MAP
+    from run_benchmarks import build_cases, compare, time_case
+
+    cases = build_cases(quick=True)
+    assert set(MODEL_MAP) <= {case.model for case in cases}
+    assert time_case(cases[0], repeat=1, min_time=0.001) > 0
+
+    baseline = {"a": 1.0, "b": 1.0}
+    regressions = compare({"a": 1.2, "b": 1.5, "c": 9.0}, baseline, threshold=0.25)
+    assert [item["case"] for item in regressions] == ["b"]
+
+
+def test_instrumentation_counts_latency_errors_and_exports():
+    import json
+
+    from calculator import disable_instrumentation, enable_instrumentation, export_metrics, instrumentation_stats
+
+    metrics = enable_instrumentation(slowest=2, profile_every=2)
+    try:
+        for lmbda in (1, 2, 3):
+            calculate("M/M/1", lmbda=lmbda, mu=4)
+        with pytest.raises(ValueError):
+            calculate("M/M/1", lmbda=5, mu=4)
+
+        stats = instrumentation_stats()["M/M/1"]
+        assert stats["calls"] == 4
+        assert stats["errors"] == 1
+        assert list(stats["errors_by_message"].values()) == [1]
+        assert stats["latency_histogram"]["+Inf"] == 4
+        assert len(stats["slowest"]) == 2
+        assert "lmbda=" in stats["slowest"][0]["params"]
+
+        text = export_metrics("prometheus")
+        assert 'queue_calculate_calls_total{model="M/M/1"} 4' in text
+        assert 'queue_calculate_latency_seconds_bucket{model="M/M/1",le="+Inf"} 4' in text
+        assert json.loads(export_metrics("json"))["M/M/1"]["calls"] == 4
+        assert "mm1" in metrics.profile_report()
+    finally:
+        disable_instrumentation()
+    assert instrumentation_stats() is None
+
+
+def test_inverse_solvers_hit_the_target_metric():
+    from calculator import max_lambda, min_mu
+
+    sized = max_lambda("MMS", target="Wq", limit=20, mu=1 / 300, s=40)
+    assert calculate("M/M/S", lmbda=sized["lmbda"], mu=1 / 300, s=40)["Wq"] == pytest.approx(20, rel=1e-9)
+
+    tail = max_lambda("M/M/S", target="P(Wq>t)", limit=0.2, mu=1.0, s=5, t=1.0)
+    assert calculate("M/M/S", lmbda=tail["lmbda"], mu=1.0, s=5, t=1.0)["P(Wq>t)"] == pytest.approx(0.2, rel=1e-9)
+
+    blocking = min_mu("M/M/S/K", target="pK", limit=0.01, lmbda=8, s=10, K=20)
+    assert calculate("M/M/S/K", lmbda=8, mu=blocking["mu"], s=10, K=20)["pK"] == pytest.approx(0.01, rel=1e-9)
+
+    # M/D/1: Wq = lambda / (2 mu (mu - lambda)) = 2 -> lambda = 0.8
+    deterministic = max_lambda("M/G/1", target="Wq", limit=2, mu=1, service_distribution="deterministic")
+    assert deterministic["lmbda"] == pytest.approx(0.8)
+
+    per_class = max_lambda(
+        "PRIORIDADE_PREEMPTIVA_3X3", target="W", limit=2, mu=1, s=3, arrival_rates=[1, 2, 1], priority_class=3
+    )
+    scaled = calculate("PRIORIDADE_PREEMPTIVA_3X3", arrival_rates=per_class["arrival_rates"], mu=1, s=3)
+    assert scaled["per_class"][2]["W"] == pytest.approx(2, rel=1e-9)
+    assert per_class["arrival_rates"][1] == pytest.approx(2 * per_class["arrival_rates"][0])
+
+    with pytest.raises(ValueError, match="Nenhuma taxa"):
+        max_lambda("M/M/1", target="W", limit=0.5, mu=1)
+
+
+def test_single_model_cold_start_skips_numpy_and_streamlit():
+    import os
+    import subprocess
+    import sys
+
+    from run_benchmarks import cold_start
+
+    script = (
+        "import sys, calculator\n"
+        "calculator.calculate('M/M/1', lmbda=1, mu=2)\n"
+        "print(sorted(name for name in ('numpy', 'streamlit', 'models.batch') if name in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    loaded = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+    assert loaded.stdout.strip() == "[]"
+
+    times = cold_start(repeat=1, stream=None)
+    assert set(times) == {"cold_start|M/M/1", "cold_start|todos_os_modelos"}
+    assert all(value > 0 for value in times.values())
+
+
+def test_cost_curve_matches_model_calls_and_finds_optimum():
+    from calculator import cost_curve
+
+    curve = cost_curve("MMS", server_cost=20, waiting_cost=35, lmbda=9, mu=1, s_max=20)
+    assert list(curve["s"]) == list(range(1, 21))
+    for s in (10, 14, 20):
+        L = calculate("M/M/S", lmbda=9, mu=1, s=s)["L"]
+        assert curve["total_cost"][s - 1] == pytest.approx(20 * s + 35 * L, rel=1e-12)
+    assert curve["total_cost"][8] == float("inf")  # s = 9 e instavel
+    best = curve["optimal_s"]
+    assert curve["optimal_cost"] == min(curve["total_cost"])
+    assert cost_curve("M/M/S", server_cost=20, waiting_cost=35, lmbda=9, mu=1)["optimal_s"] == best
+
+    blocking = cost_curve("M/M/S/K", server_cost=5, waiting_cost=1, metric="Lq", lmbda=12, mu=1, K=30)
+    reference = calculate("M/M/S/K", lmbda=12, mu=1, s=13, K=30)
+    assert blocking["Lq"][12] == pytest.approx(reference["Lq"], rel=1e-10)
+    assert blocking["pK"][12] == pytest.approx(reference["pK"], rel=1e-10)
+
+    finite = cost_curve("M/M/S/N", server_cost=5, waiting_cost=2, lmbda=0.1, mu=1, N=40)
+    assert finite["L"][3] == pytest.approx(calculate("M/M/S/N", lmbda=0.1, mu=1, s=4, N=40)["L"], rel=1e-10)
+
+    rates = [1.0, 0.5, 2.0]
+    priority = cost_curve(
+        "PRIORIDADE_NAO_PREEMPTIVA_3X3",
+        server_cost=10,
+        waiting_cost=[50, 20, 5],
+        mu=1,
+        arrival_rates=rates,
+        s_max=8,
+    )
+    per_class = calculate("PRIORIDADE_NAO_PREEMPTIVA_3X3", arrival_rates=rates, mu=1, s=5)["per_class"]
+    expected = sum(cost * cls["L"] for cost, cls in zip([50, 20, 5], per_class))
+    assert priority["waiting_cost"][4] == pytest.approx(expected, rel=1e-12)
+
+
+def test_prepared_model_matches_calculate():
+    import subprocess
+    import sys
+
+    from calculator import prepare
+
+    mms = prepare("MMS", lmbda=9, mu=1, s=12)
+    assert mms["Wq"] == pytest.approx(calculate("M/M/S", lmbda=9, mu=1, s=12)["Wq"], rel=1e-12)
+    probs = mms.pn_array(range(40))
+    for n in (0, 5, 12, 39):
+        assert probs[n] == pytest.approx(calculate("M/M/S", lmbda=9, mu=1, s=12, n=n)["pn"], rel=1e-12)
+    tails = mms.wq_tail([0.0, 0.5, 2.0])
+    for t, value in zip([0.0, 0.5, 2.0], tails):
+        reference = calculate("M/M/S", lmbda=9, mu=1, s=12, t=t)
+        assert value == pytest.approx(reference["P(Wq>t)"], rel=1e-12)
+        assert mms.w_tail(t) == pytest.approx(reference["P(W>t)"], rel=1e-12)
+
+    finite = prepare("M/M/S/K", lmbda=9, mu=1, s=5, K=30)
+    assert finite.pn(30) == pytest.approx(calculate("M/M/S/K", lmbda=9, mu=1, s=5, K=30)["pK"], rel=1e-12)
+    assert finite.pn(31) == 0.0
+
+    with pytest.raises(AttributeError):
+        mms.params = {}
+    with pytest.raises(ValueError):
+        prepare("M/G/1", lmbda=0.5, mu=1).pn(1)
+
+    # importar um submodulo pelo caminho direto nao pode esconder a funcao do MODEL_MAP
+    code = "import models.network, calculator; print(calculator.calculate('M/M/1', lmbda=1, mu=2)['L'])"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert float(result.stdout) == pytest.approx(1.0)
+
+
+def test_waiting_time_quantiles_invert_tails():
+    import math
+
+    import numpy as np
+
+    from calculator import calculate_batch
+
+    probs = [0.5, 0.95, 0.99]
+    mms = calculate("M/M/S", lmbda=9, mu=1, s=12, quantiles=probs)
+    for p, wq, w in zip(probs, mms["Wq_quantiles"], mms["W_quantiles"]):
+        tails = calculate("M/M/S", lmbda=9, mu=1, s=12, t=float(w))
+        assert tails["P(W>t)"] == pytest.approx(1 - p, rel=1e-10)
+        if wq > 0:
+            assert calculate("M/M/S", lmbda=9, mu=1, s=12, t=float(wq))["P(Wq>t)"] == pytest.approx(1 - p, rel=1e-10)
+    mm1 = calculate("M/M/1", lmbda=0.9, mu=1, quantiles=0.99)
+    assert mm1["W_quantiles"] == pytest.approx(math.log(100) / 0.1, rel=1e-12)
+
+    # M/M/S/K com K grande se aproxima do M/M/S; a media da cauda reproduz W (Little)
+    finite = calculate("M/M/S/K", lmbda=9, mu=1, s=12, K=400, quantiles=probs)
+    assert finite["W_quantiles"] == pytest.approx(mms["W_quantiles"], rel=1e-9)
+    blocked = calculate("M/M/S/K", lmbda=9, mu=1, s=3, K=20, t=[0.0, 5.0], quantiles=0.9)
+    assert blocked["P(W>t)"][0] == 1.0
+    times = np.linspace(0, 80, 20001)
+    tails = calculate("M/M/S/K", lmbda=9, mu=1, s=3, K=20, t=times)["P(W>t)"]
+    # Trapezios a mao: np.trapezoid so existe a partir do NumPy 2.0 (requirements aceita 1.24)
+    area = float(np.sum((tails[1:] + tails[:-1]) * np.diff(times))) / 2
+    assert area == pytest.approx(blocked["W"], rel=1e-6)
+    idle = calculate("M/M/S/K", lmbda=0, mu=1, s=3, K=20, t=[0.0, 5.0])
+    assert np.shape(idle["P(W>t)"]) == np.shape(blocked["P(W>t)"]) == (2,)
+    at_quantile = calculate("M/M/S/K", lmbda=9, mu=1, s=3, K=20, t=blocked["W_quantiles"])
+    assert at_quantile["P(W>t)"] == pytest.approx(0.1, rel=1e-10)
+
+    sweep = calculate_batch("M/M/S", lmbda=9, mu=1, s=np.arange(8, 16), quantiles=probs)
+    assert sweep["W_quantiles"].shape == (8, 3)
+    assert np.isnan(sweep["W_quantiles"][:2]).all()  # s = 8, 9 instaveis
+    assert sweep["W_quantiles"][4] == pytest.approx(mms["W_quantiles"], rel=1e-12)
+    capped = calculate_batch("M/M/S/K", lmbda=9, mu=1, s=3, K=[20, 2], quantiles=0.9)
+    assert capped["W_quantiles"][0] == pytest.approx(blocked["W_quantiles"], rel=1e-12)
+    assert np.isnan(capped["W_quantiles"][1])
+
+
+def test_mms_asymptotic_path_matches_exact_recursion():
+    import numpy as np
+
+    from calculator import calculate_batch
+    from models import asymptotic_error_report
+
+    for s, a in ((1000, 968.4), (5000, 4990.0), (20000, 19000.0)):
+        exact = calculate("M/M/S", lmbda=a, mu=1, s=s, method="exact")
+        approx = calculate("M/M/S", lmbda=a, mu=1, s=s, method="asymptotic")
+        for key in ("p0", "Lq", "Wq"):
+            assert approx[key] == pytest.approx(exact[key], rel=1e-10)
+    # "auto" troca de caminho em ASYMPTOTIC_MIN_SERVERS sem salto visivel
+    below = calculate("M/M/S", lmbda=4900, mu=1, s=4999)["Lq"]
+    assert calculate("M/M/S", lmbda=4900, mu=1, s=4999, method="asymptotic")["Lq"] == pytest.approx(below, rel=1e-12)
+    huge = calculate("M/M/S", lmbda=999_000, mu=1, s=1_000_000)
+    assert 0 < huge["Lq"] < 1e3
+
+    s = np.array([100, 1000, 20000])
+    batch = calculate_batch("M/M/S", lmbda=0.98 * s, mu=1, s=s, method="asymptotic")
+    for row in range(3):
+        exact = calculate("M/M/S", lmbda=float(0.98 * s[row]), mu=1, s=int(s[row]), method="exact")
+        assert batch["Lq"][row] == pytest.approx(exact["Lq"], rel=1e-7)
+
+    report = asymptotic_error_report(s_values=[1000, 5000])
+    assert report["s"] == [1000, 5000]
+    assert max(report["max_rel_error_C"]) < 1e-10
+    assert report["max_rel_error_p0"][1] < 1e-11
+    with pytest.raises(ValueError):
+        calculate("M/M/S", lmbda=1, mu=1, s=2, method="normal")
+
+
+def test_erlang_a_abandonment_model():
+    import math
+
+    import numpy as np
+
+    from calculator import calculate_batch
+
+    # theta = mu: paciencia e servico identicos -> mesmo numero no sistema que M/M/inf
+    mminf = calculate("ERLANG-A", lmbda=6, mu=2, s=2, theta=2, n=4)
+    assert mminf["L"] == pytest.approx(3.0, rel=1e-12)
+    assert mminf["p0"] == pytest.approx(math.exp(-3.0), rel=1e-12)
+    assert mminf["pn"] == pytest.approx(math.exp(-3.0) * 3**4 / 24, rel=1e-12)
+    # Sem paciencia limitada (theta -> 0) recupera o M/M/S
+    mms = calculate("M/M/S", lmbda=9, mu=1, s=10)
+    patient = calculate("M/M/S+M", lmbda=9, mu=1, s=10, theta=1e-7)
+    assert patient["Lq"] == pytest.approx(mms["Lq"], rel=1e-4)
+
+    overload = calculate("M/M/S+M", lmbda=120, mu=10, s=11, theta=6, t=[0.0, 0.05])
+    assert overload["rho"] > 1
+    assert overload["lambda_eff"] == pytest.approx(10 * (overload["L"] - overload["Lq"]), rel=1e-10)
+    assert overload["P(Wq>t)"][0] == pytest.approx(overload["P(wait)"], rel=1e-12)
+    assert overload["P(Wq>t)"][1] < overload["P(Wq>t)"][0]
+
+    s = np.arange(8, 16)
+    batch = calculate_batch("M/M/S+M", lmbda=120, mu=10, s=s, theta=6)
+    for row, servers in enumerate(s):
+        scalar = calculate("M/M/S+M", lmbda=120, mu=10, s=int(servers), theta=6)
+        for key in ("L", "Wq", "P(abandon)"):
+            assert batch[key][row] == pytest.approx(scalar[key], rel=1e-12)
+    assert np.all(np.diff(batch["P(abandon)"]) < 0)
+    with pytest.raises(ValueError):
+        calculate("M/M/S+M", lmbda=1, mu=1, s=2, theta=0)
+
+
+def test_gg_approximations_reduce_to_markovian_cases():
+    import numpy as np
+
+    from calculator import calculate_batch
+
+    mms = calculate("M/M/S", lmbda=8, mu=2, s=5)
+    for approximation in ("allen-cunneen", "whitt"):
+        result = calculate("G/G/S", lmbda=8, mu=2, s=5, approximation=approximation)
+        assert result["Wq"] == pytest.approx(mms["Wq"], rel=1e-12)
+        assert result["L"] == pytest.approx(mms["L"], rel=1e-12)
+    # Kingman com chegadas Poisson e servico deterministico e exato (Pollaczek-Khinchine)
+    md1 = calculate("GG1", lmbda=0.8, mu=1, ca2=1, cs2=0)
+    assert md1["Wq"] == pytest.approx(2.0, rel=1e-12)
+    assert calculate("G/G/1", lmbda=0.8, mu=1, ca2=3, cs2=1)["Wq"] == pytest.approx(8.0, rel=1e-12)
+    # M/D/10 (Wq simulado ~0.0933): Allen-Cunneen subestima e Whitt corrige para cima
+    whitt = calculate("G/G/S", lmbda=17, mu=2, s=10, cs2=0, approximation="whitt")["Wq"]
+    allen = calculate("G/G/S", lmbda=17, mu=2, s=10, cs2=0)["Wq"]
+    assert allen < whitt < 0.095
+
+    grid = np.array([0.0, 0.5, 1.0, 3.0])
+    s = np.arange(4, 8)[:, None, None]
+    batch = calculate_batch("G/G/S", lmbda=8, mu=2, s=s, ca2=grid[None, :, None], cs2=grid, approximation="whitt")
+    assert batch["Wq"].shape == (4, 4, 4)
+    assert np.isnan(batch["Wq"][0]).all() and batch["unstable"][0].all()
+    for i, j, k in ((1, 3, 0), (2, 0, 2), (3, 1, 1)):
+        scalar = calculate(
+            "G/G/S", lmbda=8, mu=2, s=int(s[i, 0, 0]), ca2=grid[j], cs2=grid[k], approximation="whitt"
+        )
+        assert batch["Wq"][i, j, k] == pytest.approx(scalar["Wq"], rel=1e-12)
+    idle, mms_idle = calculate("G/G/S", lmbda=0, mu=2, s=3), calculate("M/M/S", lmbda=0, mu=2, s=3)
+    assert all(idle[key] == mms_idle[key] for key in idle)
+    assert calculate_batch("G/G/S", lmbda=[0.0, 8.0], mu=2, s=5)["W"][0] == 0.0
+    with pytest.raises(ValueError):
+        calculate("G/G/S", lmbda=1, mu=1, s=2, ca2=-1)